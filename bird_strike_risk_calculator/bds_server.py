@@ -579,15 +579,16 @@ class RealTimePipeline:
                     assigned_route = self.estimate_airplane_route(airplane_track)
                     
                     if assigned_route:
-                        # 1-2. 할당된 경로와 새떼 간의 거리 계산
+                        # 1-2. 할당된 경로와 새떼 간의 거리 계산 (가장 가까운 점 인덱스도 함께)
                         flock_3d_pos = np.array([flock_pos[0], 50.0, flock_pos[1]])
-                        route_distance = self.route_calculator.calculate_distance_to_route(assigned_route, flock_3d_pos)
+                        route_distance, _, closest_idx = self.route_calculator.get_closest_point_on_route(
+                            assigned_route, flock_3d_pos
+                        )
                         
-                        # 1-3. 경로 진행 방향 계산 (가장 가까운 점 기준)
-                        _, _, closest_point = self.route_calculator.get_closest_point_on_route(assigned_route, flock_3d_pos)
-                        if closest_point is not None:
-                            route_direction = self.route_calculator.calculate_route_segment_direction(
-                                assigned_route, closest_point
+                        # 1-3. 경로 진행 방향 계산 (가장 가까운 점 인덱스 재사용)
+                        if closest_idx >= 0:
+                            route_direction = self.route_calculator.calculate_route_segment_direction_at_index(
+                                assigned_route, closest_idx
                             )
                         
                         print(f"🛣️ 경로 기반 계산: {assigned_route} 경로 사용 (거리: {route_distance:.1f}m)")
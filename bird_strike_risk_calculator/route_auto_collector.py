@@ -5,12 +5,15 @@ Unity SyncCaptureManager에서 생성되는 Recording 폴더들을 자동으로
 삼각측량 → 경로 수집 → 평균 계산을 완전 자동화합니다.
 """
 
+import os
+import re
 import sys
 import time
 import json
+import tempfile
 from pathlib import Path
 from datetime import datetime
-from typing import Set, List
+from typing import Set, List, Dict, Optional
 import logging
 import numpy as np
 import argparse
@@ -30,12 +33,69 @@ from route_triangulation_core import (
     add_triangulation_data
 )
 
+# 필터 커널 가속 (선택)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Unity 환경에서 비현실적인 좌표 한계
+MAX_ABS_COORDINATE = 10000.0
+
+
+def _as_coordinate(value) -> float:
+    """숫자 좌표는 float으로, 그 외 값은 NaN으로 변환"""
+    return float(value) if isinstance(value, (int, float)) else np.nan
+
+
+def _extract_uniform_points(data_source):
+    """첫 점의 형식(x/y/z 또는 position)으로 전체를 (N, 3) 배열로 변환 (형식이 섞였거나 잘못된 점이 있으면 None)"""
+    first = data_source[0]
+    if not isinstance(first, dict):
+        return None
+    
+    n = len(data_source)
+    try:
+        if 'x' in first and 'y' in first and 'z' in first:
+            return np.fromiter(
+                (float(p[k]) for p in data_source for k in ('x', 'y', 'z')),
+                dtype=np.float64, count=3 * n
+            ).reshape(n, 3)
+        if 'position' in first and len(first['position']) >= 3:
+            coords = np.array([p['position'][:3] for p in data_source], dtype=np.float64)
+            return coords if coords.shape == (n, 3) else None
+    except Exception:
+        return None
+    return None
+
+
+if NUMBA_AVAILABLE:
+    # fastmath는 NaN이 없다고 가정하므로 사용하지 않음
+    @njit(cache=True)
+    def _filter_mask(xyz: np.ndarray) -> np.ndarray:
+        """NaN/Inf 또는 극단값이 없는 행만 True"""
+        out = np.empty(xyz.shape[0], dtype=np.bool_)
+        for i in range(xyz.shape[0]):
+            out[i] = (abs(xyz[i, 0]) <= MAX_ABS_COORDINATE and
+                      abs(xyz[i, 1]) <= MAX_ABS_COORDINATE and
+                      abs(xyz[i, 2]) <= MAX_ABS_COORDINATE)
+        return out
+else:
+    def _filter_mask(xyz: np.ndarray) -> np.ndarray:
+        """NaN/Inf 또는 극단값이 없는 행만 True"""
+        # NaN 비교는 항상 False, Inf는 한계를 넘으므로 한 번의 비교로 충분
+        return (np.abs(xyz) <= MAX_ABS_COORDINATE).all(axis=1)
+
+
 class AutoRouteProcessor:
     """Unity Recording 폴더 자동 모니터링 및 처리 - 단순화 버전"""
     
-    def __init__(self, route_name: str = "Path_A", update_mode: str = "batch"):
+    def __init__(self, route_name: str = "Path_A", update_mode: str = "batch",
+                 smoothing_method: str = "gaussian"):
         self.route_name = route_name
         self.update_mode = update_mode  # "batch", "immediate", "cumulative"
+        self.smoothing_method = smoothing_method  # 평균 경로 스무딩: "gaussian", "spline"
         
         # 경로 설정 (triangulation_routes를 routes로 통합)
         self.sync_capture_dir = Path("data/sync_capture")
@@ -43,12 +103,16 @@ class AutoRouteProcessor:
         self.raw_runs_dir = Path("data/routes/raw_runs")
         self.averaged_routes_dir = Path("data/routes/averaged_routes")
         self.visualization_dir = Path("data/routes/visualizations")
-        self.state_file = Path("data/routes/auto_processor_state.json")
+        self.state_file = Path("data/routes/auto_processor_state.json")  # 압축된 스냅샷
+        self.state_log = Path("data/routes/auto_processor_state.jsonl")  # 추가 전용 로그
         
         # 상태 관리
         self.processed_folders: Set[str] = set()
+        self._sync_capture_mtime = -1  # 마지막으로 스캔한 sync_capture 디렉토리 mtime
+        self._pending_folders: Set[str] = set()  # 발견했지만 아직 처리되지 않은 폴더
+        self._recording_re = re.compile(rf"^Recording_{re.escape(self.route_name)}")
         self.is_running = False
-        self.stop_requested = False
+        self._stop_event = threading.Event()
         
         # 로깅 설정
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
@@ -64,46 +128,116 @@ class AutoRouteProcessor:
         # 경로 수집기 초기화
         self.route_collector = initialize_route_collector()
         
+        # 폴더 간 재사용 리소스 (감지기는 첫 사용 시 생성)
+        self._detector = None
+        self._camera_cache: Dict[bytes, tuple] = {}
+        
         self.logger.info("🤖 자동 경로 처리기 초기화 완료")
         self.logger.info(f"   - 경로 이름: {self.route_name}")
         self.logger.info(f"   - 업데이트 모드: {self.update_mode}")
+        self.logger.info(f"   - 스무딩 방식: {self.smoothing_method}")
         self.logger.info(f"   - 통합 경로: {self.route_dir}")
     
+    @property
+    def stop_requested(self) -> bool:
+        """중지 요청 여부"""
+        return self._stop_event.is_set()
+    
+    def get_detector(self):
+        """항공 감지기 반환 (최초 호출 시 한 번만 모델 로드)"""
+        if self._detector is None:
+            from aviation_detector import AviationDetector
+            detector = AviationDetector()
+            if not detector.model:
+                return None
+            self._detector = detector
+        return self._detector
+    
     def load_state(self):
-        """이전 처리 상태 로드"""
+        """이전 처리 상태 로드 (스냅샷 + 추가 로그)"""
         if self.state_file.exists():
             try:
                 with open(self.state_file, 'r') as f:
                     state = json.load(f)
                 self.processed_folders = set(state.get('processed_folders', []))
-                self.logger.info(f"📂 이전 상태 복구: {len(self.processed_folders)}개 폴더 처리됨")
             except Exception as e:
                 self.logger.warning(f"상태 파일 로드 실패: {e}")
+        
+        log_entries = 0
+        if self.state_log.exists():
+            try:
+                with open(self.state_log, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            self.processed_folders.add(json.loads(line)['folder'])
+                            log_entries += 1
+                        except (ValueError, KeyError):
+                            continue  # 중단된 쓰기로 잘린 줄은 무시
+            except Exception as e:
+                self.logger.warning(f"상태 로그 로드 실패: {e}")
+        
+        if self.processed_folders:
+            self.logger.info(f"📂 이전 상태 복구: {len(self.processed_folders)}개 폴더 처리됨")
+        
+        # 로그를 스냅샷으로 합쳐 다음 로드 비용을 줄임
+        if log_entries:
+            self.compact_state()
     
-    def save_state(self):
-        """현재 처리 상태 저장"""
+    def save_state(self, folder_name: str):
+        """처리 완료된 폴더를 상태 로그에 추가 (O(1))"""
+        try:
+            entry = {'folder': folder_name, 't': datetime.now().isoformat()}
+            with open(self.state_log, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except Exception as e:
+            self.logger.error(f"상태 파일 저장 실패: {e}")
+    
+    def compact_state(self):
+        """전체 상태를 스냅샷으로 원자적으로 저장하고 로그 비우기"""
         try:
             state = {
-                'processed_folders': list(self.processed_folders),
+                'processed_folders': sorted(self.processed_folders),
                 'last_update': datetime.now().isoformat()
             }
-            with open(self.state_file, 'w') as f:
+            fd, tmp_path = tempfile.mkstemp(dir=self.state_file.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
                 json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.state_file)
+            self.state_log.unlink(missing_ok=True)
         except Exception as e:
-            self.logger.error(f"상태 파일 저장 실패: {e}")
+            self.logger.error(f"상태 파일 압축 실패: {e}")
     
     def find_new_folders(self) -> List[Path]:
         """새로운 Recording 폴더 찾기"""
         if not self.sync_capture_dir.exists():
             return []
         
+        # 디렉토리 mtime은 항목 추가/삭제 시에만 바뀌므로, 변화가 없으면
+        # 전체 스캔 대신 대기 중인 폴더만 다시 확인
+        mtime = self.sync_capture_dir.stat().st_mtime_ns
+        if mtime == self._sync_capture_mtime:
+            if not self._pending_folders:
+                return []
+            candidates = [self.sync_capture_dir / name for name in sorted(self._pending_folders)
+                          if name not in self.processed_folders]
+            candidates = [folder for folder in candidates if folder.is_dir()]
+        else:
+            self._sync_capture_mtime = mtime
+            # scandir의 dirent 타입 정보로 디렉토리 여부를 추가 stat 없이 판별
+            with os.scandir(self.sync_capture_dir) as it:
+                candidates = [Path(e.path) for e in it
+                              if self._recording_re.match(e.name)
+                              and e.name not in self.processed_folders
+                              and e.is_dir(follow_symlinks=False)]
+        
         new_folders = []
-        for folder in self.sync_capture_dir.glob(f"Recording_{self.route_name}*"):
-            if (folder.is_dir() and 
-                folder.name not in self.processed_folders and
-                self.is_recording_complete(folder)):
+        pending = set()
+        for folder in candidates:
+            pending.add(folder.name)
+            if self.is_recording_complete(folder):
                 new_folders.append(folder)
         
+        self._pending_folders = pending
         return new_folders
     
     def is_recording_complete(self, folder: Path) -> bool:
@@ -139,16 +273,28 @@ class AutoRouteProcessor:
         
         try:
             # 경로 수집 시작
-            run_id = start_route_collection(self.route_name)
+            run_id = start_route_collection(self.route_name, stream=True)
             self.logger.info(f"   -> 경로 수집 시작: {run_id}")
             
             # 삼각측량 처리
-            processor = SimpleTriangulationProcessor(folder)
+            detector = self.get_detector()
+            if detector is None:
+                self.logger.error("항공 감지기 초기화 실패")
+                stop_route_collection()
+                return False
+            
+            processor = SimpleTriangulationProcessor(folder, detector=detector,
+                                                     camera_cache=self._camera_cache)
             success = processor.process()
             
             # 경로 수집 종료
             saved_run_id = stop_route_collection()
             
+            # 모델은 유지하고 폴더 간 임시 GPU 메모리만 해제
+            if detector.device == 'cuda':
+                import torch
+                torch.cuda.empty_cache()
+            
             if not success or not saved_run_id:
                 self.logger.warning("   -> ⚠️ 처리 실패")
                 return False
@@ -163,7 +309,7 @@ class AutoRouteProcessor:
             
             # 상태 업데이트
             self.processed_folders.add(folder.name)
-            self.save_state()
+            self.save_state(folder.name)
             
             # 🎨 3단계 경로 비교 시각화 생성
             self.generate_comparison_visualization()
@@ -197,7 +343,8 @@ class AutoRouteProcessor:
                 'collection_time': raw_data['collection_time'],
                 'total_points': len(filtered_points),
                 'points': filtered_points,
-                'filtered': True
+                'filtered': True,
+                'sorted': True  # filter_points가 frame_id 순으로 정렬함
             }
             
             # averaged_routes에 저장 (경로 수정)
@@ -215,26 +362,21 @@ class AutoRouteProcessor:
         if len(points) < 1:
             return points
         
-        # 프레임별 정렬
-        sorted_points = sorted(points, key=lambda p: p.get('frame', 0))
+        # 프레임 필드를 frame_id로 통일한 뒤 한 번만 정렬
+        for point in points:
+            point['frame_id'] = point.get('frame_id', point.get('frame', 0))
+        sorted_points = sorted(points, key=lambda p: p['frame_id'])
+        
+        # 좌표를 (N, 3) 배열로 모음 (숫자가 아닌 값은 NaN으로 표시)
+        n = len(sorted_points)
+        xyz = np.fromiter(
+            (_as_coordinate(p.get(k, 0)) for p in sorted_points for k in ('x', 'y', 'z')),
+            dtype=np.float64, count=3 * n
+        ).reshape(n, 3)
         
         # 극단적인 값만 제거
-        filtered = []
-        for point in sorted_points:
-            # NaN/Inf 체크
-            x, y, z = point.get('x', 0), point.get('y', 0), point.get('z', 0)
-            
-            # 숫자가 아니거나 무한대인 경우 제외
-            if (not isinstance(x, (int, float)) or not isinstance(y, (int, float)) or not isinstance(z, (int, float)) or
-                np.isnan(x) or np.isnan(y) or np.isnan(z) or
-                np.isinf(x) or np.isinf(y) or np.isinf(z)):
-                continue
-            
-            # 극단적으로 큰 값만 제외 (Unity 환경에서 비현실적인 값)
-            if abs(x) > 10000 or abs(y) > 10000 or abs(z) > 10000:
-                continue
-            
-            filtered.append(point)
+        keep = _filter_mask(xyz)
+        filtered = [point for point, ok in zip(sorted_points, keep) if ok]
         
         self.logger.info(f"   -> 🔍 극단값 필터링: {len(points)} -> {len(filtered)}개 (제거: {len(points) - len(filtered)}개)")
         return filtered
@@ -268,8 +410,8 @@ class AutoRouteProcessor:
         if not airplane_points:
             return
         
-        # 경로 데이터 생성
-        route_data = self.create_route_data(airplane_points)
+        # 경로 데이터 생성 (필터링 단계에서 이미 정렬된 경우 재정렬 생략)
+        route_data = self.create_route_data(airplane_points, presorted=data.get('sorted', False))
         
         # 저장
         final_path = self.route_dir / f"{self.route_name}.json"
@@ -280,7 +422,7 @@ class AutoRouteProcessor:
     
     def update_cumulative(self):
         """누적 업데이트 - 평균 계산"""
-        success = generate_average_route(self.route_name, min_runs=1)
+        success = generate_average_route(self.route_name, min_runs=1, smoothing_method=self.smoothing_method)
         if success:
             self.logger.info("   -> 📈 누적 평균 업데이트 완료")
             # 실시간 시각화 업데이트
@@ -290,15 +432,15 @@ class AutoRouteProcessor:
     
     def update_batch(self):
         """배치 업데이트 - 3개씩 평균"""
-        success = generate_average_route(self.route_name, min_runs=3)
+        success = generate_average_route(self.route_name, min_runs=3, smoothing_method=self.smoothing_method)
         if success:
             self.logger.info("   -> 📊 배치 평균 업데이트 완료")
             # 실시간 시각화 업데이트
             self.generate_realtime_visualization()
     
-    def create_route_data(self, points: List[dict]) -> dict:
+    def create_route_data(self, points: List[dict], presorted: bool = False) -> dict:
         """경로 데이터 생성"""
-        sorted_points = sorted(points, key=lambda p: p.get('frame_id', 0))
+        sorted_points = points if presorted else sorted(points, key=lambda p: p.get('frame_id', 0))
         
         waypoints = []
         for point in sorted_points:
@@ -350,24 +492,22 @@ class AutoRouteProcessor:
                 else:
                     self.logger.info("📂 새로운 폴더 없음, 대기 중...")
                 
-                # 5초 대기
-                for _ in range(50):  # 0.1초씩 50번 = 5초
-                    if self.stop_requested:
-                        break
-                    time.sleep(0.1)
+                # 5초 대기 (중지 요청 시 즉시 깨어남)
+                if self._stop_event.wait(timeout=5):
+                    break
                     
             except KeyboardInterrupt:
                 break
             except Exception as e:
                 self.logger.error(f"❌ 모니터링 중 오류: {e}")
-                time.sleep(5)
+                self._stop_event.wait(timeout=5)
         
         self.is_running = False
         self.logger.info("✅ 모니터링 종료")
     
     def stop(self):
         """중지 요청"""
-        self.stop_requested = True
+        self._stop_event.set()
         self.logger.info("🛑 중지 요청됨")
     
     def generate_comparison_visualization(self):
@@ -424,10 +564,11 @@ class AutoRouteProcessor:
             with open(route_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            x, y, z = self.extract_coordinates_from_data(data)
-            if x is None or len(x) == 0:
+            points = self.extract_points_from_data(data)
+            if points is None or len(points) == 0:
                 self.logger.warning("      좌표 데이터가 없습니다")
                 return
+            x, y, z = points[:, 0], points[:, 1], points[:, 2]
             
             # 시각화 생성
             fig = plt.figure(figsize=(15, 10))
@@ -470,7 +611,7 @@ class AutoRouteProcessor:
             ax4 = fig.add_subplot(224)
             ax4.axis('off')
             
-            total_dist = self.calculate_total_distance(x, y, z)
+            total_dist = self.calculate_total_distance(points)
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
             stats_text = f"""📊 {self.route_name} 경로 정보
@@ -534,12 +675,13 @@ class AutoRouteProcessor:
                         with open(file, 'r', encoding='utf-8') as f:
                             data = json.load(f)
                         
-                        x, y, z = self.extract_coordinates_from_data(data)
-                        if x is not None and len(x) > 0:
+                        points = self.extract_points_from_data(data)
+                        if points is not None and len(points) > 0:
                             routes_data[label] = {
-                                'x': x, 'y': y, 'z': z,
+                                'points': points,
+                                'x': points[:, 0], 'y': points[:, 1], 'z': points[:, 2],
                                 'color': colors[i],
-                                'count': len(x)
+                                'count': len(points)
                             }
                     except Exception as e:
                         self.logger.warning(f"      파일 로드 실패 ({label}): {e}")
@@ -608,7 +750,7 @@ class AutoRouteProcessor:
             
             for label, data in routes_data.items():
                 x, y, z = data['x'], data['y'], data['z']
-                total_dist = self.calculate_total_distance(x, y, z)
+                total_dist = self.calculate_total_distance(data['points'])
                 
                 stats_text += f"🔸 {label}:\n"
                 stats_text += f"   • 점 개수: {len(x)}개\n"
@@ -631,8 +773,8 @@ class AutoRouteProcessor:
         except Exception as e:
             self.logger.error(f"      시각화 생성 오류: {e}")
     
-    def extract_coordinates_from_data(self, data):
-        """데이터에서 좌표 추출 (다양한 형식 지원)"""
+    def extract_points_from_data(self, data):
+        """데이터에서 (N, 3) 좌표 배열 추출 (다양한 형식 지원)"""
         try:
             # 다양한 형식의 데이터 지원
             waypoints = data.get('waypoints', [])
@@ -647,46 +789,54 @@ class AutoRouteProcessor:
                 data_source = points
             
             if not data_source:
-                return None, None, None
-            
-            # 좌표 추출 (다양한 형식 지원)
-            x_coords, y_coords, z_coords = [], [], []
+                return None
+
+            # 모든 점이 첫 점과 같은 형식이면 한 번에 (N, 3) 배열로 변환
+            coords = _extract_uniform_points(data_source)
+            if coords is not None:
+                return coords
             
+            # 형식이 섞였거나 잘못된 점이 있으면 점별로 추출하고 잘못된 점만 건너뜀
+            rows = []
             for p in data_source:
-                if isinstance(p, dict):
-                    # 일반적인 x, y, z 형식
+                try:
                     if 'x' in p and 'y' in p and 'z' in p:
-                        x_coords.append(float(p['x']))
-                        y_coords.append(float(p['y']))
-                        z_coords.append(float(p['z']))
-                    # position 리스트 형식
+                        # 일반적인 x, y, z 형식
+                        rows.append((float(p['x']), float(p['y']), float(p['z'])))
                     elif 'position' in p and len(p['position']) >= 3:
-                        x_coords.append(float(p['position'][0]))
-                        y_coords.append(float(p['position'][1]))
-                        z_coords.append(float(p['position'][2]))
+                        # position 리스트 형식
+                        rows.append(tuple(float(v) for v in p['position'][:3]))
+                except Exception:
+                    continue
             
-            if not x_coords:
-                return None, None, None
-            
-            return np.array(x_coords), np.array(y_coords), np.array(z_coords)
+            if not rows:
+                return None
+            return np.array(rows, dtype=np.float64)
             
         except Exception as e:
             self.logger.warning(f"좌표 추출 실패: {e}")
-            return None, None, None
+            return None
     
-    def calculate_total_distance(self, x, y, z):
-        """경로의 총 거리 계산"""
-        if len(x) < 2:
+    def calculate_total_distance(self, points):
+        """경로의 총 거리 계산 (points: (N, 3) 배열)"""
+        if len(points) < 2:
             return 0.0
-        distances = np.sqrt(np.diff(x)**2 + np.diff(y)**2 + np.diff(z)**2)
-        return float(np.sum(distances))
+        return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
 
 
 class SimpleTriangulationProcessor:
     """단순화된 삼각측량 처리기"""
     
-    def __init__(self, folder: Path):
+    def __init__(self, folder: Path, detector=None, camera_cache: Optional[Dict[bytes, tuple]] = None):
+        """
+        Args:
+            folder: Recording 폴더
+            detector: 재사용할 AviationDetector (None이면 새로 생성)
+            camera_cache: 파라미터 파일 내용 -> (파라미터, 투영 행렬) 캐시
+        """
         self.folder = folder
+        self.detector = detector
+        self.camera_cache = camera_cache if camera_cache is not None else {}
         self.logger = logging.getLogger(__name__)
     
     def process(self) -> bool:
@@ -694,10 +844,10 @@ class SimpleTriangulationProcessor:
         try:
             # 필요한 모듈 import
             from aviation_detector import AviationDetector
-            from triangulate import triangulate_objects_realtime, load_camera_parameters, get_projection_matrix
+            from triangulate import triangulate_objects_realtime
             
-            # 감지기 초기화
-            detector = AviationDetector()
+            # 감지기 초기화 (전달받은 감지기 우선 재사용)
+            detector = self.detector if self.detector is not None else AviationDetector()
             if not detector.model:
                 self.logger.error("항공 감지기 초기화 실패")
                 return False
@@ -773,14 +923,21 @@ class SimpleTriangulationProcessor:
     
     def load_camera_params(self):
         """카메라 파라미터 로드"""
-        from triangulate import load_camera_parameters, get_projection_matrix
+        from triangulate import get_projection_matrix
         
         params, matrices, letters = [], [], []
         
         for param_file in self.folder.glob("*_parameters.json"):
             try:
-                p = load_camera_parameters(param_file)
-                matrices.append(get_projection_matrix(p))
+                # 동일한 카메라 설정이면 이전 폴더에서 계산한 행렬 재사용
+                raw = param_file.read_bytes()
+                cached = self.camera_cache.get(raw)
+                if cached is None:
+                    p = json.loads(raw)
+                    cached = (p, get_projection_matrix(p))
+                    self.camera_cache[raw] = cached
+                p, matrix = cached
+                matrices.append(matrix)
                 params.append(p)
                 
                 # 카메라 문자 추출
@@ -829,6 +986,8 @@ def main():
     parser.add_argument('--batch', action='store_true', help='배치 모드')
     parser.add_argument('--immediate', action='store_true', help='즉시 업데이트')
     parser.add_argument('--cumulative', action='store_true', help='누적 업데이트')
+    parser.add_argument('--smoothing', choices=['gaussian', 'spline'], default='gaussian',
+                        help='평균 경로 스무딩 방식 (gaussian: 가우시안 필터, spline: B-스플라인 근사)')
     
     args = parser.parse_args()
     
@@ -843,13 +1002,14 @@ def main():
     print("🤖 자동 경로 처리기 시작")
     print("=" * 60)
     print(f"🔄 업데이트 모드: {update_mode}")
+    print(f"〰️ 스무딩 방식: {args.smoothing}")
     
     # 시그널 핸들러 등록
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
     # 프로세서 생성 및 실행
-    processor = AutoRouteProcessor(args.route_name, update_mode)
+    processor = AutoRouteProcessor(args.route_name, update_mode, smoothing_method=args.smoothing)
     
     try:
         processor.load_state()
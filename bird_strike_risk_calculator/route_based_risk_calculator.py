@@ -1,9 +1,92 @@
 import json
+import hashlib
 import numpy as np
 import os
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
+from functools import cached_property
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# 최근접 경로 검색용 공간 인덱스 (선택)
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# 빠른 JSON 파싱 (선택)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 최근접 점 커널 가속 (선택)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 파싱된 경로 배열 캐시 위치 (입력 데이터 폴더에는 쓰지 않음)
+ROUTE_CACHE_DIR = os.environ.get('BRS_CACHE_DIR') or os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'birdrisksim', 'routes')
+
+def _as_query(position) -> np.ndarray:
+    """질의 좌표를 경로 배열과 같은 float32로 변환 (암묵적 float64 승격 방지)"""
+    return np.ascontiguousarray(position, dtype=np.float32)
+
+if NUMBA_AVAILABLE:
+    # fastmath는 inf/NaN이 없다고 가정하므로 np.inf 초기값 비교를 위해 사용하지 않음
+    @njit(cache=True)
+    def _nearest_squared(points: np.ndarray, q: np.ndarray) -> Tuple[int, float]:
+        """points (N, 3)에서 q에 가장 가까운 점의 (인덱스, 제곱 거리)"""
+        best_idx = 0
+        best_d2 = np.inf
+        for i in range(points.shape[0]):
+            dx = points[i, 0] - q[0]
+            dy = points[i, 1] - q[1]
+            dz = points[i, 2] - q[2]
+            d2 = dx * dx + dy * dy + dz * dz
+            if d2 < best_d2:
+                best_d2 = d2
+                best_idx = i
+        return best_idx, best_d2
+else:
+    def _nearest_squared(points: np.ndarray, q: np.ndarray) -> Tuple[int, float]:
+        """points (N, 3)에서 q에 가장 가까운 점의 (인덱스, 제곱 거리)"""
+        diffs = points - q
+        d2 = np.einsum('ij,ij->i', diffs, diffs)
+        idx = int(d2.argmin())
+        return idx, float(d2[idx])
+
+def _project_on_segments(a: np.ndarray, ab: np.ndarray, ab2: np.ndarray,
+                         q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    q에서 각 선분 (a[i], a[i] + ab[i])까지의 제곱 거리
+    
+    Returns:
+        Tuple[제곱 거리 (S,), 선분 위 투영 계수 t (S,), 0~1]
+    """
+    aq = q - a
+    # 길이 0 선분(중복 점)은 시작점까지의 거리로 처리
+    t = np.einsum('ij,ij->i', aq, ab) / np.where(ab2 > 0, ab2, 1)
+    np.clip(t, 0.0, 1.0, out=t)
+    diffs = aq - t[:, None] * ab
+    return np.einsum('ij,ij->i', diffs, diffs), t
+
+def _segment_distances(points: np.ndarray, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    q에서 각 선분 (points[i], points[i+1])까지의 제곱 거리
+    
+    Returns:
+        Tuple[제곱 거리 (N-1,), 선분 위 투영 계수 t (N-1,), 0~1]
+    """
+    a = points[:-1]
+    ab = points[1:] - a
+    return _project_on_segments(a, ab, np.einsum('ij,ij->i', ab, ab), q)
 
 @dataclass
 class RoutePoint:
@@ -19,10 +102,26 @@ class RoutePoint:
 class FlightRoute:
     """항공기 비행 경로를 나타내는 클래스"""
     path_name: str
-    waypoints: List[RoutePoint]
-    route_points: List[RoutePoint]
+    waypoints_xyz: np.ndarray  # 웨이포인트 (W, 3) 연속 배열
+    points_xyz: np.ndarray  # 경로점 (N, 3) 연속 배열 (거리 계산용)
     export_time: str
     total_waypoints: int
+    
+    def __post_init__(self):
+        # 거리 커널은 메모리 대역폭에 묶이므로 항상 C 연속 float32로 보관
+        # (수천 점 x 12바이트는 L2 캐시에 들어감)
+        self.points_xyz = np.ascontiguousarray(self.points_xyz, dtype=np.float32)
+        self.waypoints_xyz = np.ascontiguousarray(self.waypoints_xyz, dtype=np.float32)
+    
+    @cached_property
+    def waypoints(self) -> List[RoutePoint]:
+        """웨이포인트를 RoutePoint 리스트로 반환 (첫 접근 시 한 번만 생성)"""
+        return [RoutePoint(float(x), float(y), float(z)) for x, y, z in self.waypoints_xyz]
+    
+    @cached_property
+    def route_points(self) -> List[RoutePoint]:
+        """경로점을 RoutePoint 리스트로 반환 (첫 접근 시 한 번만 생성)"""
+        return [RoutePoint(float(x), float(y), float(z)) for x, y, z in self.points_xyz]
 
 class RouteBasedRiskCalculator:
     """경로 기반 위험도 계산기"""
@@ -36,6 +135,17 @@ class RouteBasedRiskCalculator:
         self.flight_routes: Dict[str, FlightRoute] = {}
         self.logger = logging.getLogger(__name__)
         
+        # 전체 경로 점을 이어붙인 버퍼 (일괄 거리 계산용)
+        self._all_points = np.empty((0, 3), dtype=np.float32)
+        self._route_slices: Dict[str, Tuple[int, int]] = {}
+        self._route_names: List[str] = []
+        self._point_route_id = np.empty(0, dtype=np.uint16)
+        # 점 i에서 시작하는 선분 벡터 (경로의 마지막 점은 길이 0 선분)
+        self._seg_vec = np.empty((0, 3), dtype=np.float32)
+        self._seg_len2 = np.empty(0, dtype=np.float32)
+        self._half_max_segment = 0.0
+        self._tree = None
+        
         # 경로 데이터 로드
         self._load_all_routes()
     
@@ -45,43 +155,140 @@ class RouteBasedRiskCalculator:
             self.logger.warning(f"Routes directory not found: {self.routes_directory}")
             return
         
-        json_files = [f for f in os.listdir(self.routes_directory) if f.endswith('.json')]
+        # auto_processor_state.json 같은 비경로 파일 제외 (파일 타입은 DirEntry 캐시 사용)
+        with os.scandir(self.routes_directory) as it:
+            paths = [e.path for e in it
+                     if e.name.endswith('.json') and not e.name.startswith('auto_processor_state')
+                     and e.is_file()]
         
-        for json_file in json_files:
-            # auto_processor_state.json 같은 비경로 파일 제외
-            if json_file.startswith('auto_processor_state'):
-                continue
-                
-            try:
-                route = self._load_route_from_json(os.path.join(self.routes_directory, json_file))
-                if route:
-                    self.flight_routes[route.path_name] = route
-                    self.logger.info(f"Loaded route: {route.path_name} with {len(route.route_points)} points")
-            except Exception as e:
-                self.logger.error(f"Failed to load route from {json_file}: {e}")
+        # 파일 I/O와 파싱을 병렬로 수행 (등록은 순서대로)
+        routes = []
+        if paths:
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+                routes = list(executor.map(self._load_route, paths))
+        
+        for route in routes:
+            if route:
+                self.flight_routes[route.path_name] = route
+                self.logger.info(f"Loaded route: {route.path_name} with {len(route.points_xyz)} points")
+        
+        self._build_point_buffer()
+    
+    def _build_point_buffer(self):
+        """모든 경로의 점을 하나의 (M, 3) 배열로 이어붙이고 경로별 구간 기록"""
+        arrays = []
+        route_ids = []
+        self._route_slices = {}
+        self._route_names = list(self.flight_routes.keys())
+        start = 0
+        for route_id, route_name in enumerate(self._route_names):
+            route = self.flight_routes[route_name]
+            end = start + len(route.points_xyz)
+            self._route_slices[route_name] = (start, end)
+            arrays.append(route.points_xyz)
+            route_ids.append(np.full(end - start, route_id, dtype=np.uint16))
+            start = end
+        
+        if arrays:
+            self._all_points = np.ascontiguousarray(np.concatenate(arrays))
+            self._point_route_id = np.concatenate(route_ids)
+        else:
+            self._all_points = np.empty((0, 3), dtype=np.float32)
+            self._point_route_id = np.empty(0, dtype=np.uint16)
+        
+        # 선분 i = (점 i, 점 i+1). 경로 경계를 넘는 선분은 길이 0으로 두어
+        # 모든 조회 경로가 같은 점-선분 거리를 쓰도록 함
+        self._seg_vec = np.zeros_like(self._all_points)
+        if len(self._all_points) > 1:
+            np.subtract(self._all_points[1:], self._all_points[:-1], out=self._seg_vec[:-1])
+            route_ends = np.array([end for start, end in self._route_slices.values() if end > start], dtype=np.intp)
+            self._seg_vec[route_ends - 1] = 0
+        self._seg_len2 = np.einsum('ij,ij->i', self._seg_vec, self._seg_vec)
+        self._half_max_segment = float(np.sqrt(self._seg_len2.max())) / 2 if len(self._seg_len2) else 0.0
+        
+        # 전체 점에 대한 KD-tree (최근접 경로 검색을 O(log M)으로)
+        self._tree = cKDTree(self._all_points) if SCIPY_AVAILABLE and len(self._all_points) else None
+    
+    def _load_route(self, json_path: str) -> Optional[FlightRoute]:
+        """경로 로드 - 유효한 .npy 캐시가 있으면 JSON 파싱 없이 로드"""
+        route = self._load_route_from_cache(json_path)
+        if route is not None:
+            return route
+        
+        route = self._load_route_from_json(json_path)
+        if route is not None:
+            self._write_route_cache(json_path, route)
+        return route
+    
+    def _cache_paths(self, json_path: str) -> Tuple[str, str, str]:
+        """경로 JSON에 대한 캐시 파일 경로 (메타데이터, 경로점, 웨이포인트)"""
+        # 다른 폴더의 같은 이름 파일과 겹치지 않도록 절대 경로 해시를 붙임
+        stem = os.path.splitext(os.path.basename(json_path))[0]
+        digest = hashlib.sha1(os.path.abspath(json_path).encode('utf-8')).hexdigest()[:12]
+        base = os.path.join(ROUTE_CACHE_DIR, f"{stem}-{digest}")
+        return f"{base}.meta.json", f"{base}.points.npy", f"{base}.waypoints.npy"
+    
+    def _load_route_from_cache(self, json_path: str) -> Optional[FlightRoute]:
+        """원본 JSON이 바뀌지 않았으면 캐시된 배열을 로드 (어차피 전체 점 버퍼로 복사되므로 mmap 없이 읽음)"""
+        meta_path, points_path, waypoints_path = self._cache_paths(json_path)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            stat = os.stat(json_path)
+            if meta.get('source_mtime_ns') != stat.st_mtime_ns or meta.get('source_size') != stat.st_size:
+                return None
+            
+            return FlightRoute(
+                path_name=meta['path_name'],
+                waypoints_xyz=np.load(waypoints_path),
+                points_xyz=np.load(points_path),
+                export_time=meta['export_time'],
+                total_waypoints=meta['total_waypoints']
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _write_route_cache(self, json_path: str, route: FlightRoute):
+        """파싱된 경로를 .npy + 메타데이터 사이드카로 저장 (메타데이터를 마지막에 기록)"""
+        meta_path, points_path, waypoints_path = self._cache_paths(json_path)
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            stat = os.stat(json_path)
+            np.save(points_path, np.ascontiguousarray(route.points_xyz))
+            np.save(waypoints_path, np.ascontiguousarray(route.waypoints_xyz))
+            meta = {
+                'path_name': route.path_name,
+                'export_time': route.export_time,
+                'total_waypoints': route.total_waypoints,
+                'source_mtime_ns': stat.st_mtime_ns,
+                'source_size': stat.st_size
+            }
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+        except OSError as e:
+            self.logger.warning(f"Failed to write route cache for {json_path}: {e}")
     
     def _load_route_from_json(self, json_path: str) -> Optional[FlightRoute]:
         """JSON 파일에서 경로 데이터를 로드"""
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # waypoints 변환
-            waypoints = [
-                RoutePoint(wp['x'], wp['y'], wp['z']) 
-                for wp in data['waypoints']
-            ]
+            with open(json_path, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw.decode('utf-8'))
             
-            # route_points 변환
-            route_points = [
-                RoutePoint(rp['x'], rp['y'], rp['z']) 
-                for rp in data['routePoints']
-            ]
+            # 연속 float32 배열로만 보관 (RoutePoint 객체는 만들지 않음)
+            waypoints_xyz = np.asarray(
+                [[wp['x'], wp['y'], wp['z']] for wp in data['waypoints']],
+                dtype=np.float32
+            ).reshape(-1, 3)
+            points_xyz = np.asarray(
+                [[rp['x'], rp['y'], rp['z']] for rp in data['routePoints']],
+                dtype=np.float32
+            ).reshape(-1, 3)
             
             return FlightRoute(
                 path_name=data['pathName'],
-                waypoints=waypoints,
-                route_points=route_points,
+                waypoints_xyz=waypoints_xyz,
+                points_xyz=points_xyz,
                 export_time=data['exportTime'],
                 total_waypoints=data['totalWaypoints']
             )
@@ -106,17 +313,17 @@ class RouteBasedRiskCalculator:
             return float('inf')
         
         route = self.flight_routes[route_name]
-        min_distance = float('inf')
+        if len(route.points_xyz) == 0:
+            return float('inf')
         
-        # 모든 경로 점에 대해 거리 계산
-        for route_point in route.route_points:
-            route_pos = route_point.to_array()
-            distance = np.linalg.norm(flock_position - route_pos)
-            
-            if distance < min_distance:
-                min_distance = distance
+        q = _as_query(flock_position)
+        if len(route.points_xyz) < 2:
+            _, d2 = _nearest_squared(route.points_xyz, q)
+            return float(np.sqrt(d2))
         
-        return min_distance
+        # 경로점 사이 선분까지의 실제 최단거리 (sqrt는 최솟값에만 적용)
+        d2, _ = _segment_distances(route.points_xyz, q)
+        return float(np.sqrt(d2.min()))
     
     def get_closest_point_on_route(self, route_name: str, flock_position: np.ndarray) -> Tuple[float, np.ndarray, int]:
         """
@@ -127,28 +334,29 @@ class RouteBasedRiskCalculator:
             flock_position: 새 떼의 3D 위치 [x, y, z]
             
         Returns:
-            Tuple[최단거리, 가장_가까운_경로점, 경로점_인덱스]
+            Tuple[최단거리, 경로 위의 가장_가까운_점, 그 점에 가장 가까운 경로점_인덱스]
         """
         if route_name not in self.flight_routes:
             self.logger.warning(f"Route not found: {route_name}")
             return float('inf'), np.array([0, 0, 0]), -1
         
         route = self.flight_routes[route_name]
-        min_distance = float('inf')
-        closest_point = None
-        closest_idx = -1
-        
-        # 모든 경로 점에 대해 거리 계산
-        for i, route_point in enumerate(route.route_points):
-            route_pos = route_point.to_array()
-            distance = np.linalg.norm(flock_position - route_pos)
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_point = route_pos
-                closest_idx = i
+        if len(route.points_xyz) == 0:
+            return float('inf'), None, -1
+        
+        q = _as_query(flock_position)
+        if len(route.points_xyz) < 2:
+            closest_idx, d2 = _nearest_squared(route.points_xyz, q)
+            return float(np.sqrt(d2)), route.points_xyz[closest_idx], int(closest_idx)
+        
+        # 가장 가까운 선분 위의 투영점 계산
+        d2, t = _segment_distances(route.points_xyz, q)
+        seg = int(d2.argmin())
+        start, end = route.points_xyz[seg], route.points_xyz[seg + 1]
+        closest_point = start + t[seg] * (end - start)
+        closest_idx = seg + 1 if t[seg] > 0.5 else seg
         
-        return min_distance, closest_point, closest_idx
+        return float(np.sqrt(d2[seg])), closest_point, closest_idx
     
     def calculate_distance_to_all_routes(self, flock_position: np.ndarray) -> Dict[str, Tuple[float, np.ndarray]]:
         """
@@ -162,32 +370,108 @@ class RouteBasedRiskCalculator:
         """
         results = {}
         
-        for route_name in self.flight_routes:
-            distance, closest_point, _ = self.get_closest_point_on_route(route_name, flock_position)
-            results[route_name] = (distance, closest_point)
+        # 전체 선분에 대한 제곱 거리를 한 번에 계산한 뒤 경로별 구간에서 argmin
+        d2, t = _project_on_segments(self._all_points, self._seg_vec, self._seg_len2, _as_query(flock_position))
+        
+        for route_name, (start, end) in self._route_slices.items():
+            if start == end:
+                results[route_name] = (float('inf'), None)
+                continue
+            i = start + int(d2[start:end].argmin())
+            results[route_name] = (float(np.sqrt(d2[i])), self._all_points[i] + t[i] * self._seg_vec[i])
         
         return results
     
-    def get_closest_route(self, flock_position: np.ndarray) -> Tuple[str, float, np.ndarray]:
+    def _segment_candidates(self, q: np.ndarray, radius: float, nearest_idx: int) -> np.ndarray:
+        """
+        KD-tree로 최근접 선분 후보 선택
+        
+        최근접 선분 위의 점이 거리 d에 있으면 그 선분의 한 끝점은 d + (최대 선분 길이)/2 이내에 있으므로,
+        radius 이내 경로점 j에 닿는 선분 j-1, j만 확인하면 됨
+        """
+        idx = np.asarray(self._tree.query_ball_point(q, radius), dtype=np.intp)
+        idx = np.append(idx, nearest_idx)
+        return np.unique(np.concatenate((idx, idx[idx > 0] - 1)))
+    
+    def _nearest_segment(self, q: np.ndarray,
+                         seg_idx: Optional[np.ndarray] = None) -> Tuple[int, float, np.ndarray]:
+        """seg_idx 선분(None이면 전체) 중 q에 가장 가까운 선분의 (선분 인덱스, 거리, 선분 위의 가장 가까운 점)"""
+        if seg_idx is None:
+            d2, t = _project_on_segments(self._all_points, self._seg_vec, self._seg_len2, q)
+        else:
+            d2, t = _project_on_segments(self._all_points[seg_idx], self._seg_vec[seg_idx], self._seg_len2[seg_idx], q)
+        k = int(d2.argmin())
+        i = k if seg_idx is None else int(seg_idx[k])
+        return i, float(np.sqrt(d2[k])), self._all_points[i] + t[k] * self._seg_vec[i]
+    
+    def get_closest_route(self, flock_position: np.ndarray,
+                          max_distance: Optional[float] = None) -> Tuple[str, float, np.ndarray]:
         """
         새 떼 위치에서 가장 가까운 항공기 경로 찾기
         
         Args:
             flock_position: 새 떼의 3D 위치 [x, y, z]
+            max_distance: 지정하면 이 거리 이내(경계 포함)의 가장 가까운 경로를 반환하고,
+                          그보다 먼 후보는 검사하지 않음.
+                          이내에 경로가 없으면 ("", inf, [0, 0, 0]) 반환
             
         Returns:
             Tuple[가장_가까운_경로명, 최단거리, 가장_가까운_경로점]
         """
-        all_distances = self.calculate_distance_to_all_routes(flock_position)
+        not_found = ("", float('inf'), np.array([0, 0, 0]))
+        q = _as_query(flock_position)
+        
+        if self._tree is not None:
+            # 최근접 경로점으로 후보 선분을 좁힌 뒤 선분 거리로 확정
+            vertex_distance, nearest_idx = self._tree.query(q)
+            radius = vertex_distance + self._half_max_segment
+            if max_distance is not None:
+                radius = min(radius, max_distance + self._half_max_segment)
+            i, distance, closest_point = self._nearest_segment(q, self._segment_candidates(q, radius, nearest_idx))
+            if max_distance is not None and distance > max_distance:
+                return not_found
+            return self._route_names[self._point_route_id[i]], distance, closest_point
+        
+        if len(self._all_points) == 0:
+            return not_found
+        
+        # scipy가 없으면 전체 선분에 대한 한 번의 벡터화 계산으로 최근접 선분 선택
+        i, distance, closest_point = self._nearest_segment(q)
+        if max_distance is not None and distance > max_distance:
+            return not_found
+        return self._route_names[self._point_route_id[i]], distance, closest_point
+    
+    def get_closest_route_batch(self, flock_positions: np.ndarray) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        여러 새 떼 위치에 대해 가장 가까운 항공기 경로를 한 번에 찾기
+        
+        Args:
+            flock_positions: 새 떼들의 3D 위치 배열 (F, 3)
+            
+        Returns:
+            Tuple[경로명 리스트, 최단거리 배열 (F,), 가장_가까운_경로점 배열 (F, 3)]
+        """
+        flock_positions = _as_query(flock_positions).reshape(-1, 3)
         
-        if not all_distances:
-            return "", float('inf'), np.array([0, 0, 0])
+        if self._tree is not None:
+            # 모든 코어를 사용하는 병렬 KD-tree 검색으로 최근접 경로점을 찾고, 위치별로 선분 거리로 확정
+            vertex_distances, nearest_indices = self._tree.query(flock_positions, k=1, workers=-1)
+            names, distances = [], np.empty(len(flock_positions), dtype=np.float64)
+            points = np.empty((len(flock_positions), 3), dtype=np.float64)
+            for n, (q, vertex_distance, nearest_idx) in enumerate(zip(flock_positions, vertex_distances, nearest_indices)):
+                seg_idx = self._segment_candidates(q, vertex_distance + self._half_max_segment, nearest_idx)
+                i, distances[n], points[n] = self._nearest_segment(q, seg_idx)
+                names.append(self._route_names[self._point_route_id[i]])
+            return names, distances, points
         
-        closest_route = min(all_distances.items(), key=lambda x: x[1][0])
-        route_name = closest_route[0]
-        distance, closest_point = closest_route[1]
+        names, distances, points = [], [], []
+        for position in flock_positions:
+            route_name, distance, closest_point = self.get_closest_route(position)
+            names.append(route_name)
+            distances.append(distance)
+            points.append(closest_point)
         
-        return route_name, distance, closest_point
+        return names, np.asarray(distances, dtype=np.float64), np.asarray(points, dtype=np.float64).reshape(-1, 3)
     
     def calculate_route_segment_direction(self, route_name: str, closest_point: np.ndarray, 
                                         segment_length: int = 5) -> np.ndarray:
@@ -206,17 +490,34 @@ class RouteBasedRiskCalculator:
             return np.array([0, 0, 0])
         
         route = self.flight_routes[route_name]
-        route_points = [rp.to_array() for rp in route.route_points]
+        route_points = route.points_xyz
+        if len(route_points) == 0:
+            return np.array([0, 0, 0])
         
         # 가장 가까운 경로 점의 인덱스 찾기
-        closest_idx = 0
-        min_dist = float('inf')
+        closest_idx, _ = _nearest_squared(route_points, _as_query(closest_point))
+        
+        return self.calculate_route_segment_direction_at_index(route_name, int(closest_idx), segment_length)
+    
+    def calculate_route_segment_direction_at_index(self, route_name: str, closest_idx: int,
+                                                   segment_length: int = 5) -> np.ndarray:
+        """
+        경로점 인덱스에서 항공기 진행 방향 계산 (get_closest_point_on_route 결과 재사용)
+        
+        Args:
+            route_name: 경로 이름
+            closest_idx: 가장 가까운 경로점 인덱스
+            segment_length: 방향 계산에 사용할 세그먼트 길이
+            
+        Returns:
+            정규화된 방향 벡터
+        """
+        if route_name not in self.flight_routes:
+            return np.array([0, 0, 0])
         
-        for i, point in enumerate(route_points):
-            dist = np.linalg.norm(point - closest_point)
-            if dist < min_dist:
-                min_dist = dist
-                closest_idx = i
+        route_points = self.flight_routes[route_name].points_xyz
+        if not 0 <= closest_idx < len(route_points):
+            return np.array([0, 0, 0])
         
         # 진행 방향 계산 (앞쪽 세그먼트 사용)
         start_idx = max(0, closest_idx - segment_length // 2)
@@ -246,7 +547,7 @@ class RouteBasedRiskCalculator:
         return {
             'path_name': route.path_name,
             'total_waypoints': route.total_waypoints,
-            'total_route_points': len(route.route_points),
+            'total_route_points': len(route.points_xyz),
             'export_time': route.export_time
         }
 
@@ -278,7 +579,8 @@ def test_route_calculator():
     
     # 경로 방향 계산
     if closest_route:
-        direction = calculator.calculate_route_segment_direction(closest_route, closest_point)
+        _, _, closest_idx = calculator.get_closest_point_on_route(closest_route, test_flock_position)
+        direction = calculator.calculate_route_segment_direction_at_index(closest_route, closest_idx)
         print(f"경로 진행 방향: {direction}")
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@
 - route_based_risk_calculator.py가 사용할 수 있는 형태로 저장
 """
 
+import importlib.util
 import json
 import numpy as np
 import os
@@ -14,24 +15,94 @@ from dataclasses import dataclass
 import logging
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-# 스무딩을 위한 추가 import
+# 스무딩을 위한 scipy는 설치 여부만 확인하고 실제 스무딩 시점에 import
+# (실시간 수집 경로에서는 scipy를 쓰지 않으므로 모듈 import 비용을 줄임)
+SCIPY_AVAILABLE = importlib.util.find_spec("scipy") is not None
+if not SCIPY_AVAILABLE:
+    print("Warning: scipy not available, using simple smoothing")
+
+# 빠른 JSON 직렬화 (선택)
 try:
-    from scipy import interpolate
-    from scipy.ndimage import gaussian_filter1d
-    SCIPY_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    SCIPY_AVAILABLE = False
-    print("Warning: scipy not available, using simple smoothing")
+    ORJSON_AVAILABLE = False
+
+# 프레임별 집계 커널 가속 (선택)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # --- 전역 상태 변수 ---
 _collector_instance: Optional['TriangulationRouteCollector'] = None
 _last_saved_path: Optional[Path] = None
 # ---------------------
 
+# 객체 타입 코드 (수집 중에는 문자열 대신 int8 코드로 보관)
+OBJECT_TYPE_CODES = {'airplane': 0, 'flock': 1}
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _aggregate_frames(frames: np.ndarray, xyz: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """프레임 순으로 정렬된 점들을 프레임별 대표 좌표로 집계"""
+        n = frames.shape[0]
+        n_groups = 1
+        for i in range(1, n):
+            if frames[i] != frames[i - 1]:
+                n_groups += 1
+        
+        unique_frames = np.empty(n_groups, dtype=np.int64)
+        out = np.empty((n_groups, 3), dtype=np.float64)
+        g = 0
+        start = 0
+        for i in range(1, n + 1):
+            if i < n and frames[i] == frames[start]:
+                continue
+            count = i - start
+            for axis in range(3):
+                total = 0.0
+                for j in range(start, i):
+                    total += xyz[j, axis]
+                mean = total / count
+                # 많은 점들이 있는 경우 중앙값 70% + 평균 30%
+                if count > 3:
+                    mean = 0.7 * np.median(xyz[start:i, axis]) + 0.3 * mean
+                out[g, axis] = mean
+            unique_frames[g] = frames[start]
+            g += 1
+            start = i
+        return unique_frames, out
+else:
+    def _aggregate_frames(frames: np.ndarray, xyz: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """프레임 순으로 정렬된 점들을 프레임별 대표 좌표로 집계"""
+        unique_frames, starts = np.unique(frames, return_index=True)
+        counts = np.diff(np.append(starts, len(frames)))
+        
+        # 프레임별 평균 (단일 점은 그대로, 3개 이하는 단순 평균)
+        avg_xyz = np.add.reduceat(xyz, starts, axis=0) / counts[:, None]
+        
+        # 많은 점들이 있는 경우 중앙값 70% + 평균 30% (이상치 영향 최소화)
+        big = counts > 3
+        if big.any():
+            # 프레임별 루프 대신 그룹 내 정렬 한 번으로 모든 프레임의 중앙값 계산
+            group_ids = np.repeat(np.arange(len(starts)), counts)
+            sorted_xyz = np.empty_like(xyz)
+            for axis in range(3):
+                sorted_xyz[:, axis] = xyz[np.lexsort((xyz[:, axis], group_ids)), axis]
+            lo = starts[big] + (counts[big] - 1) // 2
+            hi = starts[big] + counts[big] // 2
+            median = 0.5 * (sorted_xyz[lo] + sorted_xyz[hi])
+            avg_xyz[big] = 0.7 * median + 0.3 * avg_xyz[big]
+        return unique_frames, avg_xyz
+
+
 @dataclass
 class TriangulatedPoint:
-    """삼각측량된 점"""
+    """삼각측량된 점 (수집 버퍼의 한 행을 꺼내 볼 때 사용)"""
     frame_id: int
     x: float
     y: float
@@ -55,22 +126,48 @@ class TriangulationRouteCollector:
         (self.data_directory / "raw_runs").mkdir(exist_ok=True)
         (self.data_directory / "averaged_routes").mkdir(exist_ok=True)
         
-        # 현재 수집 중인 데이터
-        self.current_run_data = []
+        # 현재 수집 중인 데이터 (열 단위 배열, 용량이 부족하면 두 배로 확장)
+        self._capacity = 1024
+        self._n = 0
+        self._frame_ids = np.empty(self._capacity, dtype=np.int32)
+        self._xyz = np.empty((self._capacity, 3), dtype=np.float64)
+        self._timestamps = np.empty(self._capacity, dtype=np.float64)
+        self._type_ids = np.empty(self._capacity, dtype=np.int8)
+        self._type_codes: Dict[str, int] = dict(OBJECT_TYPE_CODES)
+        self._type_names: List[str] = list(OBJECT_TYPE_CODES)
         self.collection_active = False
         self.current_run_id = None
         
-        self.logger.info(f"[TriangulationRouteCollector] 초기화 완료: {self.data_directory}")
+        # 스트리밍 모드 (NDJSON으로 바로 기록)
+        self._stream_file = None
+        self._stream_path: Optional[Path] = None
+        self._stream_count = 0
+        
+        # 실행 파일 파싱 캐시 (경로 -> (st_mtime_ns, st_size, 파싱된 데이터, 객체 타입별 배열))
+        self._file_cache: Dict[Path, Tuple[int, int, Dict, Dict[str, Tuple[np.ndarray, np.ndarray]]]] = {}
+        
+        self.logger.info("[TriangulationRouteCollector] 초기화 완료: %s", self.data_directory)
     
-    def start_collection(self, route_name: str) -> str:
-        """데이터 수집 시작"""
+    def start_collection(self, route_name: str, stream: bool = False) -> str:
+        """데이터 수집 시작
+        
+        Args:
+            route_name: 경로 이름
+            stream: True면 점들을 메모리에 쌓지 않고 .jsonl 파일에 바로 기록
+        """
         run_id = f"{route_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
+        self._close_stream()
         self.current_run_id = run_id
-        self.current_run_data = []
+        self._n = 0
         self.collection_active = True
         
-        self.logger.info(f"[TriangulationRouteCollector] 수집 시작: {run_id}")
+        if stream:
+            self._stream_path = self.data_directory / "raw_runs" / f"{run_id}.jsonl"
+            self._stream_file = open(self._stream_path, 'wb', buffering=1 << 16)
+            self._stream_count = 0
+        
+        self.logger.info("[TriangulationRouteCollector] 수집 시작: %s", run_id)
         return run_id
     
     def add_triangulation_result(self, frame_id: int, triangulated_points: List[Dict]):
@@ -80,16 +177,60 @@ class TriangulationRouteCollector:
         
         timestamp = datetime.now().timestamp()
         
-        for point_data in triangulated_points:
-            triangulated_point = TriangulatedPoint(
-                frame_id=frame_id,
-                x=point_data['position'][0],
-                y=point_data['position'][1], 
-                z=point_data['position'][2],
-                object_type=point_data['class_name'].lower(),
-                timestamp=timestamp
-            )
-            self.current_run_data.append(triangulated_point)
+        if self._stream_file is not None:
+            # 스트리밍 모드: 최종 저장 형식 그대로 한 줄씩 기록
+            for point_data in triangulated_points:
+                self._stream_file.write(_dumps_line({
+                    'frame_id': frame_id,
+                    'x': point_data['position'][0],
+                    'y': point_data['position'][1],
+                    'z': point_data['position'][2],
+                    'object_type': point_data['class_name'].lower(),
+                    'timestamp': timestamp
+                }))
+            self._stream_count += len(triangulated_points)
+            return
+        
+        k = len(triangulated_points)
+        if k == 0:
+            return
+        
+        self._reserve(self._n + k)
+        rows = slice(self._n, self._n + k)
+        self._frame_ids[rows] = frame_id
+        self._xyz[rows] = [point_data['position'][:3] for point_data in triangulated_points]
+        self._timestamps[rows] = timestamp
+        self._type_ids[rows] = [self._type_code(point_data['class_name'].lower())
+                                for point_data in triangulated_points]
+        self._n += k
+    
+    def _reserve(self, size: int):
+        """수집 버퍼가 size개 이상의 점을 담을 수 있도록 확장"""
+        if size <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < size:
+            capacity *= 2
+        
+        def grow(array: np.ndarray) -> np.ndarray:
+            grown = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:self._n] = array[:self._n]
+            return grown
+        
+        self._frame_ids = grow(self._frame_ids)
+        self._xyz = grow(self._xyz)
+        self._timestamps = grow(self._timestamps)
+        self._type_ids = grow(self._type_ids)
+        self._capacity = capacity
+    
+    def _type_code(self, object_type: str) -> int:
+        """객체 타입 문자열을 코드로 변환 (처음 보는 타입은 새 코드 할당)"""
+        code = self._type_codes.get(object_type)
+        if code is None:
+            code = len(self._type_names)
+            self._type_codes[object_type] = code
+            self._type_names.append(object_type)
+        return code
     
     def stop_collection(self) -> Optional[str]:
         """데이터 수집 종료 및 저장"""
@@ -102,260 +243,323 @@ class TriangulationRouteCollector:
         filename = f"{self.current_run_id}.json"
         filepath = self.data_directory / "raw_runs" / filename
         
-        # JSON 직렬화를 위한 데이터 변환
+        global _last_saved_path
+        
+        if self._stream_file is not None:
+            total_points = self._stream_count
+            self._assemble_stream(filepath)
+            _last_saved_path = filepath
+            
+            self.logger.info("[TriangulationRouteCollector] 데이터 저장 완료: %s", filepath)
+            self.logger.info("[TriangulationRouteCollector] 총 포인트 수: %s", total_points)
+            
+            run_id = self.current_run_id
+            self.current_run_id = None
+            return run_id
+        
+        # JSON 직렬화를 위한 데이터 변환 (버퍼 구간을 파이썬 스칼라로 한 번에 변환)
+        n = self._n
+        type_names = self._type_names
         run_data = {
             'run_id': self.current_run_id,
             'collection_time': datetime.now().isoformat(),
-            'total_points': len(self.current_run_data),
-            'points': []
+            'total_points': n,
+            'points': [
+                {
+                    'frame_id': frame_id,
+                    'x': x,
+                    'y': y,
+                    'z': z,
+                    'object_type': type_names[type_id],
+                    'timestamp': timestamp
+                }
+                for frame_id, (x, y, z), type_id, timestamp in zip(
+                    self._frame_ids[:n].tolist(), self._xyz[:n].tolist(),
+                    self._type_ids[:n].tolist(), self._timestamps[:n].tolist()
+                )
+            ]
         }
         
-        for point in self.current_run_data:
-            point_dict = {
-                'frame_id': point.frame_id,
-                'x': point.x,
-                'y': point.y,
-                'z': point.z,
-                'object_type': point.object_type,
-                'timestamp': point.timestamp
-            }
-            run_data['points'].append(point_dict)
-        
-        global _last_saved_path
         _last_saved_path = filepath
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(run_data, f, indent=2, ensure_ascii=False)
+        # 원시 실행 파일은 사람이 읽는 용도가 아니므로 압축 형식으로 저장
+        _write_json(filepath, run_data, indent=False)
         
-        self.logger.info(f"[TriangulationRouteCollector] 데이터 저장 완료: {filepath}")
-        self.logger.info(f"[TriangulationRouteCollector] 총 포인트 수: {len(self.current_run_data)}")
+        self.logger.info("[TriangulationRouteCollector] 데이터 저장 완료: %s", filepath)
+        self.logger.info("[TriangulationRouteCollector] 총 포인트 수: %s", n)
         
         run_id = self.current_run_id
         self.current_run_id = None
-        self.current_run_data = []
+        self._n = 0
         return run_id
     
+    def _assemble_stream(self, filepath: Path):
+        """스트리밍된 .jsonl 파일을 한 번의 순차 읽기로 최종 JSON으로 변환"""
+        self._stream_file.close()
+        self._stream_file = None
+        
+        header = {
+            'run_id': self.current_run_id,
+            'collection_time': datetime.now().isoformat(),
+            'total_points': self._stream_count
+        }
+        head = json.dumps(header, ensure_ascii=False)[:-1]  # 닫는 중괄호 제거
+        
+        with open(self._stream_path, 'rb') as src, open(filepath, 'wb') as dst:
+            dst.write(head.encode('utf-8') + b', "points": [\n')
+            for i, line in enumerate(src):
+                if i:
+                    dst.write(b',\n')
+                dst.write(line.rstrip(b'\n'))
+            dst.write(b'\n]}\n')
+        
+        self._stream_path.unlink()
+        self._stream_path = None
+        self._stream_count = 0
+    
+    def _close_stream(self):
+        """진행 중인 스트림 파일 정리"""
+        if self._stream_file is not None:
+            self._stream_file.close()
+            self._stream_file = None
+        if self._stream_path is not None and self._stream_path.exists():
+            self._stream_path.unlink()
+        self._stream_path = None
+        self._stream_count = 0
+    
     def load_raw_runs(self, route_name: str = None) -> List[Dict]:
         """저장된 실행 데이터 로드 (필터링된 데이터 우선 사용)"""
+        return [run_data for run_data, _ in self._load_runs(route_name)]
+    
+    def _load_runs(self, route_name: str = None) -> List[Tuple[Dict, Dict[str, Tuple[np.ndarray, np.ndarray]]]]:
+        """실행 데이터와 객체 타입별 (프레임 ID, 좌표) 배열을 함께 로드
+        
+        객체 타입 분류는 파일을 파싱할 때 한 번만 수행되고 파싱 결과와 함께 캐시됩니다.
+        """
         # 먼저 필터링된 데이터가 있는지 확인
         filtered_runs_dir = self.data_directory / "averaged_routes"
         raw_runs_dir = self.data_directory / "raw_runs"
         
         # 필터링된 데이터 로드 시도
-        filtered_files = []
-        if filtered_runs_dir.exists():
-            filtered_files = [f for f in filtered_runs_dir.glob("*.json") 
-                            if not f.name.endswith("_averaged.json")]  # 평균 파일 제외
+        filtered_files = [entry for entry in _scan_files(filtered_runs_dir, ".json")
+                          if not entry.name.endswith("_averaged.json")]  # 평균 파일 제외
         
         # 필터링된 데이터가 있으면 우선 사용
         if filtered_files:
-            self.logger.info(f"[TriangulationRouteCollector] 필터링된 데이터 사용: {len(filtered_files)}개 파일")
+            self.logger.info("[TriangulationRouteCollector] 필터링된 데이터 사용: %s개 파일", len(filtered_files))
             json_files = filtered_files
             source_dir = "averaged_routes (filtered)"
         else:
-            self.logger.info(f"[TriangulationRouteCollector] 원시 데이터 사용")
-            json_files = list(raw_runs_dir.glob("*.json"))
+            self.logger.info("[TriangulationRouteCollector] 원시 데이터 사용")
+            json_files = _scan_files(raw_runs_dir, ".json")
             source_dir = "raw_runs"
         
+        # 파일 I/O와 파싱을 병렬로 수행 (결과는 파일 순서대로)
+        results = []
+        if json_files:
+            with ThreadPoolExecutor(max_workers=min(8, len(json_files))) as executor:
+                results = list(executor.map(self._load_run_file, json_files))
+        
         loaded_runs = []
-        for json_file in json_files:
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    run_data = json.load(f)
-                
-                # 필터링
-                if route_name and not run_data['run_id'].startswith(route_name):
-                    continue
-                
-                loaded_runs.append(run_data)
-            except Exception as e:
-                self.logger.error(f"Failed to load {json_file}: {e}")
+        file_cache = {}
+        for entry, cache_entry in zip(json_files, results):
+            if cache_entry is None:
+                continue
+            json_file = Path(entry.path)
+            file_cache[json_file] = cache_entry
+            run_data, buckets = cache_entry[2:]
+            
+            # 필터링
+            if route_name and not run_data.get('run_id', '').startswith(route_name):
+                continue
+            
+            loaded_runs.append((run_data, buckets))
         
-        self.logger.info(f"[TriangulationRouteCollector] 로드 완료: {len(loaded_runs)}개 실행 ({source_dir})")
+        # 이번에 본 파일만 남겨 삭제된 파일의 캐시가 쌓이지 않도록 함
+        self._file_cache = file_cache
+        
+        self.logger.info("[TriangulationRouteCollector] 로드 완료: %s개 실행 (%s)", len(loaded_runs), source_dir)
         return loaded_runs
     
-    def calculate_average_route(self, route_name: str, min_runs: int = 3) -> Optional[Dict]:
-        """여러 실행 데이터를 평균내어 평균 경로 생성"""
-        runs = self.load_raw_runs(route_name)
-        
-        if len(runs) < min_runs:
-            self.logger.warning(f"[TriangulationRouteCollector] 평균 계산을 위한 최소 실행 수({min_runs})가 부족합니다. 현재: {len(runs)}")
+    def _load_run_file(self, entry: os.DirEntry) -> Optional[Tuple[int, int, Dict, Dict[str, Tuple[np.ndarray, np.ndarray]]]]:
+        """실행 파일 하나를 파싱해 캐시 항목으로 반환 (실패 시 None, 스레드에서 호출됨)"""
+        json_file = Path(entry.path)
+        try:
+            # 파일이 바뀌지 않았으면 이전에 파싱한 결과 재사용
+            st = entry.stat()
+            cached = self._file_cache.get(json_file)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                return cached
+            run_data = _read_json(json_file)
+            buckets = _bucket_points(run_data.get('points', []))
+            return (st.st_mtime_ns, st.st_size, run_data, buckets)
+        except Exception as e:
+            self.logger.error("Failed to load %s: %s", json_file, e)
             return None
+    
+    def calculate_average_route(self, route_name: str, min_runs: int = 3,
+                                smoothing_method: str = "gaussian") -> Optional[Dict]:
+        """여러 실행 데이터를 평균내어 평균 경로 생성
         
-        self.logger.info(f"[TriangulationRouteCollector] {len(runs)}개 실행 데이터로 평균 경로 계산 중...")
+        Args:
+            smoothing_method: "gaussian" (가우시안 필터) 또는 "spline" (적은 제어점의 B-스플라인 근사)
+        """
+        runs = self._load_runs(route_name)
         
-        # 객체 타입별로 분리하여 처리
-        airplane_points = []
-        flock_points = []
+        if len(runs) < min_runs or not runs:
+            self.logger.warning("[TriangulationRouteCollector] 평균 계산을 위한 최소 실행 수(%s)가 부족합니다. 현재: %s", min_runs, len(runs))
+            return None
+        
+        self.logger.info("[TriangulationRouteCollector] %s개 실행 데이터로 평균 경로 계산 중...", len(runs))
         
-        for run in runs:
-            for point in run['points']:
-                if point['object_type'] == 'airplane':
-                    airplane_points.append(point)
-                elif point['object_type'] == 'flock':
-                    flock_points.append(point)
+        # 평균 경로는 항공기 점만으로 계산 (로드 시 분류된 배열을 이어 붙임)
+        airplane_frames = np.concatenate([buckets['airplane'][0] for _, buckets in runs])
+        airplane_points = np.concatenate([buckets['airplane'][1] for _, buckets in runs])
         
         # 항공기 경로 평균 계산
-        airplane_route = self._calculate_object_average_route(airplane_points, 'airplane')
+        frame_ids, airplane_xyz = self._calculate_object_average_route(
+            airplane_frames, airplane_points, 'airplane', smoothing_method=smoothing_method
+        )
         
-        if not airplane_route:
+        if len(frame_ids) == 0:
             self.logger.error("[TriangulationRouteCollector] 항공기 경로 계산 실패")
             return None
         
+        # 경로점 목록은 한 번의 리스트 컴프리헨션으로 정확한 크기로 생성
+        waypoints = [{'x': x, 'y': y, 'z': z} for x, y, z in airplane_xyz.tolist()]
+        
         # route_based_risk_calculator.py 호환 형식으로 변환
+        # waypoints와 routePoints를 동일하게 설정 (단순화, 같은 dict 참조를 공유)
         route_data = {
             'pathName': route_name,
             'exportTime': datetime.now().isoformat(),
-            'totalWaypoints': len(airplane_route),
-            'waypoints': [],
-            'routePoints': []
+            'totalWaypoints': len(waypoints),
+            'waypoints': waypoints,
+            'routePoints': list(waypoints)
         }
         
-        # waypoints와 routePoints를 동일하게 설정 (단순화)
-        for i, point in enumerate(airplane_route):
-            point_dict = {
-                'x': point['x'],
-                'y': point['y'], 
-                'z': point['z']
-            }
-            route_data['waypoints'].append(point_dict)
-            route_data['routePoints'].append(point_dict)
-        
         # 저장
         filename = f"{route_name}_averaged.json"
         filepath = self.data_directory / "averaged_routes" / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(route_data, f, indent=2, ensure_ascii=False)
+        _write_json(filepath, route_data)
         
-        self.logger.info(f"[TriangulationRouteCollector] 평균 경로 저장 완료: {filepath}")
-        self.logger.info(f"[TriangulationRouteCollector] 총 경로점: {len(airplane_route)}, 사용된 실행: {len(runs)}")
+        self.logger.info("[TriangulationRouteCollector] 평균 경로 저장 완료: %s", filepath)
+        self.logger.info("[TriangulationRouteCollector] 총 경로점: %s, 사용된 실행: %s", len(airplane_xyz), len(runs))
         
         return route_data
     
-    def _calculate_object_average_route(self, points: List[Dict], object_type: str) -> List[Dict]:
-        """특정 객체의 평균 경로 계산 - Raw 데이터 보존 우선"""
-        if not points:
-            return []
-        
-        # 프레임별로 그룹화
-        frame_groups = {}
-        for point in points:
-            frame_id = point['frame_id']
-            if frame_id not in frame_groups:
-                frame_groups[frame_id] = []
-            frame_groups[frame_id].append(point)
-        
-        # 각 프레임별 처리 - 과도한 평균화 방지
-        averaged_route = []
-        for frame_id in sorted(frame_groups.keys()):
-            frame_points = frame_groups[frame_id]
-            
-            if len(frame_points) >= 1:
-                if len(frame_points) == 1:
-                    # 단일 점인 경우 그대로 사용 (평균화 불필요)
-                    point = frame_points[0]
-                    avg_x, avg_y, avg_z = point['x'], point['y'], point['z']
-                elif len(frame_points) <= 3:
-                    # 적은 수의 점들은 단순 평균
-                    avg_x = np.mean([p['x'] for p in frame_points])
-                    avg_y = np.mean([p['y'] for p in frame_points])
-                    avg_z = np.mean([p['z'] for p in frame_points])
-                else:
-                    # 많은 점들이 있는 경우 중앙값과 평균의 가중 조합 (이상치 영향 최소화)
-                    x_vals = [p['x'] for p in frame_points]
-                    y_vals = [p['y'] for p in frame_points]
-                    z_vals = [p['z'] for p in frame_points]
-                    
-                    # 중앙값 70% + 평균 30% (자연스러운 경로 보존)
-                    avg_x = 0.7 * np.median(x_vals) + 0.3 * np.mean(x_vals)
-                    avg_y = 0.7 * np.median(y_vals) + 0.3 * np.mean(y_vals)
-                    avg_z = 0.7 * np.median(z_vals) + 0.3 * np.mean(z_vals)
-                
-                averaged_route.append({
-                    'frame_id': frame_id,
-                    'x': float(avg_x),
-                    'y': float(avg_y),
-                    'z': float(avg_z),
-                    'sample_count': len(frame_points)
-                })
+    def _calculate_object_average_route(self, frames: np.ndarray, xyz: np.ndarray, object_type: str,
+                                        smoothing_method: str = "gaussian") -> Tuple[np.ndarray, np.ndarray]:
+        """특정 객체의 평균 경로 계산 - Raw 데이터 보존 우선
+        
+        Args:
+            frames: 각 점의 프레임 ID 배열 (N,)
+            xyz: 각 점의 좌표 배열 (N, 3)
         
-        self.logger.info(f"[TriangulationRouteCollector] {object_type} 평균 경로 계산 완료: {len(averaged_route)}개 점")
+        Returns:
+            Tuple[프레임 ID 배열 (M,), 스무딩된 좌표 배열 (M, 3)]
+        """
+        if len(frames) == 0:
+            return np.empty(0, dtype=np.int64), np.empty((0, 3), dtype=np.float64)
+        
+        # 프레임 순으로 정렬 후 프레임별 집계 (numba 커널 또는 NumPy 그룹 연산)
+        order = np.argsort(frames, kind='stable')
+        unique_frames, avg_xyz = _aggregate_frames(frames[order], xyz[order])
+        
+        self.logger.info("[TriangulationRouteCollector] %s 평균 경로 계산 완료: %s개 점", object_type, len(avg_xyz))
         
-        # 🎯 스무딩 적용
-        smoothed_route = self._smooth_route(averaged_route, smoothing_factor=0.3)
-        self.logger.info(f"[TriangulationRouteCollector] {object_type} 경로 스무딩 완료")
+        # 🎯 스무딩 적용 (평균 배열을 그대로 전달)
+        if smoothing_method == "spline":
+            smoothed_xyz = self._spline_smooth(unique_frames, avg_xyz)
+        else:
+            smoothed_xyz = self._smooth_route(avg_xyz, smoothing_factor=0.3)
+        self.logger.info("[TriangulationRouteCollector] %s 경로 스무딩 완료", object_type)
         
-        return smoothed_route
+        return unique_frames, smoothed_xyz
     
-    def _smooth_route(self, route_points: List[Dict], smoothing_factor: float = 0.3) -> List[Dict]:
-        """경로 스무딩 - 급격한 변화를 부드럽게 만듦"""
-        if len(route_points) < 3:
-            return route_points
+    def _smooth_route(self, xyz: np.ndarray, smoothing_factor: float = 0.3) -> np.ndarray:
+        """경로 스무딩 - 급격한 변화를 부드럽게 만듦 (xyz: (N, 3) 배열)"""
+        if len(xyz) < 3:
+            return xyz
         
-        # 좌표 추출
-        x_coords = np.array([p['x'] for p in route_points])
-        y_coords = np.array([p['y'] for p in route_points])
-        z_coords = np.array([p['z'] for p in route_points])
+        # 경로점은 JSON으로 저장되므로 float32 반올림 잡음이 남지 않도록 float64로 처리
+        xyz = np.ascontiguousarray(xyz, dtype=np.float64)
         
-        if SCIPY_AVAILABLE and len(route_points) >= 5:
+        if SCIPY_AVAILABLE and len(xyz) >= 5:
             # scipy 사용한 정교한 스무딩
             try:
-                # 가우시안 필터 적용 (sigma 값으로 스무딩 강도 조절)
-                sigma = max(1.0, len(route_points) * 0.02)  # 동적 시그마
+                from scipy.ndimage import gaussian_filter1d
                 
-                x_smooth = gaussian_filter1d(x_coords, sigma=sigma)
-                y_smooth = gaussian_filter1d(y_coords, sigma=sigma)
-                z_smooth = gaussian_filter1d(z_coords, sigma=sigma)
+                # 가우시안 필터 적용 (sigma 값으로 스무딩 강도 조절, 세 축을 한 번에)
+                sigma = max(1.0, len(xyz) * 0.02)  # 동적 시그마
+                # 경계는 끝점 값을 연장 ('nearest') - 반사 패딩으로 인한 회전 구간 끝점 왜곡 방지
+                smooth = gaussian_filter1d(xyz, sigma=sigma, axis=0, mode='nearest')
                 
                 # 원래 데이터와 스무딩된 데이터의 가중 평균
-                x_final = (1 - smoothing_factor) * x_coords + smoothing_factor * x_smooth
-                y_final = (1 - smoothing_factor) * y_coords + smoothing_factor * y_smooth
-                z_final = (1 - smoothing_factor) * z_coords + smoothing_factor * z_smooth
+                final = xyz + smoothing_factor * (smooth - xyz)
                 
-                self.logger.info(f"[TriangulationRouteCollector] scipy 가우시안 스무딩 적용 (sigma={sigma:.2f})")
+                self.logger.info("[TriangulationRouteCollector] scipy 가우시안 스무딩 적용 (sigma=%.2f)", sigma)
                 
             except Exception as e:
-                self.logger.warning(f"[TriangulationRouteCollector] scipy 스무딩 실패, 단순 스무딩 사용: {e}")
+                self.logger.warning("[TriangulationRouteCollector] scipy 스무딩 실패, 단순 스무딩 사용: %s", e)
                 # 단순 스무딩으로 fallback
-                x_final, y_final, z_final = self._simple_smoothing(x_coords, y_coords, z_coords, smoothing_factor)
+                final = self._simple_smoothing(xyz, smoothing_factor)
         else:
             # 단순 이동 평균 스무딩
-            x_final, y_final, z_final = self._simple_smoothing(x_coords, y_coords, z_coords, smoothing_factor)
-        
-        # 결과 생성
-        smoothed_route = []
-        for i, point in enumerate(route_points):
-            smoothed_point = point.copy()
-            smoothed_point['x'] = float(x_final[i])
-            smoothed_point['y'] = float(y_final[i])
-            smoothed_point['z'] = float(z_final[i])
-            smoothed_route.append(smoothed_point)
-        
-        return smoothed_route
+            final = self._simple_smoothing(xyz, smoothing_factor)
+        
+        return final
+    
+    def _spline_smooth(self, frame_ids: np.ndarray, xyz: np.ndarray,
+                       points_per_control: int = 10) -> np.ndarray:
+        """적은 제어점의 3차 B-스플라인으로 경로를 최소제곱 근사 (xyz: (N, 3) 배열)
+        
+        제어점 수는 대략 N / points_per_control개이며, 각 프레임 위치에서 다시 평가하므로
+        반환 배열은 입력과 같은 (N, 3) 형태입니다.
+        """
+        n_ctrl = max(4, len(xyz) // points_per_control)
+        if not SCIPY_AVAILABLE or len(xyz) <= n_ctrl:
+            self.logger.info("[TriangulationRouteCollector] B-스플라인 조건 불충족, 가우시안 스무딩 사용")
+            return self._smooth_route(xyz)
+        
+        try:
+            from scipy import interpolate
+            
+            x = frame_ids.astype(np.float64)
+            # 내부 매듭은 데이터 분위수에 두어 모든 구간에 점이 들어가도록 함
+            interior = np.quantile(x, np.linspace(0.0, 1.0, n_ctrl - 2)[1:-1])
+            knots = np.concatenate(([x[0]] * 4, interior, [x[-1]] * 4))
+            spline = interpolate.make_lsq_spline(x, xyz, knots, k=3, axis=0)
+            smooth = spline(x)
+            
+            self.logger.info("[TriangulationRouteCollector] B-스플라인 스무딩 적용 (제어점=%s)", n_ctrl)
+            return smooth
+        except Exception as e:
+            self.logger.warning("[TriangulationRouteCollector] B-스플라인 근사 실패, 가우시안 스무딩 사용: %s", e)
+            return self._smooth_route(xyz)
     
-    def _simple_smoothing(self, x_coords: np.ndarray, y_coords: np.ndarray, z_coords: np.ndarray, 
-                         smoothing_factor: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """단순 이동 평균 스무딩"""
-        window_size = min(5, len(x_coords) // 3)
+    def _simple_smoothing(self, xyz: np.ndarray, smoothing_factor: float) -> np.ndarray:
+        """단순 이동 평균 스무딩 (xyz: (N, 3) 배열)"""
+        window_size = min(5, len(xyz) // 3)
         if window_size >= 3:
-            # 이동 평균 적용
-            x_smooth = np.convolve(x_coords, np.ones(window_size)/window_size, mode='same')
-            y_smooth = np.convolve(y_coords, np.ones(window_size)/window_size, mode='same')
-            z_smooth = np.convolve(z_coords, np.ones(window_size)/window_size, mode='same')
+            # 이동 평균 적용 (누적합 박스 필터, np.convolve(mode='same')와 동일한 0 패딩)
+            padded = np.pad(xyz, ((window_size // 2, (window_size - 1) // 2), (0, 0)))
+            # 누적합은 길이에 따라 오차가 쌓이므로 float64로 계산 후 입력 dtype으로 되돌림
+            csum = np.cumsum(padded, axis=0, dtype=np.float64)
+            csum = np.concatenate((np.zeros((1, 3)), csum))
+            smooth = ((csum[window_size:] - csum[:-window_size]) / window_size).astype(xyz.dtype)
             
             # 원래 데이터와 스무딩된 데이터의 가중 평균
-            x_final = (1 - smoothing_factor) * x_coords + smoothing_factor * x_smooth
-            y_final = (1 - smoothing_factor) * y_coords + smoothing_factor * y_smooth
-            z_final = (1 - smoothing_factor) * z_coords + smoothing_factor * z_smooth
+            final = xyz + smoothing_factor * (smooth - xyz)
             
-            self.logger.info(f"[TriangulationRouteCollector] 단순 이동평균 스무딩 적용 (window={window_size})")
+            self.logger.info("[TriangulationRouteCollector] 단순 이동평균 스무딩 적용 (window=%s)", window_size)
         else:
             # 너무 적은 점들은 스무딩하지 않음
-            x_final, y_final, z_final = x_coords, y_coords, z_coords
-            self.logger.info(f"[TriangulationRouteCollector] 점이 너무 적어 스무딩 생략")
+            final = xyz
+            self.logger.info("[TriangulationRouteCollector] 점이 너무 적어 스무딩 생략")
         
-        return x_final, y_final, z_final
+        return final
     
     def copy_to_routes_directory(self, route_name: str, target_dir: str = "data/routes"):
         """평균 경로를 route_based_risk_calculator.py가 사용하는 디렉토리로 복사"""
@@ -366,11 +570,11 @@ class TriangulationRouteCollector:
         
         if source_file.exists():
             import shutil
-            shutil.copy2(source_file, target_file)
-            self.logger.info(f"[TriangulationRouteCollector] 경로 복사 완료: {target_file}")
+            shutil.copyfile(source_file, target_file)  # 내용만 복사 (메타데이터 불필요)
+            self.logger.info("[TriangulationRouteCollector] 경로 복사 완료: %s", target_file)
             return True
         else:
-            self.logger.error(f"[TriangulationRouteCollector] 소스 파일 없음: {source_file}")
+            self.logger.error("[TriangulationRouteCollector] 소스 파일 없음: %s", source_file)
             return False
     
     def get_collection_status(self) -> Dict:
@@ -378,20 +582,64 @@ class TriangulationRouteCollector:
         return {
             'active': self.collection_active,
             'current_run': self.current_run_id,
-            'points_collected': len(self.current_run_data) if self.current_run_data else 0
+            'points_collected': (self._stream_count if self._stream_file is not None
+                                 else self._n)
         }
     
     def list_available_routes(self) -> List[str]:
         """사용 가능한 평균 경로 목록 반환"""
         averaged_dir = self.data_directory / "averaged_routes"
-        json_files = list(averaged_dir.glob("*_averaged.json"))
-        
-        routes = []
-        for json_file in json_files:
-            route_name = json_file.stem.replace('_averaged', '')
-            routes.append(route_name)
-        
-        return routes
+        return [entry.name[:-len("_averaged.json")]
+                for entry in _scan_files(averaged_dir, "_averaged.json")]
+
+def _bucket_points(points: List[Dict]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """점 목록을 객체 타입별 (프레임 ID (N,), 좌표 (N, 3)) 배열로 분류"""
+    n = len(points)
+    codes = np.fromiter((OBJECT_TYPE_CODES.get(p['object_type'], -1) for p in points),
+                        dtype=np.int8, count=n)
+    frames = np.fromiter((p['frame_id'] for p in points), dtype=np.int64, count=n)
+    xyz = np.fromiter(
+        (p[k] for p in points for k in ('x', 'y', 'z')), dtype=np.float64, count=3 * n
+    ).reshape(n, 3)
+    
+    buckets = {}
+    for object_type, code in OBJECT_TYPE_CODES.items():
+        mask = codes == code
+        buckets[object_type] = (frames[mask], xyz[mask])
+    return buckets
+
+def _scan_files(directory: Path, suffix: str) -> List[os.DirEntry]:
+    """디렉토리를 한 번의 scandir로 훑어 suffix로 끝나는 파일 항목만 반환 (없으면 빈 목록)"""
+    try:
+        with os.scandir(directory) as it:
+            return [entry for entry in it if entry.name.endswith(suffix) and entry.is_file()]
+    except FileNotFoundError:
+        return []
+
+def _write_json(filepath: Path, data: Dict, indent: bool = True):
+    """JSON 파일 저장 (orjson 사용 가능 시 C 직렬화, indent=False면 공백 없는 압축 형식)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        filepath.write_bytes(orjson.dumps(data, option=option))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            if indent:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            else:
+                json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+
+def _read_json(filepath: Path) -> Dict:
+    """JSON 파일 로드 (orjson 사용 가능 시 C 파싱)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(filepath.read_bytes())
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _dumps_line(obj: Dict) -> bytes:
+    """NDJSON 한 줄 직렬화"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj) + b'\n'
+    return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
 
 # real_time_pipeline.py에서 사용할 전역 인스턴스
 _route_collector = None
@@ -402,11 +650,11 @@ def initialize_route_collector(data_directory: str = "data/routes"):
     _route_collector = TriangulationRouteCollector(data_directory)
     return _route_collector
 
-def start_route_collection(route_name: str) -> str:
+def start_route_collection(route_name: str, stream: bool = False) -> str:
     """경로 수집 시작"""
     if _route_collector is None:
         initialize_route_collector()
-    return _route_collector.start_collection(route_name)
+    return _route_collector.start_collection(route_name, stream=stream)
 
 def add_triangulation_data(frame_id: int, triangulated_points: List[Dict]):
     """삼각측량 데이터 추가"""
@@ -419,13 +667,14 @@ def stop_route_collection() -> Optional[str]:
         return _route_collector.stop_collection()
     return None
 
-def generate_average_route(route_name: str, min_runs: int = 3) -> bool:
+def generate_average_route(route_name: str, min_runs: int = 3,
+                           smoothing_method: str = "gaussian") -> bool:
     """평균 경로 생성 및 routes 디렉토리로 복사"""
     if _route_collector is None:
         return False
     
     # 평균 경로 계산
-    result = _route_collector.calculate_average_route(route_name, min_runs)
+    result = _route_collector.calculate_average_route(route_name, min_runs, smoothing_method)
     if result is None:
         return False
     
@@ -467,10 +716,17 @@ def test_triangulation_route_collector():
     saved_run = collector.stop_collection()
     print(f"수집 완료: {saved_run}")
     
+    # B-스플라인 스무딩으로 평균 경로 생성 (가우시안과 같은 점 수/정밀도인지 확인)
+    spline_result = collector.calculate_average_route("test_route", min_runs=1, smoothing_method="spline")
+    if spline_result:
+        print(f"B-스플라인 평균 경로 생성 완료: {len(spline_result['routePoints'])}개 점")
+    
     # 평균 경로 생성 (최소 실행 수를 1로 설정하여 테스트)
     avg_result = collector.calculate_average_route("test_route", min_runs=1)
     if avg_result:
         print(f"평균 경로 생성 완료: {len(avg_result['routePoints'])}개 점")
+        if spline_result:
+            assert len(spline_result['waypoints']) == len(avg_result['waypoints'])
         
         # routes 디렉토리로 복사
         copy_success = collector.copy_to_routes_directory("test_route")
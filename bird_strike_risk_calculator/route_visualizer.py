@@ -4,13 +4,56 @@
 Unity에서 수집된 경로 데이터를 3D로 시각화합니다.
 """
 
+import os
+import sys
 import json
+import fnmatch
+import logging
 import numpy as np
+import matplotlib
+
+# 저장만 하는 실행(--save)이나 서버 환경(BRS_HEADLESS)에서는 창 없는 Agg 백엔드 사용
+if os.environ.get('BRS_HEADLESS') or (
+        __name__ == '__main__' and any(a in ('--save', '-s') or a.startswith('--save=') for a in sys.argv[1:])):
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
 import koreanize_matplotlib
 from mpl_toolkits.mplot3d import Axes3D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+from matplotlib.lines import Line2D
 from pathlib import Path
 import argparse
+from dataclasses import dataclass
+
+# 빠른 JSON 파싱 (선택)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 대용량 경로 JSON 스트리밍 파싱 (선택)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DPI = 150
+STREAM_THRESHOLD_BYTES = 256 * 1024 * 1024  # 이보다 큰 경로 파일은 ijson으로 스트리밍
+_POINT_PREFIXES = ('waypoints.item', 'routePoints.item', 'points.item')
+
+def _interactive():
+    """창을 띄울 수 있는 실행인지 (저장 전용/헤드리스 실행은 Agg 백엔드)"""
+    return matplotlib.get_backend().lower() != 'agg'
+
+def _show():
+    """대화형 백엔드일 때만 창 표시 (Agg에서는 건너뜀)"""
+    if _interactive():
+        plt.show()
 
 def load_route_data(route_file: str):
     """경로 데이터 로드"""
@@ -21,12 +64,17 @@ def load_route_data(route_file: str):
         return None
     
     try:
-        with open(route_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if ORJSON_AVAILABLE:
+            data = orjson.loads(route_path.read_bytes())
+        else:
+            with open(route_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         
-        print(f"✅ 경로 데이터 로드 완료: {route_file}")
-        print(f"   📊 총 경로점: {data.get('totalWaypoints', len(data.get('waypoints', data.get('points', []))))}개")
-        print(f"   📅 생성 시간: {data.get('exportTime', data.get('collection_time', 'Unknown'))}")
+        # 라이브러리로 쓸 때는 조용히, CLI(main)에서는 INFO로 출력
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✅ 경로 데이터 로드 완료: %s", route_file)
+            logger.info("   📊 총 경로점: %s개", data.get('totalWaypoints', len(data.get('waypoints', data.get('points', [])))))
+            logger.info("   📅 생성 시간: %s", data.get('exportTime', data.get('collection_time', 'Unknown')))
         
         return data
     
@@ -34,8 +82,56 @@ def load_route_data(route_file: str):
         print(f"❌ 경로 데이터 로드 실패: {e}")
         return None
 
+@dataclass
+class Trajectory:
+    """경로 좌표 묶음 - (N, 3) float32 C-연속 배열 하나로 보관 (JSON 경계에서 한 번만 변환)"""
+    xyz: np.ndarray
+    name: str = "Path"
+
+    def __post_init__(self):
+        self.xyz = np.ascontiguousarray(self.xyz, dtype=np.float32).reshape(-1, 3)
+
+    @classmethod
+    def from_json(cls, path):
+        """경로 JSON 파일에서 바로 생성 (실패 시 None, 큰 파일은 스트리밍)"""
+        path = Path(path)
+        if IJSON_AVAILABLE and path.exists() and path.stat().st_size > STREAM_THRESHOLD_BYTES:
+            return load_route_xyz(path)
+        route_data = load_route_data(str(path))
+        if route_data is None:
+            return None
+        return extract_coordinates(route_data)
+
+    @property
+    def x(self):
+        return self.xyz[:, 0]
+
+    @property
+    def y(self):
+        return self.xyz[:, 1]
+
+    @property
+    def z(self):
+        return self.xyz[:, 2]
+
+    def __len__(self):
+        return len(self.xyz)
+
+    def segment_lengths(self):
+        """연속 경로점 간 거리 배열 (N-1,)"""
+        return _segment_lengths(self.xyz)
+
+    def total_distance(self):
+        """경로의 총 거리 (누적은 float64)"""
+        return float(np.sum(self.segment_lengths(), dtype=np.float64))
+
+    def direction_angles(self):
+        """연속된 이동 벡터 쌍의 사이각 (도, 정지 구간 제외)"""
+        vectors = np.diff(self.xyz, axis=0)
+        return _direction_angles(vectors, np.sqrt(np.einsum('ij,ij->i', vectors, vectors)))
+
 def extract_coordinates(route_data):
-    """경로 데이터에서 좌표 추출"""
+    """경로 데이터에서 좌표를 추출해 Trajectory로 반환 (실패 시 None)"""
     # 다양한 형식의 데이터 지원
     waypoints = route_data.get('waypoints', [])
     route_points = route_data.get('routePoints', [])
@@ -50,9 +146,16 @@ def extract_coordinates(route_data):
     
     if not data_source:
         print("❌ 경로점 데이터가 없습니다.")
-        return None, None, None
+        return None
     
-    # 좌표 추출 (다양한 형식 지원)
+    name = route_data.get('pathName', 'Unknown')
+    
+    # 좌표 추출 - 모든 점이 첫 점과 같은 형식이면 한 번에 배열로 변환
+    coords = _extract_uniform_coordinates(data_source)
+    if coords is not None:
+        return Trajectory(coords, name)
+    
+    # 형식이 섞인 경우 점별로 추출 (다양한 형식 지원)
     x_coords, y_coords, z_coords = [], [], []
     
     for p in data_source:
@@ -70,25 +173,102 @@ def extract_coordinates(route_data):
     
     if not x_coords:
         print("❌ 좌표 데이터를 추출할 수 없습니다.")
-        return None, None, None
+        return None
+    
+    return Trajectory(np.column_stack([x_coords, y_coords, z_coords]), name)
+
+def _decimation_index(n, max_points):
+    """점이 max_points보다 많으면 시작/끝점을 포함한 균일 간격 인덱스 반환 (그리기 전용)"""
+    if max_points is None or n <= max_points:
+        return slice(None)
+    return np.linspace(0, n - 1, max_points).astype(int)
+
+def _extract_uniform_coordinates(data_source):
+    """첫 점의 형식(x/y/z 또는 position)으로 전체를 (N, 3) 배열로 변환 (형식이 섞여 있으면 None)"""
+    first = data_source[0]
+    if not isinstance(first, dict):
+        return None
+    
+    n = len(data_source)
+    try:
+        if 'x' in first and 'y' in first and 'z' in first:
+            return np.fromiter(
+                (p[k] for p in data_source for k in ('x', 'y', 'z')), dtype=np.float32, count=3 * n
+            ).reshape(n, 3)
+        if 'position' in first and len(first['position']) >= 3:
+            coords = np.array([p['position'][:3] for p in data_source], dtype=np.float32)
+            return coords if coords.shape == (n, 3) else None
+    except (KeyError, TypeError, ValueError):
+        return None
+    return None
+
+def load_route_xyz(route_file):
+    """
+    경로 JSON을 ijson으로 스트리밍해 점 dict를 만들지 않고 바로 float32 (N, 3) 버퍼에 채움
+    (메모리 ≈ N*12 B, 여러 점 목록이 있으면 가장 긴 것 사용, 실패 시 None)
+    """
+    buffers, counts = {}, {}
+    name = 'Unknown'
+    current, pos_i = None, 0
+    try:
+        with open(route_file, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix in _POINT_PREFIXES:
+                    if event == 'start_map':
+                        current, pos_i = [None, None, None], 0
+                    elif event == 'end_map':
+                        if None not in current:
+                            buf = buffers.get(prefix)
+                            n = counts.get(prefix, 0)
+                            if buf is None or n == len(buf):
+                                grown = np.empty((max(1024, 2 * n), 3), dtype=np.float32)
+                                if buf is not None:
+                                    grown[:n] = buf
+                                buf = buffers[prefix] = grown
+                            buf[n] = current
+                            counts[prefix] = n + 1
+                        current = None
+                elif current is not None and event in ('number', 'integer', 'double'):
+                    head, _, key = prefix.rpartition('.')
+                    if key in ('x', 'y', 'z') and head in _POINT_PREFIXES:
+                        current['xyz'.index(key)] = value
+                    elif key == 'item' and head.endswith('.position') and pos_i < 3:
+                        current[pos_i] = value
+                        pos_i += 1
+                elif prefix == 'pathName' and event == 'string':
+                    name = value
+    except Exception as e:
+        print(f"❌ 경로 데이터 스트리밍 실패: {e}")
+        return None
+    
+    if not counts:
+        print("❌ 좌표 데이터를 추출할 수 없습니다.")
+        return None
     
-    return np.array(x_coords), np.array(y_coords), np.array(z_coords)
+    best = max(counts, key=counts.get)
+    logger.info("✅ 경로 데이터 스트리밍 로드 완료: %s (%d개 점)", route_file, counts[best])
+    return Trajectory(buffers[best][:counts[best]], name)
 
-def create_3d_visualization(x, y, z, route_name="Path", save_path=None):
-    """3D 경로 시각화"""
+def create_3d_visualization(x, y, z, route_name="Path", save_path=None, max_points=5000, dpi=DEFAULT_DPI,
+                            total_distance=None):
+    """3D 경로 시각화 (긴 경로는 max_points개로 솎아서 그리고, 통계는 전체 점 기준)"""
+    if total_distance is None:
+        total_distance = Trajectory(np.column_stack([x, y, z])).total_distance()
     fig = plt.figure(figsize=(15, 10))
     ax = fig.add_subplot(111, projection='3d')
     
     # 경로 선 그리기
-    ax.plot(x, y, z, 'b-', linewidth=2, alpha=0.8, label=f'{route_name} Route')
+    idx = _decimation_index(len(x), max_points)
+    px, py, pz = x[idx], y[idx], z[idx]
+    ax.plot(px, py, pz, 'b-', linewidth=2, alpha=0.8, label=f'{route_name} Route')
     
     # 시작점과 끝점 표시
     ax.scatter(x[0], y[0], z[0], color='green', s=100, label='Start', marker='o')
     ax.scatter(x[-1], y[-1], z[-1], color='red', s=100, label='End', marker='s')
     
     # 중간 점들 표시 (10개마다)
-    step = max(1, len(x) // 10)
-    ax.scatter(x[::step], y[::step], z[::step], color='blue', s=20, alpha=0.6)
+    step = max(1, len(px) // 10)
+    ax.scatter(px[::step], py[::step], pz[::step], color='blue', s=20, alpha=0.6)
     
     # 축 레이블 및 제목
     ax.set_xlabel('X (Unity Units)', fontsize=12)
@@ -112,7 +292,7 @@ def create_3d_visualization(x, y, z, route_name="Path", save_path=None):
     • X 범위: {x.min():.1f} ~ {x.max():.1f}
     • Y 범위: {y.min():.1f} ~ {y.max():.1f}
     • Z 범위: {z.min():.1f} ~ {z.max():.1f}
-    • 총 거리: {calculate_total_distance(x, y, z):.1f} units
+    • 총 거리: {total_distance:.1f} units
     """
     
     plt.figtext(0.02, 0.02, stats_text, fontsize=10, 
@@ -120,14 +300,63 @@ def create_3d_visualization(x, y, z, route_name="Path", save_path=None):
     
     # 저장
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
         print(f"💾 시각화 저장 완료: {save_path}")
     
     plt.tight_layout()
-    plt.show()
+    _show()
 
-def create_2d_projections(x, y, z, route_name="Path", save_path=None):
-    """2D 투영 시각화 (XY, XZ, YZ 평면)"""
+def create_3d_visualization_plotly(x, y, z, route_name="Path", save_path=None, total_distance=None):
+    """3D 경로 시각화 (plotly WebGL 백엔드, 솎아내지 않고 전체 경로를 그림)"""
+    import plotly.graph_objects as go
+    
+    if total_distance is None:
+        total_distance = Trajectory(np.column_stack([x, y, z])).total_distance()
+    
+    fig = go.Figure()
+    
+    # 경로 선 그리기
+    fig.add_trace(go.Scatter3d(
+        x=x, y=y, z=z,
+        mode='lines',
+        line=dict(color='blue', width=4),
+        name=f'{route_name} Route'
+    ))
+    
+    # 시작점과 끝점 표시
+    fig.add_trace(go.Scatter3d(x=[x[0]], y=[y[0]], z=[z[0]], mode='markers',
+                               marker=dict(color='green', size=6, symbol='circle'), name='Start'))
+    fig.add_trace(go.Scatter3d(x=[x[-1]], y=[y[-1]], z=[z[-1]], mode='markers',
+                               marker=dict(color='red', size=6, symbol='square'), name='End'))
+    
+    fig.update_layout(
+        title=f'3D Flight Path Visualization: {route_name} '
+              f'(총 {len(x)}개 점, 총 거리 {total_distance:.1f} units)',
+        scene=dict(
+            xaxis_title='X (Unity Units)',
+            yaxis_title='Y (Unity Units)',
+            zaxis_title='Z (Unity Units)',
+            aspectmode='cube'
+        )
+    )
+    
+    # 저장 (HTML)
+    if save_path:
+        html_path = str(Path(save_path).with_suffix('.html'))
+        fig.write_html(html_path)
+        print(f"💾 시각화 저장 완료: {html_path}")
+    
+    # 저장 전용(--save)/헤드리스 실행에서는 브라우저를 열지 않음
+    if _interactive():
+        fig.show()
+
+def create_2d_projections(x, y, z, route_name="Path", save_path=None, max_points=5000, dpi=DEFAULT_DPI):
+    """2D 투영 시각화 (XY, XZ, YZ 평면, 긴 경로는 max_points개로 솎아서 그림)"""
+    # 고도 프로필의 누적 거리는 솎아내기 전 전체 경로 기준으로 계산
+    distance = np.concatenate(([0.0], np.cumsum(_segment_lengths(np.stack([x, y, z], axis=1)))))
+    idx = _decimation_index(len(x), max_points)
+    x, y, z, distance = x[idx], y[idx], z[idx], distance[idx]
+    
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
     fig.suptitle(f'2D Projections: {route_name}', fontsize=16, fontweight='bold')
     
@@ -162,10 +391,7 @@ def create_2d_projections(x, y, z, route_name="Path", save_path=None):
     axes[1, 0].grid(True, alpha=0.3)
     axes[1, 0].legend()
     
-    # 고도 프로필
-    distance = np.cumsum(np.sqrt(np.diff(x)**2 + np.diff(y)**2 + np.diff(z)**2))
-    distance = np.insert(distance, 0, 0)  # 시작점 거리 0 추가
-    
+    # 고도 프로필 (시작점 거리 0 포함)
     axes[1, 1].plot(distance, y, 'purple', linewidth=2, alpha=0.8)
     axes[1, 1].set_xlabel('Distance along path')
     axes[1, 1].set_ylabel('Altitude (Y)')
@@ -175,25 +401,42 @@ def create_2d_projections(x, y, z, route_name="Path", save_path=None):
     # 저장
     if save_path:
         save_path_2d = save_path.replace('.png', '_2d_projections.png')
-        plt.savefig(save_path_2d, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path_2d, dpi=dpi, bbox_inches='tight')
         print(f"💾 2D 투영 저장 완료: {save_path_2d}")
     
     plt.tight_layout()
-    plt.show()
+    _show()
+
+def _segment_lengths(xyz):
+    """(N, 3) 좌표에서 연속 경로점 간 거리 배열 (N-1,)"""
+    D = np.diff(xyz, axis=0)
+    return np.sqrt(np.einsum('ij,ij->i', D, D))
 
-def calculate_total_distance(x, y, z):
+def _direction_angles(vectors, norms):
+    """이동 벡터 (N-1, 3)와 그 길이로 연속 벡터 쌍의 사이각 계산 (도, 정지 구간 제외)"""
+    valid = (norms[:-1] > 0) & (norms[1:] > 0)
+    dots = np.einsum('ij,ij->i', vectors[:-1][valid], vectors[1:][valid])
+    cos_angle = np.clip(dots / (norms[:-1][valid] * norms[1:][valid]), -1, 1)  # 수치 오차 방지
+    return np.degrees(np.arccos(cos_angle))
+
+def calculate_total_distance(trajectory):
     """경로의 총 거리 계산"""
-    distances = np.sqrt(np.diff(x)**2 + np.diff(y)**2 + np.diff(z)**2)
-    return np.sum(distances)
+    return trajectory.total_distance()
 
-def analyze_route_statistics(x, y, z, route_name="Path"):
+def analyze_route_statistics(trajectory):
     """경로 통계 분석"""
-    print(f"\n📊 {route_name} 경로 분석 결과:")
+    x, y, z = trajectory.x, trajectory.y, trajectory.z
+    
+    # 이동 벡터를 한 번만 계산해 거리/속도/방향 변화에 모두 재사용
+    vectors = np.diff(trajectory.xyz, axis=0)
+    distances = np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+    
+    print(f"\n📊 {trajectory.name} 경로 분석 결과:")
     print("=" * 50)
     
     # 기본 통계
-    print(f"📍 총 경로점 수: {len(x)}")
-    print(f"📏 총 거리: {calculate_total_distance(x, y, z):.2f} units")
+    print(f"📍 총 경로점 수: {len(trajectory)}")
+    print(f"📏 총 거리: {np.sum(distances, dtype=np.float64):.2f} units")
     
     # 좌표 범위
     print(f"\n📐 좌표 범위:")
@@ -202,42 +445,42 @@ def analyze_route_statistics(x, y, z, route_name="Path"):
     print(f"   Z: {z.min():.2f} ~ {z.max():.2f} (범위: {z.max()-z.min():.2f})")
     
     # 속도 분석 (연속 점 간 거리)
-    distances = np.sqrt(np.diff(x)**2 + np.diff(y)**2 + np.diff(z)**2)
     print(f"\n🚀 이동 속도 분석:")
-    print(f"   평균 속도: {np.mean(distances):.2f} units/frame")
-    print(f"   최대 속도: {np.max(distances):.2f} units/frame")
-    print(f"   최소 속도: {np.min(distances):.2f} units/frame")
+    print(f"   평균 속도: {distances.mean(dtype=np.float64):.2f} units/frame")
+    print(f"   최대 속도: {distances.max():.2f} units/frame")
+    print(f"   최소 속도: {distances.min():.2f} units/frame")
     
     # 방향 변화 분석
-    direction_changes = []
-    for i in range(1, len(x)-1):
-        v1 = np.array([x[i]-x[i-1], y[i]-y[i-1], z[i]-z[i-1]])
-        v2 = np.array([x[i+1]-x[i], y[i+1]-y[i], z[i+1]-z[i]])
-        
-        if np.linalg.norm(v1) > 0 and np.linalg.norm(v2) > 0:
-            cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
-            cos_angle = np.clip(cos_angle, -1, 1)  # 수치 오차 방지
-            angle = np.arccos(cos_angle) * 180 / np.pi
-            direction_changes.append(angle)
+    direction_changes = _direction_angles(vectors, distances)
     
-    if direction_changes:
+    if direction_changes.size:
         print(f"\n🔄 방향 변화 분석:")
         print(f"   평균 방향 변화: {np.mean(direction_changes):.2f}°")
         print(f"   최대 방향 변화: {np.max(direction_changes):.2f}°")
 
+def _latest_file(dirpath, pattern):
+    """디렉토리를 한 번만 훑어 패턴에 맞는 가장 최근 파일 반환 (없거나 디렉토리가 없으면 None)"""
+    best, best_mtime = None, -1
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                    mtime = entry.stat().st_mtime_ns
+                    if mtime > best_mtime:
+                        best, best_mtime = Path(entry.path), mtime
+    except FileNotFoundError:
+        return None
+    return best
+
 def find_latest_files(route_name: str = "Path_A"):
     """최신 파일들 찾기"""
     base_dir = Path("data")
     
     # Raw 파일 (가장 최신) - 경로 수정
-    raw_dir = base_dir / "routes" / "raw_runs"
-    raw_files = list(raw_dir.glob(f"{route_name}_*.json"))
-    raw_file = max(raw_files, key=lambda x: x.stat().st_mtime) if raw_files else None
+    raw_file = _latest_file(base_dir / "routes" / "raw_runs", f"{route_name}_*.json")
     
     # Filtered 파일 (가장 최신) - 경로 수정
-    filtered_dir = base_dir / "routes" / "averaged_routes"
-    filtered_files = list(filtered_dir.glob(f"{route_name}_*.json"))
-    filtered_file = max(filtered_files, key=lambda x: x.stat().st_mtime) if filtered_files else None
+    filtered_file = _latest_file(base_dir / "routes" / "averaged_routes", f"{route_name}_*.json")
     
     # Final 파일
     final_file = base_dir / "routes" / f"{route_name}.json"
@@ -245,7 +488,7 @@ def find_latest_files(route_name: str = "Path_A"):
     
     return raw_file, filtered_file, final_file
 
-def compare_routes(raw_file, filtered_file, final_file, route_name="Path_A", save_path=None):
+def compare_routes(raw_file, filtered_file, final_file, route_name="Path_A", save_path=None, dpi=DEFAULT_DPI):
     """3단계 경로 비교 시각화"""
     print(f"\n🔍 {route_name} 경로 비교 분석")
     print("=" * 60)
@@ -258,20 +501,15 @@ def compare_routes(raw_file, filtered_file, final_file, route_name="Path_A", sav
     
     for i, (file, label) in enumerate(zip(files, labels)):
         if file and file.exists():
-            data = load_route_data(str(file))
-            if data:
-                x, y, z = extract_coordinates(data)
-                if x is not None:
-                    routes_data[label] = {
-                        'x': x, 'y': y, 'z': z,
-                        'color': colors[i],
-                        'count': len(x)
-                    }
-                    print(f"   ✅ {label}: {len(x)}개 점")
-                else:
-                    print(f"   ❌ {label}: 좌표 추출 실패")
+            traj = Trajectory.from_json(file)
+            if traj is not None:
+                routes_data[label] = {
+                    'traj': traj,
+                    'color': colors[i],
+                }
+                print(f"   ✅ {label}: {len(traj)}개 점")
             else:
-                print(f"   ❌ {label}: 파일 로드 실패")
+                print(f"   ❌ {label}: 경로 로드 실패")
         else:
             print(f"   ⚠️ {label}: 파일 없음")
     
@@ -285,23 +523,35 @@ def compare_routes(raw_file, filtered_file, final_file, route_name="Path_A", sav
     # 3D 전체 비교
     ax1 = fig.add_subplot(221, projection='3d')
     
-    for label, data in routes_data.items():
-        x, y, z = data['x'], data['y'], data['z']
-        ax1.plot(x, y, z, color=data['color'], linewidth=2, alpha=0.7, label=f"{label} ({data['count']}개)")
-        ax1.scatter(x[0], y[0], z[0], color=data['color'], s=100, marker='o', alpha=0.8)
-        ax1.scatter(x[-1], y[-1], z[-1], color=data['color'], s=100, marker='s', alpha=0.8)
+    # 모든 경로를 하나의 Line3DCollection으로, 시작/끝점은 각각 한 번의 scatter로 그림
+    trajs = [data['traj'] for data in routes_data.values()]
+    route_colors = [data['color'] for data in routes_data.values()]
+    ax1.add_collection3d(Line3DCollection([t.xyz for t in trajs], colors=route_colors, linewidths=2, alpha=0.7))
+    starts = np.array([t.xyz[0] for t in trajs])
+    ends = np.array([t.xyz[-1] for t in trajs])
+    ax1.scatter(starts[:, 0], starts[:, 1], starts[:, 2], color=route_colors, s=100, marker='o', alpha=0.8)
+    ax1.scatter(ends[:, 0], ends[:, 1], ends[:, 2], color=route_colors, s=100, marker='s', alpha=0.8)
+    
+    # 컬렉션은 축 범위를 갱신하지 않으므로 전체 점 기준으로 직접 설정
+    all_xyz = np.concatenate([t.xyz for t in trajs])
+    lo, hi = all_xyz.min(axis=0), all_xyz.max(axis=0)
+    ax1.set_xlim(lo[0], hi[0])
+    ax1.set_ylim(lo[1], hi[1])
+    ax1.set_zlim(lo[2], hi[2])
     
     ax1.set_xlabel('X (Unity Units)')
     ax1.set_ylabel('Y (Unity Units)')
     ax1.set_zlabel('Z (Unity Units)')
     ax1.set_title(f'3D 경로 비교: {route_name}')
-    ax1.legend()
+    ax1.legend(handles=[Line2D([], [], color=data['color'], linewidth=2, alpha=0.7,
+                               label=f"{label} ({len(data['traj'])}개)")
+                        for label, data in routes_data.items()])
     ax1.grid(True, alpha=0.3)
     
     # XY 평면 비교
     ax2 = fig.add_subplot(222)
     for label, data in routes_data.items():
-        x, y = data['x'], data['y']
+        x, y = data['traj'].x, data['traj'].y
         ax2.plot(x, y, color=data['color'], linewidth=2, alpha=0.7, label=f"{label}")
         ax2.scatter(x[0], y[0], color=data['color'], s=80, marker='o', alpha=0.8)
         ax2.scatter(x[-1], y[-1], color=data['color'], s=80, marker='s', alpha=0.8)
@@ -316,7 +566,7 @@ def compare_routes(raw_file, filtered_file, final_file, route_name="Path_A", sav
     # XZ 평면 비교  
     ax3 = fig.add_subplot(223)
     for label, data in routes_data.items():
-        x, z = data['x'], data['z']
+        x, z = data['traj'].x, data['traj'].z
         ax3.plot(x, z, color=data['color'], linewidth=2, alpha=0.7, label=f"{label}")
         ax3.scatter(x[0], z[0], color=data['color'], s=80, marker='o', alpha=0.8)
         ax3.scatter(x[-1], z[-1], color=data['color'], s=80, marker='s', alpha=0.8)
@@ -334,8 +584,9 @@ def compare_routes(raw_file, filtered_file, final_file, route_name="Path_A", sav
     stats_text = f"📊 {route_name} 경로 비교 통계\n" + "="*30 + "\n\n"
     
     for label, data in routes_data.items():
-        x, y, z = data['x'], data['y'], data['z']
-        total_dist = calculate_total_distance(x, y, z)
+        traj = data['traj']
+        x, y, z = traj.x, traj.y, traj.z
+        total_dist = calculate_total_distance(traj)
         
         stats_text += f"🔸 {label}:\n"
         stats_text += f"   • 점 개수: {len(x)}개\n"
@@ -353,11 +604,11 @@ def compare_routes(raw_file, filtered_file, final_file, route_name="Path_A", sav
     # 저장
     if save_path:
         comparison_path = save_path.replace('.png', '_comparison.png')
-        plt.savefig(comparison_path, dpi=300, bbox_inches='tight')
+        plt.savefig(comparison_path, dpi=dpi, bbox_inches='tight')
         print(f"💾 비교 시각화 저장 완료: {comparison_path}")
     
     plt.tight_layout()
-    plt.show()
+    _show()
 
 def main():
     """메인 실행 함수"""
@@ -369,8 +620,15 @@ def main():
     parser.add_argument('--no-2d', action='store_true', help='2D 투영 건너뛰기')
     parser.add_argument('--stats-only', action='store_true', help='통계만 출력')
     parser.add_argument('--compare', '-c', help='경로 이름으로 3단계 비교 (예: Path_A)')
+    parser.add_argument('--backend', choices=['mpl', 'plotly'], default='mpl',
+                       help='3D 시각화 백엔드 (기본: mpl, plotly는 WebGL로 긴 경로도 빠르게 렌더링)')
+    parser.add_argument('--max-points', type=int, default=5000,
+                       help='그리기 전 솎아낼 최대 점 수 (기본: 5000, 0이면 솎아내지 않음)')
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI,
+                       help=f'저장 이미지 해상도 (기본: {DEFAULT_DPI})')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     
     print("🎨 Unity 경로 시각화 도구")
     print("=" * 50)
@@ -385,23 +643,19 @@ def main():
             save_path = f"data/visualizations/{route_name.lower()}_comparison.png"
             Path("data/visualizations").mkdir(parents=True, exist_ok=True)
         
-        compare_routes(raw_file, filtered_file, final_file, route_name, save_path)
+        compare_routes(raw_file, filtered_file, final_file, route_name, save_path, args.dpi)
         return
     
-    # 단일 경로 모드
-    route_data = load_route_data(args.route_file)
-    if route_data is None:
+    # 단일 경로 모드 (로드 + 좌표 추출, 큰 파일은 스트리밍)
+    traj = Trajectory.from_json(args.route_file)
+    if traj is None:
         return
     
-    # 좌표 추출
-    x, y, z = extract_coordinates(route_data)
-    if x is None:
-        return
-    
-    route_name = route_data.get('pathName', 'Unknown')
+    route_name = traj.name
+    x, y, z = traj.x, traj.y, traj.z
     
     # 통계 분석
-    analyze_route_statistics(x, y, z, route_name)
+    analyze_route_statistics(traj)
     
     if args.stats_only:
         return
@@ -415,11 +669,17 @@ def main():
     
     if not args.no_3d:
         print(f"\n🎨 3D 시각화 생성 중...")
-        create_3d_visualization(x, y, z, route_name, save_path)
+        # 이미 로드한 Trajectory에서 총 거리를 한 번만 계산해 전달
+        total_distance = traj.total_distance()
+        if args.backend == 'plotly':
+            create_3d_visualization_plotly(x, y, z, route_name, save_path, total_distance=total_distance)
+        else:
+            create_3d_visualization(x, y, z, route_name, save_path, args.max_points or None, args.dpi,
+                                    total_distance=total_distance)
     
     if not args.no_2d:
         print(f"\n🎨 2D 투영 생성 중...")
-        create_2d_projections(x, y, z, route_name, save_path)
+        create_2d_projections(x, y, z, route_name, save_path, args.max_points or None, args.dpi)
     
     print(f"\n✅ 시각화 완료!")
 
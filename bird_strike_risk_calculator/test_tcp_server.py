@@ -4,85 +4,77 @@
 BDS 실시간 파이프라인의 TCP 연결 테스트용
 """
 
-import socket
-import threading
+import asyncio
 import json
 import time
 from datetime import datetime
 
+# 빠른 JSON 파싱 (선택)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 class TestTCPServer:
     def __init__(self, host='localhost', port=5200):
         self.host = host
         self.port = port
         self.running = False
         self.clients = []
+        self._loop = None
+        self._stop_event = None
         
     def start(self):
-        """서버 시작"""
+        """서버 시작 (단일 스레드 asyncio 이벤트 루프에서 모든 클라이언트 처리)"""
         self.running = True
-        
-        # 소켓 생성
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        
         try:
-            self.server_socket.bind((self.host, self.port))
-            self.server_socket.listen(5)
-            print(f"🚀 테스트 TCP 서버 시작: {self.host}:{self.port}")
-            print("📡 BDS 클라이언트 연결 대기 중...")
-            
-            while self.running:
-                try:
-                    client_socket, address = self.server_socket.accept()
-                    print(f"✅ 클라이언트 연결됨: {address}")
-                    
-                    # 클라이언트 처리 스레드 시작
-                    client_thread = threading.Thread(
-                        target=self.handle_client, 
-                        args=(client_socket, address),
-                        daemon=True
-                    )
-                    client_thread.start()
-                    
-                except socket.error as e:
-                    if self.running:
-                        print(f"❌ 연결 수락 오류: {e}")
-                        
+            asyncio.run(self._serve())
         except Exception as e:
             print(f"❌ 서버 시작 실패: {e}")
-        finally:
-            self.server_socket.close()
     
-    def handle_client(self, client_socket, address):
+    async def _serve(self):
+        """연결 수락 루프 (stop() 호출 시 종료)"""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        
+        server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, reuse_address=True
+        )
+        print(f"🚀 테스트 TCP 서버 시작: {self.host}:{self.port}")
+        print("📡 BDS 클라이언트 연결 대기 중...")
+        
+        async with server:
+            await self._stop_event.wait()
+    
+    async def handle_client(self, reader, writer):
         """클라이언트 메시지 처리"""
+        address = writer.get_extra_info('peername')
+        print(f"✅ 클라이언트 연결됨: {address}")
         try:
             while self.running:
-                # 메시지 길이 읽기 (4바이트)
-                length_data = client_socket.recv(4)
-                if not length_data:
+                try:
+                    # 메시지 길이 읽기 (4바이트) 후 실제 메시지 읽기
+                    length_data = await reader.readexactly(4)
+                    message_length = int.from_bytes(length_data, byteorder='big')
+                    message_data = await reader.readexactly(message_length)
+                except asyncio.IncompleteReadError:
                     break
                 
-                message_length = int.from_bytes(length_data, byteorder='big')
-                
-                # 실제 메시지 읽기
-                message_data = b''
-                while len(message_data) < message_length:
-                    chunk = client_socket.recv(message_length - len(message_data))
-                    if not chunk:
-                        break
-                    message_data += chunk
-                
-                if len(message_data) == message_length:
-                    try:
+                try:
+                    # orjson은 버퍼를 디코딩 복사 없이 바로 파싱
+                    if ORJSON_AVAILABLE:
+                        message = orjson.loads(message_data)
+                    else:
                         message = json.loads(message_data.decode('utf-8'))
-                        self.process_message(message, address)
-                    except json.JSONDecodeError as e:
-                        print(f"❌ JSON 디코딩 오류: {e}")
+                    self.process_message(message, address)
+                except json.JSONDecodeError as e:  # orjson.JSONDecodeError도 이 하위 클래스
+                    print(f"❌ JSON 디코딩 오류: {e}")
                 
         except Exception as e:
             print(f"❌ 클라이언트 처리 오류 ({address}): {e}")
         finally:
-            client_socket.close()
+            writer.close()
             print(f"🔌 클라이언트 연결 종료: {address}")
     
     def process_message(self, message, address):
@@ -127,8 +119,8 @@ class TestTCPServer:
         """서버 중지"""
         print("\n🛑 테스트 서버 중지 중...")
         self.running = False
-        if hasattr(self, 'server_socket'):
-            self.server_socket.close()
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stop_event.set)
 
 def main():
     """메인 실행"""
@@ -18,24 +18,85 @@ sys.path.insert(0, str(project_root))
 import cv2
 import numpy as np
 import json
-from typing import List, Dict, Optional, Tuple, Union
+import argparse
+import logging
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Tuple, Union
 # 🎯 항공 감지 통합 모듈 import
 from aviation_detector import AviationDetector
 import pandas as pd
 from datetime import datetime
 import glob
+from tqdm import tqdm
+
+logger = logging.getLogger(__name__)
+
+# flock 그룹핑 가속 (선택)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 빠른 JSON 직렬화 (선택, NumPy 스칼라/배열 직접 지원)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# flock 병합용 k-d 트리 반경 검색 / 연결 성분 (선택)
+try:
+    from scipy.spatial import cKDTree
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
 
 # =========================
 # 🔧 카메라 파라미터 처리
 # =========================
 
+# 카메라 파라미터는 녹화 중 바뀌지 않으므로 투영 행렬/스테레오 캘리브레이션을 값 기준으로 캐시
+_CAMERA_CACHE_SIZE = 64
+_projection_cache: Dict[tuple, np.ndarray] = {}
+_stereo_cache: Dict[tuple, Mapping] = {}
+
+def _unity_params_key(params: Dict) -> tuple:
+    """Unity 카메라 파라미터에서 투영 계산에 쓰이는 값만 모은 캐시 키"""
+    proj = params['projectionMatrix']
+    pos = params['position_UnityWorld']
+    rot = params['rotation_UnityWorld']
+    return (proj['m00'], proj['m11'], params['imageWidth'], params['imageHeight'],
+            pos['x'], pos['y'], pos['z'], rot['x'], rot['y'], rot['z'], rot['w'])
+
+def _cache_put(cache: Dict, key: tuple, value):
+    """크기 제한이 있는 캐시에 저장 (가득 차면 비움)
+    
+    캐시된 값은 호출자끼리 공유하므로 배열은 읽기 전용으로 만들어 제자리 수정을 막음
+    (파라미터 값이 바뀌면 키가 달라지므로 별도 무효화는 필요 없음)
+    """
+    for arr in (value.values() if isinstance(value, Mapping) else (value,)):
+        if isinstance(arr, np.ndarray):
+            arr.flags.writeable = False
+    if len(cache) >= _CAMERA_CACHE_SIZE:
+        cache.clear()
+    cache[key] = value
+    return value
+
 def load_camera_parameters(json_path: Union[str, Path]) -> Dict:
     """JSON 파일에서 카메라 파라미터를 로드"""
     with open(json_path, 'r') as f:
         params = json.load(f)
     return params
 
-def calculate_stereo_calibration(params1: Dict, params2: Dict) -> Dict:
+def calculate_stereo_calibration(params1: Dict, params2: Dict) -> Mapping:
     """
     두 카메라 간의 정확한 스테레오 캘리브레이션 계산
     
@@ -43,8 +104,13 @@ def calculate_stereo_calibration(params1: Dict, params2: Dict) -> Dict:
         params1, params2: 카메라 파라미터 딕셔너리
     
     Returns:
-        스테레오 캘리브레이션 결과 (R, T, 스케일 팩터 등)
+        스테레오 캘리브레이션 결과 (R, T, 스케일 팩터 등, 같은 파라미터면 캐시된 결과를 공유하므로 읽기 전용)
     """
+    key = _unity_params_key(params1) + _unity_params_key(params2)
+    cached = _stereo_cache.get(key)
+    if cached is not None:
+        return cached
+    
     # 카메라 내부 파라미터 추출
     def extract_intrinsic_matrix(params):
         # Unity projectionMatrix에서 내부 파라미터 추출
@@ -102,16 +168,22 @@ def calculate_stereo_calibration(params1: Dict, params2: Dict) -> Dict:
     # 스케일 팩터 계산 (Unity 단위 기준)
     unity_scale = 1.0  # Unity는 미터 단위 사용
     
-    return {
+    # 투영 행렬 구성 (삼각측량 때마다 다시 만들지 않도록 미리 계산)
+    # (float32로 만들어 K1과 곱할 때 float64로 올라가지 않게 함)
+    P1 = K1 @ np.hstack([np.eye(3, dtype=np.float32), np.zeros((3, 1), dtype=np.float32)])  # 첫 번째 카메라 (기준)
+    P2 = K2 @ np.hstack([R_rel, t_rel.reshape(-1, 1)])  # 두 번째 카메라
+    
+    return _cache_put(_stereo_cache, key, MappingProxyType({
         'K1': K1, 'K2': K2,
         'R': R_rel, 'T': t_rel,
+        'P1': P1, 'P2': P2,
         'baseline': baseline,
         'scale_factor': unity_scale,
         'camera1_pos': t1,
         'camera2_pos': t2,
         'camera1_rot': R1,
         'camera2_rot': R2
-    }
+    }))
 
 def quaternion_to_rotation_matrix(q):
     """쿼터니언을 회전 행렬로 변환 (기존 호환성 유지)"""
@@ -145,7 +217,7 @@ def quaternion_to_rotation_matrix_corrected(q):
     return R
 
 def triangulate_point_stereo(point1: List[float], point2: List[float], 
-                           stereo_calib: Dict) -> Optional[np.ndarray]:
+                           stereo_calib: Mapping) -> Optional[np.ndarray]:
     """
     스테레오 캘리브레이션 정보를 사용한 정확한 삼각측량
     
@@ -157,25 +229,11 @@ def triangulate_point_stereo(point1: List[float], point2: List[float],
         Unity 월드 좌표 3D 위치 [x, y, z] 또는 None (실패시)
     """
     try:
-        # 이미지 좌표를 정규화된 좌표로 변환
-        K1, K2 = stereo_calib['K1'], stereo_calib['K2']
-        
-        # 정규화된 좌표 계산
-        point1_norm = np.linalg.inv(K1) @ np.array([point1[0], point1[1], 1])
-        point2_norm = np.linalg.inv(K2) @ np.array([point2[0], point2[1], 1])
-        
-        # 삼각측량 (DLT 방법)
-        R, T = stereo_calib['R'], stereo_calib['T']
-        
-        # 투영 행렬 구성
-        P1 = K1 @ np.hstack([np.eye(3), np.zeros((3, 1))])  # 첫 번째 카메라 (기준)
-        P2 = K2 @ np.hstack([R, T.reshape(-1, 1)])  # 두 번째 카메라
-        
-        # OpenCV 삼각측량
+        # OpenCV 삼각측량 (DLT 방법, 투영 행렬은 캘리브레이션 시 미리 계산됨)
         points1 = np.array([[point1[0]], [point1[1]]], dtype=np.float32)
         points2 = np.array([[point2[0]], [point2[1]]], dtype=np.float32)
         
-        points_4d_hom = cv2.triangulatePoints(P1, P2, points1, points2)
+        points_4d_hom = cv2.triangulatePoints(stereo_calib['P1'], stereo_calib['P2'], points1, points2)
         points_3d = (points_4d_hom[:3] / points_4d_hom[3]).flatten()
         
         # 결과는 이미 첫 번째 카메라 기준 좌표계에서 계산됨
@@ -188,7 +246,8 @@ def triangulate_point_stereo(point1: List[float], point2: List[float],
         # 스케일 팩터 적용
         point_3d_unity *= stereo_calib['scale_factor']
         
-        print(f"🔄 스테레오 삼각측량: 카메라({points_3d[0]:.1f}, {points_3d[1]:.1f}, {points_3d[2]:.1f}) → Unity({point_3d_unity[0]:.1f}, {point_3d_unity[1]:.1f}, {point_3d_unity[2]:.1f})")
+        logger.debug("스테레오 삼각측량: 카메라(%.1f, %.1f, %.1f) → Unity(%.1f, %.1f, %.1f)",
+                     *points_3d, *point_3d_unity)
         
         return point_3d_unity
         
@@ -199,7 +258,13 @@ def triangulate_point_stereo(point1: List[float], point2: List[float],
 def get_projection_matrix(params: Dict) -> np.ndarray:
     """
     Unity 카메라 파라미터로부터 올바른 OpenCV 호환 투영 행렬 계산
+    (같은 파라미터면 캐시된 읽기 전용 행렬을 반환)
     """
+    key = ('unity',) + _unity_params_key(params)
+    cached = _projection_cache.get(key)
+    if cached is not None:
+        return cached
+    
     # 1. Unity 내부 파라미터 추출
     proj = params['projectionMatrix']
     width = params['imageWidth']
@@ -250,38 +315,119 @@ def get_projection_matrix(params: Dict) -> np.ndarray:
     Rt = np.hstack([R_opencv, t_opencv.reshape(3, 1)])
     P = K @ Rt
     
-    return P
+    return _cache_put(_projection_cache, key, P)
 
 def get_projection_matrix_simple(params: Dict) -> np.ndarray:
     """
     실시간 파이프라인용 간단한 투영 행렬 계산
-    (기존 real_time_pipeline.py의 방식과 호환)
+    (기존 real_time_pipeline.py의 방식과 호환, 같은 파라미터면 캐시된 행렬 반환)
     """
+    key = ('simple', params['fx'], params['fy'], params['cx'], params['cy'],
+           tuple(map(tuple, params['rotation_matrix'])), tuple(np.ravel(params['translation_vector'])))
+    cached = _projection_cache.get(key)
+    if cached is not None:
+        return cached
+    
     # 내부 파라미터 행렬
     K = np.array([
         [params['fx'], 0, params['cx']],
         [0, params['fy'], params['cy']],
         [0, 0, 1]
-    ])
+    ], dtype=np.float32)
     
     # 회전 행렬
-    R = np.array(params['rotation_matrix'])
+    R = np.array(params['rotation_matrix'], dtype=np.float32)
     
     # 이동 벡터
-    t = np.array(params['translation_vector']).reshape(3, 1)
+    t = np.array(params['translation_vector'], dtype=np.float32).reshape(3, 1)
     
     # 외부 파라미터 행렬 [R|t]
     Rt = np.hstack([R, t])
     
-    # 투영 행렬 P = K[R|t]
+    # 투영 행렬 P = K[R|t] (파이프라인 전체를 float32로 유지)
     P = K @ Rt
     
-    return P
+    return _cache_put(_projection_cache, key, P)
 
 # =========================
 # 🎯 객체 매칭 및 병합
 # =========================
 
+# 이 이하의 점 수에서는 k-d 트리 구성보다 컴파일된 전수 비교가 빠름
+_NUMBA_GROUP_MAX = 512
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _connected_labels(points: np.ndarray, thr2: float) -> np.ndarray:
+        """제곱 거리 thr2 미만으로 이어진 점들의 연결 성분 번호 (첫 점 순서대로 0, 1, ...)"""
+        n = points.shape[0]
+        labels = np.full(n, -1, dtype=np.int64)
+        stack = np.empty(n, dtype=np.int64)
+        n_groups = 0
+        for i in range(n):
+            if labels[i] >= 0:
+                continue
+            labels[i] = n_groups
+            stack[0] = i
+            top = 1
+            while top > 0:
+                top -= 1
+                k = stack[top]
+                for j in range(n):
+                    if labels[j] >= 0:
+                        continue
+                    d2 = 0.0
+                    for c in range(points.shape[1]):
+                        diff = points[k, c] - points[j, c]
+                        d2 += diff * diff
+                    if d2 < thr2:
+                        labels[j] = n_groups
+                        stack[top] = j
+                        top += 1
+            n_groups += 1
+        return labels
+
+def _group_labels(centers: np.ndarray, distance_threshold: float) -> np.ndarray:
+    """
+    distance_threshold 미만 거리로 이어진 점들을 하나의 그룹으로 묶은 연결 성분 번호
+    (입력 순서와 무관하게 같은 그룹이 나오며, 번호는 그룹의 첫 점 순서대로 0, 1, ...)
+    """
+    n = len(centers)
+    if NUMBA_AVAILABLE and (n <= _NUMBA_GROUP_MAX or not SCIPY_AVAILABLE):
+        points = np.ascontiguousarray(centers, dtype=np.float64)
+        return _connected_labels(points, float(distance_threshold) ** 2)
+    if SCIPY_AVAILABLE:
+        # k-d 트리로 반경 내 쌍만 찾고 (경계값 제외를 위해 반경을 바로 아래 실수로) 희소 그래프의 연결 성분 계산
+        pairs = cKDTree(centers).query_pairs(r=np.nextafter(distance_threshold, 0), output_type='ndarray')
+        adjacency = coo_matrix((np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+        _, labels = connected_components(adjacency, directed=False)
+        _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+        rank = np.empty(len(first), dtype=np.int64)
+        rank[np.argsort(first)] = np.arange(len(first))
+        return rank[inverse]
+    
+    diff = centers[:, None, :] - centers[None, :, :]
+    adjacency = np.einsum('ijk,ijk->ij', diff, diff) < distance_threshold ** 2  # 제곱 거리로 비교 (sqrt 생략)
+    labels = np.full(n, -1, dtype=np.int64)
+    n_groups = 0
+    for i in range(n):
+        if labels[i] >= 0:
+            continue
+        labels[i] = n_groups
+        stack = [i]
+        while stack:
+            k = stack.pop()
+            for j in np.flatnonzero(adjacency[k] & (labels < 0)):
+                labels[j] = n_groups
+                stack.append(j)
+        n_groups += 1
+    return labels
+
+def _split_groups(labels: np.ndarray) -> List[np.ndarray]:
+    """그룹 번호 배열을 번호 순서대로 인덱스 배열 목록으로 분리"""
+    order = np.argsort(labels, kind='stable')
+    return np.split(order, np.flatnonzero(np.diff(labels[order])) + 1)
+
 def merge_nearby_flocks_2d(flocks: List[Tuple], distance_threshold: float = 100) -> List[Tuple]:
     """
     2D 이미지에서 가까운 거리에 있는 flock들을 통합 (배치 처리용)
@@ -296,36 +442,15 @@ def merge_nearby_flocks_2d(flocks: List[Tuple], distance_threshold: float = 100)
     if not flocks:
         return []
         
+    # 박스/신뢰도를 한 번만 배열로 쌓고 그룹별로는 인덱싱만 함
+    all_boxes = np.stack([np.asarray(box, dtype=np.float32) for box, _ in flocks])
+    all_confs = np.asarray([conf for _, conf in flocks], dtype=np.float32)
+    
     # 중심점 기준으로 거리 계산
-    centers = np.array([box[:2] for box, _ in flocks])
-    confidences = np.array([conf for _, conf in flocks])
-    
-    # 거리 행렬 계산
-    distances = np.zeros((len(flocks), len(flocks)))
-    for i in range(len(flocks)):
-        for j in range(i+1, len(flocks)):
-            dist = np.linalg.norm(centers[i] - centers[j])
-            distances[i,j] = distances[j,i] = dist
-    
-    # 통합할 그룹 찾기
-    merged_groups = []
-    used = set()
-    
-    for i in range(len(flocks)):
-        if i in used:
-            continue
-            
-        # 현재 flock과 가까운 flock들 찾기
-        nearby = [j for j in range(len(flocks)) 
-                 if distances[i,j] < distance_threshold and j not in used]
-        
-        if nearby:
-            group = [i] + nearby
-            merged_groups.append(group)
-            used.update(group)
-        else:
-            merged_groups.append([i])
-            used.add(i)
+    centers = all_boxes[:, :2]
+    
+    # 통합할 그룹 찾기 (반경 내로 이어진 flock들의 연결 성분)
+    merged_groups = _split_groups(_group_labels(centers, distance_threshold))
     
     # 각 그룹 통합
     merged_flocks = []
@@ -335,12 +460,12 @@ def merge_nearby_flocks_2d(flocks: List[Tuple], distance_threshold: float = 100)
             merged_flocks.append(flocks[group[0]])
         else:
             # 여러 flock 통합
-            group_boxes = np.array([flocks[i][0] for i in group])
-            group_confs = np.array([flocks[i][1] for i in group])
+            group_boxes = all_boxes[group]
+            group_confs = all_confs[group]
             
             # 가중 평균으로 중심점 계산
-            weights = group_confs / np.sum(group_confs)
-            merged_center = np.sum(group_boxes[:, :2] * weights[:, None], axis=0)
+            weights = group_confs / group_confs.sum()
+            merged_center = weights @ group_boxes[:, :2]
             
             # 크기는 최대값 사용
             merged_size = np.max(group_boxes[:, 2:], axis=0)
@@ -374,54 +499,79 @@ def merge_nearby_flocks_3d(points: List[Dict], distance_threshold: float = 100)
     if len(flocks) <= 1:
         return points
     
-    # 거리 기반 병합
-    merged_flocks = []
-    used_indices = set()
+    # 좌표/신뢰도를 (N, 4) [x, y, z, conf] 배열로 한 번에 꺼냄
+    values = np.fromiter(((f['x'], f['y'], f['z'], f['confidence']) for f in flocks),
+                         dtype=np.dtype((np.float64, 4)), count=len(flocks))
     
-    for i, flock1 in enumerate(flocks):
-        if i in used_indices:
-            continue
-        
-        # 현재 무리와 병합할 무리들 찾기
-        merge_group = [flock1]
-        used_indices.add(i)
-        
-        for j, flock2 in enumerate(flocks):
-            if j in used_indices:
-                continue
-            
-            # 거리 계산 (XZ 평면)
-            dist = np.sqrt(
-                (flock1['x'] - flock2['x'])**2 + 
-                (flock1['z'] - flock2['z'])**2
-            )
-            
-            if dist < distance_threshold:
-                merge_group.append(flock2)
-                used_indices.add(j)
-        
-        # 병합된 무리의 평균 위치 계산
-        if len(merge_group) > 1:
-            avg_x = np.mean([f['x'] for f in merge_group])
-            avg_y = np.mean([f['y'] for f in merge_group])
-            avg_z = np.mean([f['z'] for f in merge_group])
-            avg_conf = np.mean([f['confidence'] for f in merge_group])
-            
-            merged_flock = {
-                'frame': flock1['frame'],
+    # 거리 기반 병합 (XZ 평면 반경 내로 이어진 무리들의 연결 성분)
+    labels = _group_labels(values[:, [0, 2]], distance_threshold)
+    
+    # 그룹 번호순으로 정렬해 그룹별 합을 한 번의 reduceat으로 계산 (네 값 동시에)
+    order = np.argsort(labels, kind='stable')
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(labels[order])) + 1))
+    counts = np.diff(np.append(starts, len(order)))
+    means = np.add.reduceat(values[order], starts, axis=0) / counts[:, None]
+    seeds = order[starts]  # 그룹별 첫 무리 인덱스
+    
+    merged_flocks = []
+    for g, i in enumerate(seeds):
+        if counts[g] > 1:
+            avg_x, avg_y, avg_z, avg_conf = means[g]
+            merged_flocks.append({
+                'frame': flocks[i]['frame'],
                 'class': 'Flock',
                 'x': avg_x,
                 'y': avg_y,
                 'z': avg_z,
                 'confidence': avg_conf,
-                'cameras': f"merged_{len(merge_group)}_flocks"
-            }
-            merged_flocks.append(merged_flock)
+                'cameras': f"merged_{counts[g]}_flocks"
+            })
         else:
-            merged_flocks.append(flock1)
+            merged_flocks.append(flocks[i])
     
     return merged_flocks + others
 
+# YOLO names 딕셔너리별 클래스 테이블 캐시 (모델의 names는 프레임마다 같은 객체)
+_CLASS_TABLES = {}
+
+def _class_table(names: Dict[int, str]) -> Tuple[int, int]:
+    """names 딕셔너리 → (클래스 ID 개수, Flock 클래스 ID 또는 -1)"""
+    cached = _CLASS_TABLES.get(id(names))
+    if cached is None or cached[0] is not names:
+        class_to_id = {name: i for i, name in names.items()}
+        cached = (names, max(names) + 1 if names else 0, class_to_id.get("Flock", -1))
+        _CLASS_TABLES[id(names)] = cached
+    return cached[1], cached[2]
+
+def _split_yolo_detections(results) -> Tuple[List[Tuple], Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    YOLO 결과를 텐서별로 한 번씩만 numpy로 옮긴 뒤 Flock 목록과 클래스 ID별 배열로 분리
+    
+    Returns:
+        flocks: [(box, conf), ...]
+        others: (present (C,) bool, boxes (C, 4), confs (C,)) - 클래스 ID로 인덱싱
+    """
+    boxes = results.boxes
+    xywh = boxes.xywh.cpu().numpy()
+    cls_ids = boxes.cls.cpu().numpy().astype(int)
+    confs = boxes.conf.cpu().numpy()
+    
+    n_classes, flock_id = _class_table(results.names)
+    flock_mask = cls_ids == flock_id
+    flocks = list(zip(xywh[flock_mask], confs[flock_mask]))
+    
+    # 같은 클래스가 여러 개면 마지막 것이 남음 (기존 동작과 동일)
+    other_ids = cls_ids[~flock_mask][::-1]
+    ids, last = np.unique(other_ids, return_index=True)
+    sel = np.flatnonzero(~flock_mask)[::-1][last]
+    present = np.zeros(n_classes, dtype=bool)
+    present[ids] = True
+    other_boxes = np.zeros((n_classes, 4), dtype=xywh.dtype)
+    other_boxes[ids] = xywh[sel]
+    other_confs = np.zeros(n_classes, dtype=confs.dtype)
+    other_confs[ids] = confs[sel]
+    return flocks, (present, other_boxes, other_confs)
+
 def match_objects_yolo(results1, results2) -> List[Dict]:
     """
     두 YOLO 결과에서 클래스별로 객체를 매칭 (배치 처리용)
@@ -430,23 +580,8 @@ def match_objects_yolo(results1, results2) -> List[Dict]:
     matches = []
     
     # Flock과 다른 클래스 분리
-    flocks1 = []
-    others1 = {}
-    for b, c, conf in zip(results1.boxes.xywh.cpu(), results1.boxes.cls.cpu(), results1.boxes.conf.cpu()):
-        cls_name = results1.names[int(c)]
-        if cls_name == "Flock":
-            flocks1.append((b, conf))
-        else:
-            others1[cls_name] = (b, conf)
-    
-    flocks2 = []
-    others2 = {}
-    for b, c, conf in zip(results2.boxes.xywh.cpu(), results2.boxes.cls.cpu(), results2.boxes.conf.cpu()):
-        cls_name = results2.names[int(c)]
-        if cls_name == "Flock":
-            flocks2.append((b, conf))
-        else:
-            others2[cls_name] = (b, conf)
+    flocks1, others1 = _split_yolo_detections(results1)
+    flocks2, others2 = _split_yolo_detections(results2)
     
     # Flock 통합
     merged_flocks1 = merge_nearby_flocks_2d(flocks1)
@@ -466,17 +601,18 @@ def match_objects_yolo(results1, results2) -> List[Dict]:
                 'conf2': conf2
             })
     
-    # 다른 클래스 매칭
-    common_classes = set(others1.keys()) & set(others2.keys())
-    for cls_name in common_classes:
-        box1, conf1 = others1[cls_name]
-        box2, conf2 = others2[cls_name]
+    # 다른 클래스 매칭 (클래스 ID 마스크 교집합)
+    present1, boxes1, confs1 = others1
+    present2, boxes2, confs2 = others2
+    for cls_id in np.flatnonzero(present1 & present2):
+        box1, conf1 = boxes1[cls_id], confs1[cls_id]
+        box2, conf2 = boxes2[cls_id], confs2[cls_id]
         
         pt1 = np.array([box1[0], box1[1]], dtype=np.float32)
         pt2 = np.array([box2[0], box2[1]], dtype=np.float32)
         
         matches.append({
-            'class': cls_name,
+            'class': results1.names[cls_id],
             'pt1': pt1,
             'pt2': pt2,
             'conf1': conf1,
@@ -496,34 +632,114 @@ def match_objects_simple(detections1: List[Dict], detections2: List[Dict]) -> Li
         매칭된 결과 리스트
     """
     matches = []
-    used_det2_indices = set()  # 이미 매칭된 det2 인덱스 추적
+    
+    # det2를 클래스별 대기열로 한 번만 분류 (각 det1은 같은 클래스의 아직 매칭 안 된 첫 det2와 매칭)
+    buckets = defaultdict(deque)
+    for det2 in detections2:
+        buckets[det2['class']].append(det2)
     
     for det1 in detections1:
-        for i, det2 in enumerate(detections2):
-            # 이미 매칭된 det2는 건너뛰기
-            if i in used_det2_indices:
-                continue
-                
-            if det1['class'] == det2['class']:
-                matches.append({
-                    'class': det1['class'],
-                    'det1': det1,
-                    'det2': det2
-                })
-                used_det2_indices.add(i)  # 매칭된 det2 인덱스 기록
-                break  # 이 det1에 대한 매칭 완료
+        queue = buckets.get(det1['class'])
+        if queue:
+            matches.append({
+                'class': det1['class'],
+                'det1': det1,
+                'det2': queue.popleft()
+            })
     
     return matches
 
+@dataclass
+class DetSet:
+    """감지 결과 묶음 (Struct-of-Arrays, 실시간 파이프라인용)"""
+    centers: np.ndarray      # (N, 2) float32 이미지 좌표
+    confs: np.ndarray        # (N,) 신뢰도
+    class_ids: np.ndarray    # (N,) class_names 인덱스
+    camera_ids: np.ndarray   # (N,) camera_letters 인덱스
+    class_names: np.ndarray  # 클래스 코드 → 이름
+
+    @classmethod
+    def from_detections(cls, detections: List[Dict], camera_letters: List[str]) -> 'DetSet':
+        """[{'camera', 'class', 'center', 'confidence'}, ...]를 한 번만 배열로 변환"""
+        letter_to_idx = {letter: idx for idx, letter in enumerate(camera_letters)}
+        n = len(detections)
+        class_names, class_ids = np.unique([det['class'] for det in detections], return_inverse=True)
+        return cls(
+            centers=np.array([det['center'] for det in detections], dtype=np.float32).reshape(n, 2),
+            confs=np.fromiter((det['confidence'] for det in detections), dtype=np.float64, count=n),
+            class_ids=class_ids.reshape(n),
+            camera_ids=np.fromiter((letter_to_idx[det['camera']] for det in detections), dtype=np.int64, count=n),
+            class_names=class_names,
+        )
+
+    def __len__(self):
+        return len(self.class_ids)
+
+    def take(self, idx) -> 'DetSet':
+        """인덱스/마스크로 일부만 선택"""
+        return DetSet(self.centers[idx], self.confs[idx], self.class_ids[idx],
+                      self.camera_ids[idx], self.class_names)
+
+def match_detsets(a: DetSet, b: DetSet) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    같은 클래스끼리 등장 순서대로 짝지은 인덱스 쌍 (match_objects_simple과 같은 짝, a 순서로 정렬)
+    """
+    idx1, idx2 = [], []
+    for cls_id in np.intersect1d(a.class_ids, b.class_ids):
+        i1 = np.flatnonzero(a.class_ids == cls_id)
+        i2 = np.flatnonzero(b.class_ids == cls_id)
+        k = min(len(i1), len(i2))
+        idx1.append(i1[:k])
+        idx2.append(i2[:k])
+    if not idx1:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    idx1, idx2 = np.concatenate(idx1), np.concatenate(idx2)
+    order = np.argsort(idx1)
+    return idx1[order], idx2[order]
+
 # =========================
 # 🔺 삼각측량 핵심 함수
 # =========================
 
+def triangulate_points(points1: np.ndarray, points2: np.ndarray,
+                       P1: np.ndarray, P2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    여러 점을 한 번의 cv2.triangulatePoints 호출로 삼각측량 (좌표계 변환 없이 직접 계산)
+    
+    Args:
+        points1, points2: (2, N) 이미지 좌표 배열 (x행, y행)
+        P1, P2: 카메라 투영 행렬
+    
+    Returns:
+        ((N, 3) Unity 월드 좌표 배열, (N,) 유효 여부 - 동차 좌표 w가 0이거나 오류면 False)
+    """
+    points1 = np.asarray(points1, dtype=np.float32).reshape(2, -1)
+    points2 = np.asarray(points2, dtype=np.float32).reshape(2, -1)
+    n = points1.shape[1]
+    try:
+        # OpenCV 삼각측량
+        points_4d_hom = cv2.triangulatePoints(P1, P2, points1, points2)
+    except Exception as e:
+        print(f"❌ 삼각측량 오류: {e}")
+        return np.full((n, 3), np.nan, dtype=np.float32), np.zeros(n, dtype=bool)
+    
+    # Homogeneous → 3D 좌표 변환 (결과는 이미 올바른 Unity 월드 좌표계)
+    w = points_4d_hom[3]
+    valid = w != 0
+    points_3d = (points_4d_hom[:3] / np.where(valid, w, 1)).T
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        for x, y, z in points_3d[valid]:
+            logger.debug("삼각측량 결과: Unity(%.1f, %.1f, %.1f)", x, y, z)
+    
+    return points_3d, valid
+
 def triangulate_point(point1: List[float], point2: List[float], 
                      P1: np.ndarray, P2: np.ndarray,
                      camera_positions: List[np.ndarray] = None) -> Optional[np.ndarray]:
     """
-    올바른 삼각측량 (좌표계 변환 없이 직접 계산)
+    올바른 삼각측량 (단일 점, triangulate_points 래퍼)
     
     Args:
         point1, point2: 이미지 좌표 [x, y]
@@ -533,28 +749,10 @@ def triangulate_point(point1: List[float], point2: List[float],
     Returns:
         Unity 월드 좌표 3D 위치 [x, y, z] 또는 None (실패시)
     """
-    try:
-        # 이미지 좌표를 homogeneous 형태로 변환
-        points1 = np.array([[point1[0]], [point1[1]]], dtype=np.float32)
-        points2 = np.array([[point2[0]], [point2[1]]], dtype=np.float32)
-        
-        # OpenCV 삼각측량
-        points_4d_hom = cv2.triangulatePoints(P1, P2, points1, points2)
-        
-        # Homogeneous → 3D 좌표 변환
-        if points_4d_hom[3, 0] != 0:
-            points_3d = points_4d_hom[:3, 0] / points_4d_hom[3, 0]
-        else:
-            return None
-        
-        # 결과는 이미 올바른 Unity 월드 좌표계
-        print(f"🔄 삼각측량 결과: Unity({points_3d[0]:.1f}, {points_3d[1]:.1f}, {points_3d[2]:.1f})")
-        
-        return points_3d
-        
-    except Exception as e:
-        print(f"❌ 삼각측량 오류: {e}")
-        return None
+    points_3d, valid = triangulate_points(
+        [[point1[0]], [point1[1]]], [[point2[0]], [point2[1]]], P1, P2
+    )
+    return points_3d[0] if valid[0] else None
 
 def triangulate_objects_realtime(detections: List[Dict], 
                                 projection_matrices: List[np.ndarray],
@@ -574,52 +772,49 @@ def triangulate_objects_realtime(detections: List[Dict],
     Returns:
         삼각측량된 3D 위치 리스트
     """
-    if len(projection_matrices) < 2:
+    if len(projection_matrices) < 2 or not detections:
         return []
     
-    # 카메라별로 감지 결과 그룹화
-    camera_detections = {}
-    for det in detections:
-        camera = det['camera']
-        if camera not in camera_detections:
-            camera_detections[camera] = []
-        camera_detections[camera].append(det)
+    # 감지 결과를 한 번만 배열 묶음으로 변환하고 카메라별로 분리 (등장 순서 유지)
+    dets = DetSet.from_detections(detections, camera_letters)
+    _, first = np.unique(dets.camera_ids, return_index=True)
+    available_cameras = dets.camera_ids[np.sort(first)]
+    camera_detections = {cam: dets.take(dets.camera_ids == cam) for cam in available_cameras}
     
     triangulated_points = []
     
     # 카메라 쌍별로 삼각측량 수행
-    available_cameras = list(camera_detections.keys())
     for i in range(len(available_cameras)):
         for j in range(i + 1, len(available_cameras)):
-            cam1, cam2 = available_cameras[i], available_cameras[j]
-            cam1_idx = camera_letters.index(cam1)
-            cam2_idx = camera_letters.index(cam2)
+            cam1_idx, cam2_idx = available_cameras[i], available_cameras[j]
+            det1, det2 = camera_detections[cam1_idx], camera_detections[cam2_idx]
             
             # 객체 매칭
-            matches = match_objects_simple(
-                camera_detections[cam1], 
-                camera_detections[cam2]
+            idx1, idx2 = match_detsets(det1, det2)
+            if not len(idx1):
+                continue
+            
+            # 매칭된 모든 쌍을 한 번에 삼각측량
+            points_3d, valid = triangulate_points(
+                det1.centers[idx1].T,
+                det2.centers[idx2].T,
+                projection_matrices[cam1_idx],
+                projection_matrices[cam2_idx]
             )
             
-            for match in matches:
-                # 삼각측량 수행
-                point_3d = triangulate_point(
-                    match['det1']['center'],
-                    match['det2']['center'],
-                    projection_matrices[cam1_idx],
-                    projection_matrices[cam2_idx]
-                )
-                
-                if point_3d is not None:
-                    triangulated_points.append({
-                        'frame': frame_id,
-                        'class': match['class'],
-                        'x': point_3d[0],
-                        'y': point_3d[1],
-                        'z': point_3d[2],
-                        'confidence': (match['det1']['confidence'] + match['det2']['confidence']) / 2,
-                        'cameras': f'Camera_{cam1}-Camera_{cam2}'
-                    })
+            confidences = (det1.confs[idx1] + det2.confs[idx2]) / 2
+            cameras = f'Camera_{camera_letters[cam1_idx]}-Camera_{camera_letters[cam2_idx]}'
+            for k in np.flatnonzero(valid):
+                point_3d = points_3d[k]
+                triangulated_points.append({
+                    'frame': frame_id,
+                    'class': str(det1.class_names[det1.class_ids[idx1[k]]]),
+                    'x': point_3d[0],
+                    'y': point_3d[1],
+                    'z': point_3d[2],
+                    'confidence': float(confidences[k]),
+                    'cameras': cameras
+                })
     
     # 근접한 무리 병합
     if triangulated_points:
@@ -660,18 +855,20 @@ def process_frame_multicam(img_paths: List[Path],
                 detections.append(detected_objects['raw_results'][0])  # YOLO 원시 결과 사용
                 valid_cameras.append(i)
             else:
-                print(f"⚠️ Camera_{chr(65+i)}에서 객체가 감지되지 않음")
+                logger.debug("Camera_%s에서 객체가 감지되지 않음", chr(65+i))
                 detections.append(None)
         except Exception as e:
             print(f"❌ Camera_{chr(65+i)} 처리 중 오류: {e}")
             detections.append(None)
     
     if len(valid_cameras) < 2:
-        print("⚠️ 최소 2개 이상의 카메라에서 객체가 감지되어야 합니다.")
+        logger.debug("최소 2개 이상의 카메라에서 객체가 감지되어야 합니다. (%s)", img_paths[0].name)
         return []
     
     # 2. 감지된 카메라들 간의 조합으로 삼각측량 수행
     triangulated_points = []
+    frame_id = int(img_paths[0].stem.split('_')[1])
+    max_coord = 10000  # 최대 허용 좌표값 (이상값 필터링)
     for i in range(len(valid_cameras)):
         for j in range(i+1, len(valid_cameras)):
             cam1_idx = valid_cameras[i]
@@ -681,28 +878,25 @@ def process_frame_multicam(img_paths: List[Path],
             if not matches:
                 continue
                 
-            for match in matches:
-                # 올바른 삼각측량 함수 사용
-                point_3d_unity = triangulate_point(
-                    match['pt1'].flatten().tolist(),
-                    match['pt2'].flatten().tolist(),
-                    projection_matrices[cam1_idx],
-                    projection_matrices[cam2_idx]
-                )
-                
-                if point_3d_unity is None:
-                    continue
-                
-                # 이상값 필터링 (비정상적으로 큰 좌표값 제거)
-                max_coord = 10000  # 최대 허용 좌표값
-                if (abs(point_3d_unity[0]) > max_coord or 
-                    abs(point_3d_unity[1]) > max_coord or 
-                    abs(point_3d_unity[2]) > max_coord):
-                    print(f"⚠️ 이상값 제거: {match['class']} at ({point_3d_unity[0]:.1f}, {point_3d_unity[1]:.1f}, {point_3d_unity[2]:.1f})")
-                    continue
-                
+            # 매칭된 모든 쌍을 한 번에 삼각측량
+            points_3d, valid = triangulate_points(
+                np.stack([m['pt1'] for m in matches], axis=1),
+                np.stack([m['pt2'] for m in matches], axis=1),
+                projection_matrices[cam1_idx],
+                projection_matrices[cam2_idx]
+            )
+            
+            # 이상값 필터링 (비정상적으로 큰 좌표값 제거, 모든 점을 한 번에 판정)
+            inliers = (np.abs(points_3d) <= max_coord).all(axis=1)
+            n_outliers = np.count_nonzero(valid & ~inliers)
+            if n_outliers:
+                logger.debug("이상값 제거: Camera_%s-Camera_%s에서 %d개",
+                             chr(65+cam1_idx), chr(65+cam2_idx), n_outliers)
+            
+            for k in np.flatnonzero(valid & inliers):
+                match, point_3d_unity = matches[k], points_3d[k]
                 triangulated_points.append({
-                    'frame': int(img_paths[0].stem.split('_')[1]),
+                    'frame': frame_id,
                     'class': match['class'],
                     'x': point_3d_unity[0],
                     'y': point_3d_unity[1],
@@ -713,46 +907,80 @@ def process_frame_multicam(img_paths: List[Path],
                     'total_cameras': num_cameras
                 })
     
-    # 3. 중복 제거 및 평균화
-    merged_points = []
-    frame_class_groups = {}
-    
-    for point in triangulated_points:
-        key = (point['frame'], point['class'])
-        if key not in frame_class_groups:
-            frame_class_groups[key] = []
-        frame_class_groups[key].append(point)
-    
-    for points in frame_class_groups.values():
-        if len(points) > 0:
-            # 위치 평균화
-            avg_x = np.mean([p['x'] for p in points])
-            avg_y = np.mean([p['y'] for p in points])
-            avg_z = np.mean([p['z'] for p in points])
-            avg_conf = np.mean([p['confidence'] for p in points])
-            
-            # 신뢰도 계산 (감지된 카메라 수에 따라 가중치 부여)
-            max_detected_cameras = max(p['num_detected_cameras'] for p in points)
-            confidence_weight = max_detected_cameras / num_cameras
-            
-            merged_points.append({
-                'frame': points[0]['frame'],
-                'class': points[0]['class'],
-                'x': avg_x,
-                'y': avg_y,
-                'z': avg_z,
-                'confidence': avg_conf * confidence_weight,
-                'num_detected_cameras': max_detected_cameras,
-                'total_cameras': num_cameras,
-                'num_camera_pairs': len(points)
-            })
+    # 3. 중복 제거 및 평균화 (프레임/클래스별로 카메라 쌍 결과를 한 번에 집계)
+    if not triangulated_points:
+        return []
     
-    return merged_points
+    merged = (
+        pd.DataFrame(triangulated_points)
+        .groupby(['frame', 'class'], sort=False)
+        .agg(x=('x', 'mean'), y=('y', 'mean'), z=('z', 'mean'),
+             confidence=('confidence', 'mean'),
+             num_detected_cameras=('num_detected_cameras', 'max'),
+             num_camera_pairs=('x', 'size'))
+        .reset_index()
+    )
+    
+    # 신뢰도 계산 (감지된 카메라 수에 따라 가중치 부여)
+    merged['confidence'] *= merged['num_detected_cameras'] / num_cameras
+    merged['total_cameras'] = num_cameras
+    
+    return merged[['frame', 'class', 'x', 'y', 'z', 'confidence',
+                   'num_detected_cameras', 'total_cameras', 'num_camera_pairs']].to_dict('records')
+
+# 프레임 병렬 처리 시 스레드별 감지기 (YOLO 모델은 스레드 간 공유하지 않음)
+_detector_local = threading.local()
+
+# 프레임 병렬 처리 기본 스레드 수 (기본은 순차 처리, 늘리면 첫 스레드 외에는 스레드마다 모델을 하나씩 더 로드)
+DEFAULT_FRAME_WORKERS = 1
+
+def _init_frame_worker(spare_detectors: List[AviationDetector]):
+    """작업 스레드 시작 시 전용 감지기 지정 (이미 로드된 감지기가 남아 있으면 재사용)"""
+    try:
+        _detector_local.detector = spare_detectors.pop()
+    except IndexError:
+        _detector_local.detector = AviationDetector()
+
+def _process_frame_worker(img_paths: List[Path], projection_matrices: List[np.ndarray],
+                          camera_positions: List[np.ndarray]) -> List[Dict]:
+    return process_frame_multicam(img_paths, _detector_local.detector, projection_matrices, camera_positions)
+
+def process_frames_parallel(frame_jobs: List[List[Path]],
+                            projection_matrices: List[np.ndarray],
+                            camera_positions: List[np.ndarray] = None,
+                            max_workers: int = DEFAULT_FRAME_WORKERS,
+                            detector: Optional[AviationDetector] = None) -> List[Dict]:
+    """
+    프레임별 process_frame_multicam을 스레드 풀로 병렬 실행 (결과는 프레임 순서 유지)
+    이미지 디코딩/YOLO 추론은 GIL을 놓으므로 스레드만으로 프레임 간 작업이 겹침
+    
+    Args:
+        frame_jobs: 프레임별 카메라 이미지 경로 리스트
+        max_workers: 작업 스레드 수 (감지기가 없는 스레드마다 모델을 한 번씩 로드)
+        detector: 이미 로드된 감지기 (한 스레드가 그대로 사용)
+    """
+    all_results = []
+    spare_detectors = [detector] if detector is not None else []
+    with ThreadPoolExecutor(max_workers=max_workers, initializer=_init_frame_worker,
+                            initargs=(spare_detectors,)) as executor:
+        results = executor.map(_process_frame_worker, frame_jobs,
+                               repeat(projection_matrices), repeat(camera_positions))
+        for frame_results in tqdm(results, total=len(frame_jobs), desc="  처리 중"):
+            all_results.extend(frame_results)
+    return all_results
 
 # =========================
 # 💾 결과 저장 및 유틸리티
 # =========================
 
+def _to_builtin(value):
+    """JSON 기본 타입이 아닌 값 변환 (NumPy 배열/스칼라, PyTorch Tensor)"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"JSON으로 직렬화할 수 없는 타입: {type(value).__name__}")
+
 def save_results(results: List[Dict], output_dir: Path):
     """결과를 CSV와 JSON으로 저장"""
     if not results:
@@ -767,34 +995,22 @@ def save_results(results: List[Dict], output_dir: Path):
     df.to_csv(csv_path, index=False)
     print(f"✅ CSV 결과 저장: {csv_path}")
     
-    # JSON 저장을 위해 NumPy/Tensor 타입을 Python 기본 타입으로 변환
-    json_serializable_results = []
-    for res in results:
-        serializable_res = {}
-        for k, v in res.items():
-            if isinstance(v, (np.ndarray, np.generic)):
-                serializable_res[k] = v.tolist()
-            elif hasattr(v, 'item'): # PyTorch Tensor
-                serializable_res[k] = v.item()
-            else:
-                serializable_res[k] = v
-        json_serializable_results.append(serializable_res)
-
-    # JSON 저장 (프레임별로 구조화)
-    json_results = {}
-    for result in json_serializable_results:
-        frame = result['frame']
-        if frame not in json_results:
-            json_results[frame] = []
-        json_results[frame].append({
+    # JSON 저장 (프레임별로 구조화, NumPy/Tensor 값은 직렬화 단계에서 변환)
+    json_results = defaultdict(list)
+    for result in results:
+        json_results[result['frame']].append({
             'class': result['class'],
             'position': [result['x'], result['y'], result['z']],
             'confidence': result['confidence']
         })
     
     json_path = output_dir / 'triangulation_results.json'
-    with open(json_path, 'w') as f:
-        json.dump(json_results, f, indent=2)
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        json_path.write_bytes(orjson.dumps(json_results, option=option, default=_to_builtin))
+    else:
+        with open(json_path, 'w') as f:
+            json.dump(json_results, f, indent=2, default=_to_builtin)
     print(f"✅ JSON 결과 저장: {json_path}")
 
 def find_latest_folder(base_path: Path, pattern: str) -> Optional[Path]:
@@ -810,6 +1026,12 @@ def find_latest_folder(base_path: Path, pattern: str) -> Optional[Path]:
 
 def main():
     """메인 실행 함수 (독립 실행용)"""
+    parser = argparse.ArgumentParser(description='BirdRiskSim 3D 삼각측량')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_FRAME_WORKERS,
+                        help=f'프레임 병렬 처리 스레드 수 (기본: {DEFAULT_FRAME_WORKERS} = 순차 처리, '
+                             '2 이상이면 병렬 처리하며 스레드가 늘 때마다 YOLO 모델을 하나씩 더 로드)')
+    args = parser.parse_args()
+    
     print("🚀 3D Triangulation 시작...")
     
     # 경로 설정
@@ -915,23 +1137,31 @@ def main():
     frame_files = sorted(glob.glob(str(data_folder / f"{camera_folder_name}/*.jpg")))
     total_frames = len(frame_files)
     
+    # 카메라별 후보 폴더의 파일 목록을 한 번만 읽어 둠 (프레임마다 exists()를 호출하지 않도록)
+    camera_folders = []
+    for letter in available_cameras:
+        folders = []
+        for pattern in camera_patterns:
+            folder = data_folder / pattern.format(letter)
+            if folder.is_dir():
+                with os.scandir(folder) as it:
+                    folders.append((folder, {entry.name for entry in it}))
+        camera_folders.append(folders)
+    
     print(f"\n📊 총 {total_frames}개 프레임 처리 시작...")
     print(f"  - 사용 카메라: {', '.join([f'Camera_{c}' for c in available_cameras])}")
     
-    for i, frame_path in enumerate(frame_files):
-        if (i + 1) % 10 == 0:
-            print(f"  처리 중: {i+1}/{total_frames}")
-        
+    # 프레임별 이미지 경로 구성 (모든 카메라에 있는 프레임만)
+    frame_jobs = []
+    for frame_path in frame_files:
         frame_name = Path(frame_path).name
         
         # 각 카메라의 실제 폴더명으로 이미지 경로 구성
         img_paths = []
-        for letter in available_cameras:
-            for pattern in camera_patterns:
-                folder_name = pattern.format(letter)
-                img_path = data_folder / folder_name / frame_name
-                if img_path.exists():
-                    img_paths.append(img_path)
+        for folders in camera_folders:
+            for folder, names in folders:
+                if frame_name in names:
+                    img_paths.append(folder / frame_name)
                     break
             else:
                 # 해당 카메라의 이미지를 찾을 수 없음
@@ -940,14 +1170,20 @@ def main():
         
         # 모든 이미지가 존재하는지 확인
         if len(img_paths) != len(available_cameras):
-            print(f"⚠️  일부 카메라의 프레임을 찾을 수 없음: {frame_name}")
+            logger.warning("일부 카메라의 프레임을 찾을 수 없음: %s", frame_name)
             continue
         
-        frame_results = process_frame_multicam(img_paths, aviation_detector, projection_matrices, camera_positions)
-        all_results.extend(frame_results)
+        frame_jobs.append(img_paths)
+    
+    # 프레임은 서로 독립이므로 스레드 풀로 병렬 처리 (이미 로드한 감지기를 한 스레드가 재사용)
+    max_workers = max(1, args.workers)
+    if max_workers > 1:
+        all_results = process_frames_parallel(frame_jobs, projection_matrices, camera_positions, max_workers,
+                                              detector=aviation_detector)
+    else:
+        for img_paths in tqdm(frame_jobs, desc="  처리 중"):
+            all_results.extend(process_frame_multicam(img_paths, aviation_detector, projection_matrices, camera_positions))
     
-
-        
     # 결과 저장
     print("\n💾 결과 저장 중...")
     output_dir = project_root / "data" / "triangulation_results" / f"results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
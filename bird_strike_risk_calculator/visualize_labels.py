@@ -5,17 +5,51 @@ BirdRiskSim 프로젝트의 yolo_capture 데이터의 라벨링을 시각화합
 """
 
 import os
-import cv2
 import numpy as np
 import argparse
 import glob
+import struct
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 # 프로젝트 루트 디렉토리 찾기
 project_root = Path(__file__).parent.parent  # scripts/ -> BirdRiskSim_v2/
 
+# OpenCV(cv2)는 그리기/저장하는 메서드 안에서만 import (분석 전용 실행과 --help는 로드하지 않음)
+
+def imwrite_params(output_path):
+    """시각화 결과 저장 옵션 (PNG는 압축 레벨을 낮춰 인코딩 시간 단축, JPEG는 미리보기용)"""
+    import cv2
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext == '.png':
+        return [cv2.IMWRITE_PNG_COMPRESSION, 1]
+    if ext in ('.jpg', '.jpeg'):
+        return [cv2.IMWRITE_JPEG_QUALITY, 90]
+    return []
+
+# Hershey 폰트는 숫자 폭이 모두 같으므로 숫자를 0으로 바꾼 문자열로 텍스트 크기를 캐시
+_DIGITS_TO_ZERO = str.maketrans('123456789', '000000000')
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def png_size(path):
+    """
+    PNG 헤더(IHDR)만 읽어 이미지 크기를 반환합니다 (디코딩 없음).
+    Returns: (width, height) - PNG가 아니면 None
+    """
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if len(header) < 24 or header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
 class YOLOLabelVisualizer:
-    def __init__(self):
+    def __init__(self, verbose=False):
+        # 파일/객체별 디버깅 출력 여부
+        self.verbose = verbose
+        
         # 클래스 정보 (YoloCaptureManager.cs에서 확인)
         self.class_names = {
             0: "Flock",    # 새 떼
@@ -27,123 +61,156 @@ class YOLOLabelVisualizer:
             0: (0, 255, 0),    # 초록색 - Flock
             1: (0, 0, 255),    # 빨간색 - Airplane
         }
+        
+        # 라벨 텍스트 크기 캐시
+        self._text_sizes = {}
+    
+    def _label_text_size(self, label_text):
+        """라벨 텍스트의 (width, height) - 숫자만 다른 문자열은 같은 크기를 재사용"""
+        key = label_text.translate(_DIGITS_TO_ZERO)
+        size = self._text_sizes.get(key)
+        if size is None:
+            import cv2
+            size = cv2.getTextSize(key, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
+            self._text_sizes[key] = size
+        return size
     
     def parse_yolo_label(self, label_path):
         """
         YOLO 라벨 파일을 파싱합니다.
-        Returns: list of (class_id, center_x, center_y, width, height)
+        Returns: (N, 5) 배열 - 열: class_id, center_x, center_y, width, height
         """
-        detections = []
+        try:
+            size = os.stat(label_path).st_size
+        except FileNotFoundError:
+            if self.verbose:
+                print(f"⚠️  라벨 파일이 없습니다: {label_path}")
+            return np.empty((0, 5))
         
-        if not os.path.exists(label_path):
-            print(f"⚠️  라벨 파일이 없습니다: {label_path}")
-            return detections
+        # 빈 라벨 파일(객체 없음)은 열지 않음
+        if size == 0:
+            return np.empty((0, 5))
             
         try:
-            with open(label_path, 'r') as f:
-                lines = f.readlines()
-                
-            print(f"🔍 라벨 파일 내용 ({label_path}):")
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if not line:  # 빈 줄 건너뛰기
-                    continue
-                    
-                print(f"   라인 {i+1}: '{line}'")
-                parts = line.split()
-                if len(parts) == 5:
-                    class_id = int(parts[0])
-                    center_x = float(parts[1])
-                    center_y = float(parts[2])
-                    width = float(parts[3])
-                    height = float(parts[4])
-                    
-                    class_name = self.class_names.get(class_id, f"Class_{class_id}")
-                    print(f"      → {class_name}: 중심({center_x:.6f}, {center_y:.6f}) 크기({width:.6f}x{height:.6f})")
-                    
-                    detections.append((class_id, center_x, center_y, width, height))
-                else:
-                    print(f"      ⚠️  잘못된 형식: {len(parts)}개 값 (5개 필요)")
-                    
+            with warnings.catch_warnings():
+                # 빈 라벨 파일 경고 무시
+                warnings.simplefilter("ignore", UserWarning)
+                detections = np.loadtxt(label_path, ndmin=2)
+            if detections.size and detections.shape[1] != 5:
+                raise ValueError(f"{detections.shape[1]}개 값 (5개 필요)")
+        except ValueError:
+            # 형식이 잘못된 줄이 섞여 있으면 줄 단위로 파싱해서 건너뜀
+            # (except 블록 안의 예외는 아래 except로 넘어가지 않으므로 따로 처리)
+            try:
+                detections = self._parse_yolo_label_lines(label_path)
+            except Exception as e:
+                print(f"⚠️  라벨 파일 파싱 오류 {label_path}: {e}")
+                return np.empty((0, 5))
         except Exception as e:
             print(f"⚠️  라벨 파일 파싱 오류 {label_path}: {e}")
+            return np.empty((0, 5))
+            
+        detections = detections.reshape(-1, 5)
+        
+        if self.verbose:
+            print(f"🔍 라벨 파일 내용 ({label_path}):")
+            for class_id, center_x, center_y, width, height in detections:
+                class_name = self.class_names.get(int(class_id), f"Class_{int(class_id)}")
+                print(f"      → {class_name}: 중심({center_x:.6f}, {center_y:.6f}) 크기({width:.6f}x{height:.6f})")
             
         return detections
     
-    def draw_detection(self, image, detection, img_width, img_height):
+    def _parse_yolo_label_lines(self, label_path):
+        """형식이 잘못된 줄을 건너뛰며 라벨 파일을 줄 단위로 파싱합니다."""
+        rows = []
+        with open(label_path, 'r') as f:
+            for i, line in enumerate(f):
+                parts = line.split()
+                if not parts:  # 빈 줄 건너뛰기
+                    continue
+                if len(parts) != 5:
+                    if self.verbose:
+                        print(f"   ⚠️  잘못된 형식 ({label_path} 라인 {i+1}): {len(parts)}개 값 (5개 필요)")
+                    continue
+                try:
+                    rows.append([float(p) for p in parts])
+                except ValueError:
+                    if self.verbose:
+                        print(f"   ⚠️  숫자가 아닌 값 ({label_path} 라인 {i+1}): {line.strip()}")
+        return np.array(rows, dtype=np.float64).reshape(-1, 5)
+    
+    def draw_detections(self, image, detections, img_width, img_height):
         """
-        이미지에 detection 박스를 그립니다.
+        이미지에 detection 박스들을 그립니다.
+        detections: (N, 5) 배열 - 좌표 변환은 한 번에 계산하고 그리기만 박스별로 수행
         """
-        class_id, center_x, center_y, width, height = detection
+        if len(detections) == 0:
+            return image
+        
+        import cv2
+        
+        class_ids = detections[:, 0].astype(int)
+        center_x, center_y = detections[:, 1], detections[:, 2]
         
         # 정규화된 좌표를 실제 픽셀 좌표로 변환
-        center_x_px = int(center_x * img_width)
-        center_y_px = int(center_y * img_height)
-        width_px = int(width * img_width)
-        height_px = int(height * img_height)
+        center_x_px = (center_x * img_width).astype(np.int32)
+        center_y_px = (center_y * img_height).astype(np.int32)
+        width_px = (detections[:, 3] * img_width).astype(np.int32)
+        height_px = (detections[:, 4] * img_height).astype(np.int32)
         
         # 바운딩 박스 좌표 계산
-        x1 = int(center_x_px - width_px / 2)
-        y1 = int(center_y_px - height_px / 2)
-        x2 = int(center_x_px + width_px / 2)
-        y2 = int(center_y_px + height_px / 2)
-        
-        # 🔍 상세 디버깅 출력
-        class_name = self.class_names.get(class_id, f"Class_{class_id}")
-        print(f"🎯 {class_name} 좌표 변환:")
-        print(f"   YOLO 좌표: 중심({center_x:.6f}, {center_y:.6f}) 크기({width:.6f}x{height:.6f})")
-        print(f"   이미지 크기: {img_width}x{img_height}")
-        print(f"   픽셀 중심: ({center_x_px}, {center_y_px})")
-        print(f"   픽셀 크기: {width_px}x{height_px}")
-        print(f"   바운딩 박스: ({x1}, {y1}) → ({x2}, {y2})")
-        print(f"   바운딩 박스 크기 검증: {x2-x1}x{y2-y1}")
-        
-        # 좌표 유효성 검사
-        if x1 < 0 or y1 < 0 or x2 >= img_width or y2 >= img_height:
-            print(f"   ⚠️  바운딩 박스가 이미지 경계를 벗어남!")
-            print(f"   이미지 범위: (0,0) → ({img_width-1},{img_height-1})")
-        
-        # 중심점 유효성 검사
-        if center_x_px < 0 or center_x_px >= img_width or center_y_px < 0 or center_y_px >= img_height:
-            print(f"   ⚠️  중심점이 이미지 경계를 벗어남!")
-            print(f"   중심점: ({center_x_px}, {center_y_px})")
-            print(f"   이미지 범위: (0,0) → ({img_width-1},{img_height-1})")
-        
-        # 색상 선택
-        color = self.class_colors.get(class_id, (0, 255, 255))  # 기본: 노란색
-        class_name = self.class_names.get(class_id, f"Class_{class_id}")
-        
-        # 바운딩 박스 그리기
-        cv2.rectangle(image, (x1, y1), (x2, y2), color, 2)
-        
-        # 중심점 그리기
-        cv2.circle(image, (center_x_px, center_y_px), 3, color, -1)
-        
-        # 라벨 텍스트
-        label_text = f"{class_name} ({center_x:.3f}, {center_y:.3f})"
-        
-        # 텍스트 배경
-        (text_width, text_height), _ = cv2.getTextSize(label_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
-        cv2.rectangle(image, (x1, y1 - text_height - 5), (x1 + text_width, y1), color, -1)
-        
-        # 텍스트 그리기
-        cv2.putText(image, label_text, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        x1 = (center_x_px - width_px / 2).astype(np.int32)
+        y1 = (center_y_px - height_px / 2).astype(np.int32)
+        x2 = (center_x_px + width_px / 2).astype(np.int32)
+        y2 = (center_y_px + height_px / 2).astype(np.int32)
+        
+        if self.verbose:
+            out_of_bounds = (x1 < 0) | (y1 < 0) | (x2 >= img_width) | (y2 >= img_height)
+            for i in np.flatnonzero(out_of_bounds):
+                class_name = self.class_names.get(class_ids[i], f"Class_{class_ids[i]}")
+                print(f"   ⚠️  {class_name} 바운딩 박스가 이미지 경계를 벗어남: "
+                      f"({x1[i]}, {y1[i]}) → ({x2[i]}, {y2[i]}), 이미지 범위: (0,0) → ({img_width-1},{img_height-1})")
+        
+        for i, class_id in enumerate(class_ids.tolist()):
+            # 색상 선택
+            color = self.class_colors.get(class_id, (0, 255, 255))  # 기본: 노란색
+            class_name = self.class_names.get(class_id, f"Class_{class_id}")
+            box_x1, box_y1 = int(x1[i]), int(y1[i])
+            
+            # 바운딩 박스 그리기
+            cv2.rectangle(image, (box_x1, box_y1), (int(x2[i]), int(y2[i])), color, 2)
+            
+            # 중심점 그리기
+            cv2.circle(image, (int(center_x_px[i]), int(center_y_px[i])), 3, color, -1)
+            
+            # 라벨 텍스트
+            label_text = f"{class_name} ({center_x[i]:.3f}, {center_y[i]:.3f})"
+            
+            # 텍스트 배경
+            text_width, text_height = self._label_text_size(label_text)
+            cv2.rectangle(image, (box_x1, box_y1 - text_height - 5), (box_x1 + text_width, box_y1), color, -1)
+            
+            # 텍스트 그리기
+            cv2.putText(image, label_text, (box_x1, box_y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
         return image
     
     def visualize_single_image(self, image_path, label_path, output_path=None, show=False):
         """
         단일 이미지와 라벨을 시각화합니다.
+        Returns: (image, detections) - 이미지를 읽지 못하면 (None, [])
         """
         if not os.path.exists(image_path):
             print(f"❌ 이미지 파일이 없습니다: {image_path}")
-            return None
+            return None, []
+        
+        import cv2
             
         # 이미지 읽기
         image = cv2.imread(image_path)
         if image is None:
             print(f"❌ 이미지를 읽을 수 없습니다: {image_path}")
-            return None
+            return None, []
             
         img_height, img_width = image.shape[:2]
         
@@ -151,33 +218,55 @@ class YOLOLabelVisualizer:
         detections = self.parse_yolo_label(label_path)
         
         # 정보 출력
-        print(f"📸 이미지: {os.path.basename(image_path)} ({img_width}x{img_height})")
-        print(f"🏷️  라벨: {len(detections)}개 객체 발견")
+        image_name = os.path.basename(image_path)
+        if self.verbose:
+            print(f"📸 이미지: {image_name} ({img_width}x{img_height})")
+            print(f"🏷️  라벨: {len(detections)}개 객체 발견")
         
-        # 각 detection 그리기
-        for detection in detections:
-            image = self.draw_detection(image, detection, img_width, img_height)
+        # detection 그리기
+        image = self.draw_detections(image, detections, img_width, img_height)
         
         # 이미지 정보 텍스트 추가
-        info_text = f"Objects: {len(detections)} | Size: {img_width}x{img_height} | File: {os.path.basename(image_path)}"
+        info_text = f"Objects: {len(detections)} | Size: {img_width}x{img_height} | File: {image_name}"
         cv2.putText(image, info_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
         cv2.putText(image, info_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 1)
         
         # 출력 처리
         if output_path:
-            cv2.imwrite(output_path, image)
-            print(f"💾 저장됨: {output_path}")
+            cv2.imwrite(output_path, image, imwrite_params(output_path))
+            if self.verbose:
+                print(f"💾 저장됨: {output_path}")
             
         if show:
             cv2.imshow('YOLO Label Visualization', image)
             cv2.waitKey(0)
             cv2.destroyAllWindows()
             
-        return image
+        return image, detections
     
-    def visualize_camera_batch(self, camera_path, output_dir=None, max_images=10):
+    def _process_one(self, image_path, camera_output_dir=None, preview_format='png'):
+        """
+        배치의 이미지 한 장을 시각화합니다.
+        Returns: 라벨 detections 배열 (이미지를 읽지 못하면 None)
+        """
+        # 대응하는 라벨 파일 경로
+        label_path = os.path.splitext(image_path)[0] + '.txt'
+        
+        # 출력 파일 경로
+        output_path = None
+        if camera_output_dir:
+            output_filename = f"labeled_{os.path.splitext(os.path.basename(image_path))[0]}.{preview_format}"
+            output_path = os.path.join(camera_output_dir, output_filename)
+        
+        # 시각화 (파싱한 라벨을 통계에 그대로 재사용)
+        result_image, detections = self.visualize_single_image(image_path, label_path, output_path)
+        return detections if result_image is not None else None
+    
+    def visualize_camera_batch(self, camera_path, output_dir=None, max_images=10, max_workers=None,
+                               preview_format='png'):
         """
         카메라 폴더의 여러 이미지를 배치로 시각화합니다.
+        이미지 읽기/쓰기(PNG 인코딩)는 GIL을 놓으므로 스레드 풀로 병렬 처리합니다.
         """
         camera_name = os.path.basename(camera_path)
         print(f"\n🎥 카메라 {camera_name} 처리 중...")
@@ -195,30 +284,27 @@ class YOLOLabelVisualizer:
             print(f"📊 {len(image_files)}개 이미지로 제한 (최대 {max_images}개)")
         
         # 출력 디렉토리 생성
+        camera_output_dir = None
         if output_dir:
             camera_output_dir = os.path.join(output_dir, camera_name)
             os.makedirs(camera_output_dir, exist_ok=True)
         
         stats = {"total": 0, "with_objects": 0, "empty": 0}
         
-        for image_path in image_files:
-            # 대응하는 라벨 파일 경로
-            label_path = image_path.replace('.png', '.txt')
-            
-            # 출력 파일 경로
-            output_path = None
-            if output_dir:
-                output_filename = f"labeled_{os.path.basename(image_path)}"
-                output_path = os.path.join(camera_output_dir, output_filename)
-            
-            # 시각화
-            result_image = self.visualize_single_image(image_path, label_path, output_path)
-            
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and len(image_files) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                results = list(ex.map(self._process_one, image_files,
+                                      repeat(camera_output_dir), repeat(preview_format)))
+        else:
+            results = [self._process_one(image_path, camera_output_dir, preview_format)
+                       for image_path in image_files]
+        
+        for detections in results:
             # 통계 업데이트
-            if result_image is not None:
+            if detections is not None:
                 stats["total"] += 1
-                detections = self.parse_yolo_label(label_path)
-                if detections:
+                if len(detections):
                     stats["with_objects"] += 1
                 else:
                     stats["empty"] += 1
@@ -230,59 +316,89 @@ class YOLOLabelVisualizer:
         print(f"   - 빈 프레임: {stats['empty']}개")
         print(f"   - 객체 검출률: {stats['with_objects']/stats['total']*100:.1f}%")
     
-    def analyze_dataset(self, yolo_capture_path):
+    def analyze_dataset(self, yolo_capture_path, sample=None):
         """
         전체 데이터셋을 분석합니다.
+        픽셀 데이터가 필요 없으므로 이미지는 디코딩하지 않습니다 (크기는 png_size로 헤더만 읽음).
+        sample: 카메라당 파싱할 라벨 수 - 지정하면 일정 간격으로 샘플링하고 객체/빈 프레임 수를 비율로 추정
         """
         print("🔍 데이터셋 분석 중...")
         
-        camera_dirs = [d for d in os.listdir(yolo_capture_path) 
-                      if os.path.isdir(os.path.join(yolo_capture_path, d)) and 
-                      (d.startswith('Fixed_Camera_') or d.startswith('Movable_Camera_'))]
+        with os.scandir(yolo_capture_path) as it:
+            camera_dirs = [e.name for e in it if e.is_dir() and
+                           (e.name.startswith('Fixed_Camera_') or e.name.startswith('Movable_Camera_'))]
         
         total_stats = {"images": 0, "labels": 0, "objects": 0, "empty_frames": 0}
-        class_stats = {}
+        class_counts = np.zeros(max(self.class_names) + 1, dtype=np.float64)
         
         for camera_dir in sorted(camera_dirs):
             camera_path = os.path.join(yolo_capture_path, camera_dir)
             
-            # 이미지와 라벨 파일 개수
-            images = glob.glob(os.path.join(camera_path, "*.png"))
-            labels = glob.glob(os.path.join(camera_path, "*.txt"))
+            # 이미지와 라벨 파일 목록 (디렉토리를 한 번만 스캔)
+            images, labels = [], []
+            with os.scandir(camera_path) as it:
+                for entry in it:
+                    if entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    if entry.name.endswith('.png'):
+                        images.append(entry.name)
+                    elif entry.name.endswith('.txt'):
+                        labels.append(entry)
+            
+            # 샘플링: 프레임 순서대로 일정 간격의 라벨만 파싱하고, 각 라벨을 scale개로 간주
+            sampled = labels
+            if sample and len(labels) > sample:
+                labels.sort(key=lambda e: e.name)
+                # 양 끝을 포함해 정확히 sample개 (간격이 1보다 크므로 인덱스가 겹치지 않음)
+                sampled = [labels[i] for i in np.linspace(0, len(labels) - 1, sample).astype(int)]
+            scale = len(labels) / len(sampled) if sampled else 1.0
             
             camera_objects = 0
             camera_empty = 0
             
             # 각 라벨 파일 분석
-            for label_path in labels:
-                detections = self.parse_yolo_label(label_path)
-                if detections:
-                    camera_objects += len(detections)
-                    for detection in detections:
-                        class_id = detection[0]
-                        class_stats[class_id] = class_stats.get(class_id, 0) + 1
+            for entry in sampled:
+                # 빈 라벨 파일은 스캔 결과의 크기로 바로 판정
+                if entry.stat().st_size == 0:
+                    camera_empty += scale
+                    continue
+                detections = self.parse_yolo_label(entry.path)
+                if len(detections):
+                    camera_objects += len(detections) * scale
+                    counts = np.bincount(detections[:, 0].astype(np.int64), minlength=len(class_counts))
+                    if len(counts) > len(class_counts):  # 알 수 없는 클래스 ID
+                        class_counts = np.pad(class_counts, (0, len(counts) - len(class_counts)))
+                    class_counts[:len(counts)] += counts * scale
                 else:
-                    camera_empty += 1
+                    camera_empty += scale
             
-            print(f"📹 {camera_dir}: {len(images)}개 이미지, {len(labels)}개 라벨, {camera_objects}개 객체")
+            # 해상도 (첫 이미지 헤더만 확인)
+            size = png_size(os.path.join(camera_path, images[0])) if images else None
+            size_text = f" ({size[0]}x{size[1]})" if size else ""
+            
+            print(f"📹 {camera_dir}: {len(images)}개 이미지{size_text}, {len(labels)}개 라벨, {camera_objects:.0f}개 객체")
             
             total_stats["images"] += len(images)
             total_stats["labels"] += len(labels)
             total_stats["objects"] += camera_objects
             total_stats["empty_frames"] += camera_empty
         
-        print(f"\n📊 전체 데이터셋 통계:")
+        if sample:
+            print(f"\n📊 전체 데이터셋 통계 (카메라당 최대 {sample}개 라벨 샘플 기준 추정):")
+        else:
+            print(f"\n📊 전체 데이터셋 통계:")
         print(f"   - 총 이미지: {total_stats['images']}개")
         print(f"   - 총 라벨: {total_stats['labels']}개")
-        print(f"   - 총 객체: {total_stats['objects']}개")
-        print(f"   - 빈 프레임: {total_stats['empty_frames']}개")
+        print(f"   - 총 객체: {total_stats['objects']:.0f}개")
+        print(f"   - 빈 프레임: {total_stats['empty_frames']:.0f}개")
         print(f"   - 객체 검출률: {(total_stats['labels']-total_stats['empty_frames'])/total_stats['labels']*100:.1f}%")
         
         print(f"\n🏷️  클래스별 분포:")
-        for class_id, count in sorted(class_stats.items()):
+        for class_id in np.flatnonzero(class_counts).tolist():
+            count = class_counts[class_id]
             class_name = self.class_names.get(class_id, f"Class_{class_id}")
             percentage = count / total_stats['objects'] * 100
-            print(f"   - {class_name}: {count}개 ({percentage:.1f}%)")
+            print(f"   - {class_name}: {count:.0f}개 ({percentage:.1f}%)")
 
 def main():
     parser = argparse.ArgumentParser(description='YOLO 라벨링 시각화 도구')
@@ -292,10 +408,15 @@ def main():
     parser.add_argument('--max-images', '-m', type=int, default=100, help='카메라당 최대 처리 이미지 수')
     parser.add_argument('--analyze-only', '-a', action='store_true', help='분석만 수행 (시각화 안함)')
     parser.add_argument('--show', '-s', action='store_true', help='시각화 결과를 화면에 표시')
+    parser.add_argument('--workers', '-w', type=int, default=None, help='카메라별 이미지 처리 스레드 수 (기본: CPU 코어 수)')
+    parser.add_argument('--sample', type=int, default=None,
+                        help='분석 시 카메라당 N개 라벨만 일정 간격으로 샘플링 (객체 수는 비율로 추정)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='파일/객체별 상세 정보 출력')
+    parser.add_argument('--preview-format', choices=['png', 'jpg'], default='png', help='시각화 이미지 저장 형식 (jpg: 작고 빠른 미리보기)')
     
     args = parser.parse_args()
     
-    visualizer = YOLOLabelVisualizer()
+    visualizer = YOLOLabelVisualizer(verbose=args.verbose)
     
     # 입력 경로 확인
     if not os.path.exists(args.input):
@@ -303,7 +424,7 @@ def main():
         return
     
     # 데이터셋 분석
-    visualizer.analyze_dataset(args.input)
+    visualizer.analyze_dataset(args.input, args.sample)
     
     if args.analyze_only:
         return
@@ -317,7 +438,8 @@ def main():
     if args.camera:
         camera_path = os.path.join(args.input, args.camera)
         if os.path.exists(camera_path):
-            visualizer.visualize_camera_batch(camera_path, args.output, args.max_images)
+            visualizer.visualize_camera_batch(camera_path, args.output, args.max_images, args.workers,
+                                              args.preview_format)
         else:
             print(f"❌ 카메라 디렉토리가 없습니다: {camera_path}")
     else:
@@ -328,7 +450,8 @@ def main():
         
         for camera_dir in sorted(camera_dirs):
             camera_path = os.path.join(args.input, camera_dir)
-            visualizer.visualize_camera_batch(camera_path, args.output, args.max_images)
+            visualizer.visualize_camera_batch(camera_path, args.output, args.max_images, args.workers,
+                                              args.preview_format)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -6,12 +6,24 @@ BirdRiskSim 세션 기반 트래킹 시각화 스크립트
 - 세션 갭과 시작/끝점을 명확히 보여줍니다.
 """
 
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from pathlib import Path
 import numpy as np
 import json
+from itertools import cycle
+
+# pandas/plotly는 무거우므로 사용하는 함수 안에서 import (--help 등 짧은 실행의 시작 시간 단축)
+
+# 시각화에 필요한 트래킹 CSV 컬럼과 타입 (session_id/episode_id 중 있는 쪽만 읽음)
+TRACKING_DTYPES = {
+    'frame': np.int32,
+    'class': 'category',
+    'x': np.float32,
+    'z': np.float32,
+    'vx': np.float32,
+    'vz': np.float32,
+    'session_id': np.int32,
+    'episode_id': np.int32,
+}
 
 def find_latest_folder(base_path, pattern):
     """지정된 패턴과 일치하는 가장 최신 폴더를 찾습니다."""
@@ -22,92 +34,108 @@ def find_latest_folder(base_path, pattern):
 
 def create_session_trajectory_plot(df):
     """세션별 궤적 시각화 (2D 평면도)"""
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+    
     # 세션별 색상 생성 (호환성을 위해 session_id/episode_id 둘 다 지원)
     id_column = 'session_id' if 'session_id' in df.columns else 'episode_id'
     sessions = sorted(df[id_column].unique())
-    colors = px.colors.qualitative.Set3 + px.colors.qualitative.Pastel + px.colors.qualitative.Dark2
-    session_colors = {ep: colors[i % len(colors)] for i, ep in enumerate(sessions)}
+    colors = qualitative.Set3 + qualitative.Pastel + qualitative.Dark2
+    session_colors = dict(zip(sessions, cycle(colors)))
+    
+    # (세션, 클래스)별 데이터를 한 번의 groupby로 분리
+    class_groups = dict(iter(df.sort_values('frame', kind='stable').groupby([id_column, 'class'], sort=False, observed=True)))
     
     fig = go.Figure()
     
-    # 세션별로 궤적 그리기
-    for session_id in sessions:
-        session_data = df[df[id_column] == session_id].sort_values('frame')
-        
-        # 비행기와 새 각각 처리
-        for class_name in ['Airplane', 'Flock']:
-            class_data = session_data[session_data['class'] == class_name]
-            if len(class_data) == 0:
+    # 시작점/끝점 마커 (모든 세션을 하나의 trace로)
+    marks = {'x': [], 'z': [], 'symbol': [], 'color': [], 'line_color': [], 'line_width': [], 'text': []}
+    
+    def add_mark(point, kind, session_id, class_name):
+        is_start = kind == '시작'
+        marks['x'].append(point['x'])
+        marks['z'].append(point['z'])
+        marks['symbol'].append('star' if is_start else 'x')
+        marks['color'].append('green' if is_start else 'red')
+        marks['line_color'].append('darkgreen' if is_start else 'red')
+        marks['line_width'].append(2 if is_start else 3)
+        marks['text'].append(f'<b>세션 {session_id} {kind}</b><br>Frame: {point["frame"]}<br>{class_name}')
+    
+    # 클래스별로 모든 세션 궤적을 NaN으로 끊어 하나의 trace로 그리기
+    for class_name in ['Airplane', 'Flock']:
+        blocks, point_colors = [], []
+        for session_id in sessions:
+            class_data = class_groups.get((session_id, class_name))
+            if class_data is None:
                 continue
-                
-            # 궤적 선
-            symbol = 'circle' if class_name == 'Airplane' else 'triangle-up'
-            line_style = dict(width=3) if class_name == 'Airplane' else dict(width=2, dash='dash')
             
-            fig.add_trace(go.Scatter(
-                x=class_data['x'],
-                y=class_data['z'],
-                mode='lines+markers',
-                name=f'세션 {session_id} - {class_name}',
-                line=dict(color=session_colors[session_id], **line_style),
-                marker=dict(
-                    symbol=symbol,
-                    size=6 if class_name == 'Airplane' else 4,
-                    color=session_colors[session_id]
-                ),
-                hovertemplate=f'<b>세션 {session_id} - {class_name}</b><br>' +
-                             'Frame: %{customdata[0]}<br>' +
-                             'X: %{x:.1f}<br>' +
-                             'Z: %{y:.1f}<br>' +
-                             'VX: %{customdata[1]:.2f}<br>' +
-                             'VZ: %{customdata[2]:.2f}<extra></extra>',
-                customdata=np.column_stack((class_data['frame'], class_data['vx'], class_data['vz']))
-            ))
+            # x, z, frame, vx, vz, session
+            blocks.append(np.column_stack((
+                class_data['x'], class_data['z'], class_data['frame'],
+                class_data['vx'], class_data['vz'], np.full(len(class_data), session_id)
+            )).astype(np.float64))
+            blocks.append(np.full((1, 6), np.nan))
+            point_colors += [session_colors[session_id]] * (len(class_data) + 1)
             
-            # 시작점과 끝점 강조
-            if len(class_data) > 0:
-                start_point = class_data.iloc[0]
-                end_point = class_data.iloc[-1]
-                
-                # 시작점 (초록 큰 원)
-                fig.add_trace(go.Scatter(
-                    x=[start_point['x']], y=[start_point['z']],
-                    mode='markers',
-                    marker=dict(
-                        symbol='star',
-                        size=15,
-                        color='green',
-                        line=dict(width=2, color='darkgreen')
-                    ),
-                    name=f'세션 {session_id} 시작',
-                    hovertemplate=f'<b>세션 {session_id} 시작</b><br>' +
-                                 f'Frame: {start_point["frame"]}<br>' +
-                                 f'{class_name}<extra></extra>',
-                    showlegend=False
-                ))
-                
-                # 끝점 (빨간 X)
-        fig.add_trace(go.Scatter(
-                    x=[end_point['x']], y=[end_point['z']],
-                    mode='markers',
-                    marker=dict(
-                        symbol='x',
-                        size=15,
-                        color='red',
-                        line=dict(width=3)
-                    ),
-                    name=f'세션 {session_id} 끝',
-                    hovertemplate=f'<b>세션 {session_id} 끝</b><br>' +
-                                 f'Frame: {end_point["frame"]}<br>' +
-                                 f'{class_name}<extra></extra>',
-                    showlegend=False
+            add_mark(class_data.iloc[0], '시작', session_id, class_name)
+        
+        if not blocks:
+            continue
+        points = np.vstack(blocks[:-1])
+        
+        # 궤적 선 (점 색상으로 세션 구분)
+        symbol = 'circle' if class_name == 'Airplane' else 'triangle-up'
+        line_style = dict(width=3) if class_name == 'Airplane' else dict(width=2, dash='dash')
+        
+        fig.add_trace(go.Scattergl(
+            x=points[:, 0],
+            y=points[:, 1],
+            mode='lines+markers',
+            name=class_name,
+            line=dict(color='gray', **line_style),
+            marker=dict(
+                symbol=symbol,
+                size=6 if class_name == 'Airplane' else 4,
+                color=point_colors[:-1]
+            ),
+            hovertemplate='<b>세션 %{customdata[3]} - ' + class_name + '</b><br>' +
+                         'Frame: %{customdata[0]}<br>' +
+                         'X: %{x:.1f}<br>' +
+                         'Z: %{y:.1f}<br>' +
+                         'VX: %{customdata[1]:.2f}<br>' +
+                         'VZ: %{customdata[2]:.2f}<extra></extra>',
+            customdata=points[:, 2:]
+        ))
+    
+    # 끝점은 세션별로 마지막에 그려진 클래스 기준
+    for session_id in sessions:
+        for class_name in ['Flock', 'Airplane']:
+            class_data = class_groups.get((session_id, class_name))
+            if class_data is not None:
+                add_mark(class_data.iloc[-1], '끝', session_id, class_name)
+                break
+    
+    if marks['x']:
+        fig.add_trace(go.Scattergl(
+            x=marks['x'], y=marks['z'],
+            mode='markers',
+            marker=dict(
+                symbol=marks['symbol'],
+                size=15,
+                color=marks['color'],
+                line=dict(width=marks['line_width'], color=marks['line_color'])
+            ),
+            name='시작/끝',
+            text=marks['text'],
+            hovertemplate='%{text}<extra></extra>',
+            showlegend=False
         ))
     
     fig.update_layout(
         title=f'세션별 궤적 시각화<br><sub>총 {len(sessions)}개 세션 | 시작점: ⭐, 끝점: ❌</sub>',
         xaxis_title='X 좌표 (좌/우)',
         yaxis_title='Z 좌표 (앞/뒤)',
-        legend_title_text='세션별 궤적',
+        legend_title_text='클래스별 궤적 (점 색상: 세션)',
         width=1200,
         height=800,
         hovermode='closest'
@@ -122,19 +150,24 @@ def create_session_trajectory_plot(df):
 
 def create_session_timeline_plot(df):
     """세션별 시간축 시각화"""
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+    
     # 호환성을 위해 session_id/episode_id 둘 다 지원
     id_column = 'session_id' if 'session_id' in df.columns else 'episode_id'
     sessions = sorted(df[id_column].unique())
-    colors = px.colors.qualitative.Set3 + px.colors.qualitative.Pastel
-    session_colors = {ep: colors[i % len(colors)] for i, ep in enumerate(sessions)}
+    colors = qualitative.Set3 + qualitative.Pastel
+    session_colors = dict(zip(sessions, cycle(colors)))
+    
+    # 세션별 시작/끝 프레임을 한 번에 집계
+    frame_spans = df.groupby(id_column)['frame'].agg(['min', 'max'])
     
     fig = go.Figure()
     
     # 각 세션을 시간축에 표시
     for i, session_id in enumerate(sessions):
-        session_data = df[df[id_column] == session_id]
-        start_frame = session_data['frame'].min()
-        end_frame = session_data['frame'].max()
+        start_frame = frame_spans.at[session_id, 'min']
+        end_frame = frame_spans.at[session_id, 'max']
         duration = end_frame - start_frame + 1
         
         # 세션 막대
@@ -153,24 +186,19 @@ def create_session_timeline_plot(df):
                          f'길이: {duration} 프레임<extra></extra>'
         ))
     
-    # 갭 영역 표시
-    if len(sessions) > 1:
-        for i in range(len(sessions) - 1):
-            curr_data = df[df[id_column] == sessions[i]]
-            next_data = df[df[id_column] == sessions[i + 1]]
-            
-            curr_end = curr_data['frame'].max()
-            next_start = next_data['frame'].min()
-            
-            if next_start > curr_end + 1:
-                # 갭 구간 회색으로 표시
-                fig.add_vrect(
-                    x0=curr_end, x1=next_start,
-                    fillcolor="lightgray", opacity=0.3,
-                    layer="below", line_width=0,
-                    annotation_text=f"갭 ({next_start - curr_end - 1}프레임)",
-                    annotation_position="top"
-                )
+    # 갭 영역 표시 (연속한 세션의 끝/시작 프레임 차이를 한 번에 계산)
+    starts = frame_spans['min'].to_numpy()
+    ends = frame_spans['max'].to_numpy()
+    gaps = starts[1:] - ends[:-1] - 1
+    for i in np.flatnonzero(gaps > 0):
+        # 갭 구간 회색으로 표시
+        fig.add_vrect(
+            x0=ends[i], x1=starts[i + 1],
+            fillcolor="lightgray", opacity=0.3,
+            layer="below", line_width=0,
+            annotation_text=f"갭 ({gaps[i]}프레임)",
+            annotation_position="top"
+        )
     
     fig.update_layout(
         title='세션별 시간축 분포<br><sub>회색 영역: 객체가 감지되지 않은 갭</sub>',
@@ -191,31 +219,27 @@ def create_session_timeline_plot(df):
 
 def create_distance_analysis(df):
     """객체 간 거리 분석"""
+    import plotly.graph_objects as go
+    
     # 비행기와 새 무리 데이터 분리
     airplane_data = df[df['class'] == 'Airplane'].set_index('frame')[['x', 'z']]
     flock_data = df[df['class'] == 'Flock'].set_index('frame')[['x', 'z']]
     
-    # 공통 프레임 찾기
-    common_frames = airplane_data.index.intersection(flock_data.index)
+    # 공통 프레임끼리 결합
+    merged = airplane_data.join(flock_data, lsuffix='_a', rsuffix='_f', how='inner')
     
-    if len(common_frames) == 0:
+    if len(merged) == 0:
         return None
     
-    # 거리 계산
-    distances = []
-    for frame in common_frames:
-        airplane_pos = airplane_data.loc[frame]
-        flock_pos = flock_data.loc[frame]
-        distance = np.sqrt((airplane_pos['x'] - flock_pos['x'])**2 + 
-                          (airplane_pos['z'] - flock_pos['z'])**2)
-        distances.append({'frame': frame, 'distance': distance})
-    
-    distance_df = pd.DataFrame(distances)
+    # 거리 계산 (열 배열로 바로 계산, 중간 DataFrame 없음)
+    frames = merged.index.to_numpy()
+    distances = np.hypot(merged['x_a'].to_numpy() - merged['x_f'].to_numpy(),
+                         merged['z_a'].to_numpy() - merged['z_f'].to_numpy())
     
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=distance_df['frame'],
-        y=distance_df['distance'],
+    fig.add_trace(go.Scattergl(
+        x=frames,
+        y=distances,
         mode='lines+markers',
         name='비행기-새무리 거리',
         line=dict(color='purple', width=3),
@@ -223,7 +247,7 @@ def create_distance_analysis(df):
     ))
     
     # 위험 임계값 표시 (예: 100 단위)
-    min_distance = distance_df['distance'].min()
+    min_distance = distances.min()
     fig.add_hline(y=100, line_dash="dash", line_color="red", 
                   annotation_text="위험 임계값 (100)")
     
@@ -238,6 +262,8 @@ def create_distance_analysis(df):
 
 def main():
     """메인 실행 함수"""
+    import pandas as pd
+    
     print("🚀 세션 기반 트래킹 결과 시각화 시작...")
 
     # --- 1. 경로 설정 ---
@@ -263,7 +289,8 @@ def main():
 
     # --- 2. 데이터 로드 ---
     try:
-        df = pd.read_csv(results_csv_path)
+        df = pd.read_csv(results_csv_path, usecols=lambda c: c in TRACKING_DTYPES,
+                         dtype=TRACKING_DTYPES, engine='c')
     except Exception as e:
         print(f"❌ CSV 파일 로드 실패: {e}")
         return
@@ -294,7 +321,7 @@ def main():
     print(f"  - {len(df)}개의 트래킹 포인트 로드 완료.")
     print(f"  - 프레임 범위: {df['frame'].min()} ~ {df['frame'].max()}")
     print(f"  - 총 {len(sessions)}개 세션 감지")
-    print(f"  - 추적 객체: {df['class'].unique()}")
+    print(f"  - 추적 객체: {df['class'].unique().tolist()}")
 
     # --- 3. 세션 기반 시각화 생성 ---
     print("\n📊 세션 시각화 생성 중...")
@@ -303,20 +330,20 @@ def main():
     print("  - 세션별 궤적 시각화 생성...")
     trajectory_fig = create_session_trajectory_plot(df)
     trajectory_path = latest_results_folder / 'session_trajectories.html'
-    trajectory_fig.write_html(trajectory_path)
+    trajectory_fig.write_html(trajectory_path, include_plotlyjs='cdn')
     
     # 3.2 세션 시간축 시각화
     print("  - 세션 시간축 시각화 생성...")
     timeline_fig = create_session_timeline_plot(df)
     timeline_path = latest_results_folder / 'session_timeline.html'
-    timeline_fig.write_html(timeline_path)
+    timeline_fig.write_html(timeline_path, include_plotlyjs='cdn')
     
     # 3.3 거리 분석
     print("  - 세션별 거리 분석...")
     distance_fig = create_distance_analysis(df)
     if distance_fig:
         distance_path = latest_results_folder / 'session_distance_analysis.html'
-        distance_fig.write_html(distance_path)
+        distance_fig.write_html(distance_path, include_plotlyjs='cdn')
     else:
         print("    ⚠️ 거리 분석: 공통 프레임이 없어 건너뜀")
 
@@ -5,23 +5,125 @@ BirdRiskSim 3D Triangulation Static Visualization Script
 - 모든 프레임의 데이터를 동시에 표시합니다.
 """
 
+import fnmatch
+import os
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import plotly.io as pio
 from pathlib import Path
 import webbrowser
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# pyarrow가 있으면 CSV를 멀티스레드 파서로 읽음
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# orjson이 있으면 figure JSON 직렬화에 사용 (numpy 배열을 C에서 바로 인코딩)
+try:
+    import orjson  # noqa: F401
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 시각화에 필요한 컬럼과 타입 (시각화 전용이므로 좌표는 float32)
+RESULT_DTYPES = {
+    'frame': 'int32',
+    'class': 'category',
+    'x': 'float32',
+    'y': 'float32',
+    'z': 'float32',
+}
+
+# CSV가 이 크기를 넘으면 청크 단위로 나눠 읽음 (파서 버퍼가 파일 크기만큼 커지지 않도록)
+CSV_CHUNK_THRESHOLD = 512 << 20
+CSV_CHUNKSIZE = 1_000_000
+
+# 클래스당 그래프에 넘길 최대 포인트 수 (초과하면 일정 간격으로 솎아냄)
+MAX_PLOT_POINTS = 5000
+
+# 연속 프레임의 좌표가 이 자릿수까지 같으면 한 점으로 합침
+MERGE_DECIMALS = 1
+
+# 축 제목과 평면 뷰 설정: (이름, 가로축, 세로축, 호버에 표시할 나머지 축, 제목, 높이)
+AXIS_TITLES = {'x': 'X (좌/우)', 'y': 'Y (상/하)', 'z': 'Z (앞/뒤)'}
+PLANE_VIEWS = [
+    ('xy', 'x', 'y', 'z', 'XY 평면 시각화 (위에서 본 뷰)', 800),
+    ('yz', 'y', 'z', 'x', 'YZ 평면 시각화 (왼쪽에서 본 뷰)', 600),
+    ('xz', 'x', 'z', 'y', 'XZ 평면 시각화 (앞에서 본 뷰)', 600),
+]
 
 def find_latest_folder(base_path, pattern):
-    """지정된 패턴과 일치하는 가장 최신 폴더를 찾습니다."""
-    folders = list(Path(base_path).glob(pattern))
-    if not folders:
+    """지정된 패턴과 일치하는 가장 최신 폴더를 찾습니다 (디렉토리를 한 번만 훑음)."""
+    best, best_mtime = None, -1
+    try:
+        with os.scandir(base_path) as it:
+            for entry in it:
+                if fnmatch.fnmatch(entry.name, pattern) and entry.is_dir():
+                    mtime = entry.stat().st_mtime_ns
+                    if mtime > best_mtime:
+                        best, best_mtime = Path(entry.path), mtime
+    except FileNotFoundError:
         return None
-    return max(folders, key=lambda p: p.stat().st_mtime)
+    return best
+
+def load_results(csv_path):
+    """삼각측량 결과 CSV를 읽습니다 (큰 파일은 청크 단위로 읽어 합침)."""
+    if csv_path.stat().st_size <= CSV_CHUNK_THRESHOLD:
+        return pd.read_csv(csv_path, usecols=list(RESULT_DTYPES), dtype=RESULT_DTYPES,
+                           engine='pyarrow' if PYARROW_AVAILABLE else 'c')
+    # pyarrow 엔진은 chunksize를 지원하지 않으므로 C 파서 사용
+    chunks = pd.read_csv(csv_path, usecols=list(RESULT_DTYPES), dtype=RESULT_DTYPES,
+                         chunksize=CSV_CHUNKSIZE)
+    df = pd.concat(chunks, ignore_index=True)
+    # 청크마다 카테고리 구성이 다르면 concat 후 object가 되므로 다시 category로 변환
+    if df['class'].dtype != 'category':
+        df['class'] = df['class'].astype('category')
+    return df
+
+def merge_repeats(cls_data, decimals=MERGE_DECIMALS):
+    """연속 프레임에서 (반올림한) 좌표가 같은 점들을 평균 위치 한 점으로 합칩니다 (frame~frame_end 범위 유지)."""
+    xyz = cls_data[['x', 'y', 'z']].to_numpy()
+    frames = cls_data['frame'].to_numpy()
+    key = np.round(xyz, decimals)
+    # 궤적 라인이 끊기지 않도록 인접한 점끼리만 합침 (시간 순서 유지)
+    starts = np.flatnonzero(np.r_[True, (key[1:] != key[:-1]).any(axis=1)])
+    bounds = np.r_[starts, len(frames)]
+    mean = np.add.reduceat(xyz.astype(np.float64), starts, axis=0) / np.diff(bounds)[:, None]
+    return pd.DataFrame({
+        'frame': frames[starts],
+        'frame_end': frames[bounds[1:] - 1],
+        'x': mean[:, 0].astype(np.float32),
+        'y': mean[:, 1].astype(np.float32),
+        'z': mean[:, 2].astype(np.float32),
+    })
+
+def decimate(cls_data, max_points=MAX_PLOT_POINTS):
+    """포인트가 max_points를 넘으면 일정 간격으로 솎아냅니다 (궤적의 마지막 점은 유지)."""
+    n = len(cls_data)
+    if n <= max_points:
+        return cls_data
+    idx = np.arange(0, n, -(-n // max_points))
+    if idx[-1] != n - 1:
+        idx = np.append(idx, n - 1)
+    return cls_data.iloc[idx]
+
+def open_in_browser(path):
+    """HTML 파일을 웹 브라우저에서 엽니다 (백그라운드 스레드에서 실행)."""
+    try:
+        webbrowser.open(path.resolve().as_uri())
+    except Exception as e:
+        print(f"  - 자동 열기 실패: {e}")
 
 def main():
     """메인 실행 함수"""
     print("🚀 3D Triangulation 정적 시각화 시작...")
+    if ORJSON_AVAILABLE:
+        pio.json.config.default_engine = 'orjson'
 
     # --- 1. 경로 설정 ---
     script_path = Path(__file__).resolve()
@@ -43,7 +145,7 @@ def main():
 
     # --- 2. 데이터 로드 ---
     try:
-        df = pd.read_csv(results_csv_path)
+        df = load_results(results_csv_path)
     except Exception as e:
         print(f"❌ CSV 파일 로드 실패: {e}")
         return
@@ -52,15 +154,27 @@ def main():
         print("⚠️ 데이터가 비어있어 시각화를 진행할 수 없습니다.")
         return
 
-    # 프레임 순서대로 정렬
-    df = df.sort_values(by='frame')
+    # 프레임 순서대로 한 번만 정렬하고 클래스별로 분리 (모든 그래프에서 재사용)
+    df = df.sort_values(by='frame', kind='mergesort')
+    class_groups = dict(iter(df.groupby('class', sort=False, observed=True)))
     print(f"  - {len(df)}개의 3D 포인트 로드 완료.")
     
-    # 클래스별 통계 출력
+    # 클래스별 통계 출력 (솎아내기 전 전체 개수)
     print(f"  - 클래스별 포인트 수:")
-    for cls in df['class'].unique():
-        count = len(df[df['class'] == cls])
-        print(f"    {cls}: {count}개")
+    for cls, cls_data in class_groups.items():
+        print(f"    {cls}: {len(cls_data)}개")
+    
+    # 제자리에 머문 연속 포인트는 합치고, 그래도 많은 클래스는 그래프용으로 솎아냄
+    plot_groups = {cls: decimate(merge_repeats(cls_data)) for cls, cls_data in class_groups.items()}
+    for cls, cls_data in plot_groups.items():
+        if len(cls_data) < len(class_groups[cls]):
+            print(f"    {cls}: 그래프에는 {len(cls_data)}개만 표시 (중복 병합, 최대 {MAX_PLOT_POINTS}개)")
+    class_groups = plot_groups
+    # 좌표는 클래스/축별로 한 번만 NumPy 배열로 꺼내 모든 그래프에서 재사용 (인코딩은 plotly가 버전에 맞게 처리)
+    class_coords = {cls: {axis: cls_data[axis].to_numpy() for axis in ('x', 'y', 'z')}
+                    for cls, cls_data in class_groups.items()}
+    # 호버 정보는 문자열 대신 원본 값(customdata)으로 전달하고 브라우저에서 포맷
+    class_frames = {cls: cls_data[['frame', 'frame_end']].to_numpy() for cls, cls_data in class_groups.items()}
 
     # --- 3. 궤적 시각화 생성 ---
     print("  - 궤적 시각화 생성 중...")
@@ -68,170 +182,81 @@ def main():
     # 색상 설정
     colors = {'Flock': 'blue', 'Airplane': 'red'}
     
-    fig_trajectory = go.Figure()
+    # figure는 검증 없이 plain dict로 구성 (trace마다 좌표 배열을 검증/복사하지 않음)
+    # dict로 직접 쓰므로 plotly 기본 템플릿도 명시적으로 지정
+    template = pio.templates[pio.templates.default].to_plotly_json()
     
-    for cls in df['class'].unique():
-        cls_data = df[df['class'] == cls].sort_values('frame')
-        
-        # 궤적 라인
-        fig_trajectory.add_trace(go.Scatter3d(
-            x=cls_data['x'],
-            y=cls_data['y'],
-            z=cls_data['z'],
+    # 클래스별 스타일은 한 번만 만들어 모든 trace에서 공유
+    line_by_cls = {cls: dict(color=colors.get(cls, 'gray'), width=2) for cls in class_groups}
+    marker_by_cls = {cls: dict(size=6, color=colors.get(cls, 'gray'), opacity=0.6) for cls in class_groups}
+    
+    # 궤적 라인
+    fig_trajectory = dict(
+        data=[dict(
+            type='scatter3d',
+            x=class_coords[cls]['x'],
+            y=class_coords[cls]['y'],
+            z=class_coords[cls]['z'],
             mode='lines+markers',
             line=dict(color=colors.get(cls, 'gray'), width=4),
             marker=dict(size=4, color=colors.get(cls, 'gray')),
             name=f'{cls} 궤적',
-            text=[f'Frame: {row.frame}' for _, row in cls_data.iterrows()],
+            customdata=class_frames[cls],
             hovertemplate='<b>%{fullData.name}</b><br>' +
-                         'Frame: %{text}<br>' +
+                         'Frame: %{customdata[0]}-%{customdata[1]}<br>' +
                          'X: %{x:.1f}<br>' +
                          'Y: %{y:.1f}<br>' +
                          'Z: %{z:.1f}<extra></extra>'
-        ))
-
-    fig_trajectory.update_layout(
-        title='3D 객체 이동 궤적',
-        scene=dict(
-            xaxis_title='X (좌/우)',
-            yaxis_title='Y (상/하)',
-            zaxis_title='Z (앞/뒤)',
-            camera=dict(
-                eye=dict(x=1.5, y=1.5, z=1.5)
-            )
-        ),
-        width=1200,
-        height=800
+        ) for cls, cls_data in class_groups.items()],
+        layout=dict(
+            template=template,
+            title=dict(text='3D 객체 이동 궤적'),
+            scene=dict(
+                xaxis=dict(title=dict(text=AXIS_TITLES['x'])),
+                yaxis=dict(title=dict(text=AXIS_TITLES['y'])),
+                zaxis=dict(title=dict(text=AXIS_TITLES['z'])),
+                camera=dict(
+                    eye=dict(x=1.5, y=1.5, z=1.5)
+                )
+            ),
+            width=1200,
+            height=800
+        )
     )
 
     # --- 4. 평면 시각화 생성 ---
     print("  - 평면 시각화 생성 중...")
     
-    # 4.1 XY 평면 시각화 (Top View)
-    fig_xy = go.Figure()
-    for cls in df['class'].unique():
-        cls_data = df[df['class'] == cls].sort_values('frame')
-        
-        # 정적 점들
-        fig_xy.add_trace(go.Scatter(
-            x=cls_data['x'],
-            y=cls_data['y'],
-            mode='markers',
-            marker=dict(
-                size=6,
-                color=colors.get(cls, 'gray'),
-                opacity=0.6
-            ),
-            name=f'{cls} 위치',
-            text=[f'Frame: {row.frame}<br>Z: {row.z:.1f}' for _, row in cls_data.iterrows()],
-            hovertemplate='<b>%{fullData.name}</b><br>' +
-                         'X: %{x:.1f}<br>' +
-                         'Y: %{y:.1f}<br>' +
-                         '%{text}<extra></extra>'
-        ))
-        
-        # 궤적 라인
-        fig_xy.add_trace(go.Scatter(
-            x=cls_data['x'],
-            y=cls_data['y'],
-            mode='lines',
-            line=dict(color=colors.get(cls, 'gray'), width=2, dash='solid'),
-            name=f'{cls} 궤적',
-            opacity=0.8,
-            showlegend=False
-        ))
-    
-    fig_xy.update_layout(
-        title='XY 평면 시각화 (위에서 본 뷰)',
-        xaxis_title='X (좌/우)',
-        yaxis_title='Y (상/하)',
-        width=800,
-        height=800
-    )
-    
-    # 4.2 YZ 평면 시각화 (Side View - 왼쪽에서)
-    fig_yz = go.Figure()
-    for cls in df['class'].unique():
-        cls_data = df[df['class'] == cls].sort_values('frame')
-        
-        # 정적 점들
-        fig_yz.add_trace(go.Scatter(
-            x=cls_data['y'],
-            y=cls_data['z'],
-            mode='markers',
-            marker=dict(
-                size=6,
-                color=colors.get(cls, 'gray'),
-                opacity=0.6
-            ),
-            name=f'{cls} 위치',
-            text=[f'Frame: {row.frame}<br>X: {row.x:.1f}' for _, row in cls_data.iterrows()],
-            hovertemplate='<b>%{fullData.name}</b><br>' +
-                         'Y: %{x:.1f}<br>' +
-                         'Z: %{y:.1f}<br>' +
-                         '%{text}<extra></extra>'
-        ))
-        
-        # 궤적 라인
-        fig_yz.add_trace(go.Scatter(
-            x=cls_data['y'],
-            y=cls_data['z'],
-            mode='lines',
-            line=dict(color=colors.get(cls, 'gray'), width=2, dash='solid'),
-            name=f'{cls} 궤적',
-            opacity=0.8,
-            showlegend=False
-        ))
-    
-    fig_yz.update_layout(
-        title='YZ 평면 시각화 (왼쪽에서 본 뷰)',
-        xaxis_title='Y (상/하)',
-        yaxis_title='Z (앞/뒤)',
-        width=800,
-        height=600
-    )
-    
-    # 4.3 XZ 평면 시각화 (Side View - 앞에서)
-    fig_xz = go.Figure()
-    for cls in df['class'].unique():
-        cls_data = df[df['class'] == cls].sort_values('frame')
-        
-        # 정적 점들
-        fig_xz.add_trace(go.Scatter(
-            x=cls_data['x'],
-            y=cls_data['z'],
-            mode='markers',
-            marker=dict(
-                size=6,
-                color=colors.get(cls, 'gray'),
-                opacity=0.6
-            ),
-            name=f'{cls} 위치',
-            text=[f'Frame: {row.frame}<br>Y: {row.y:.1f}' for _, row in cls_data.iterrows()],
-            hovertemplate='<b>%{fullData.name}</b><br>' +
-                         'X: %{x:.1f}<br>' +
-                         'Z: %{y:.1f}<br>' +
-                         '%{text}<extra></extra>'
-        ))
-        
-        # 궤적 라인
-        fig_xz.add_trace(go.Scatter(
-            x=cls_data['x'],
-            y=cls_data['z'],
-            mode='lines',
-            line=dict(color=colors.get(cls, 'gray'), width=2, dash='solid'),
-            name=f'{cls} 궤적',
-            opacity=0.8,
-            showlegend=False
-        ))
-    
-    fig_xz.update_layout(
-        title='XZ 평면 시각화 (앞에서 본 뷰)',
-        xaxis_title='X (좌/우)',
-        yaxis_title='Z (앞/뒤)',
-        width=800,
-        height=600
-    )
+    # XY (Top View), YZ (Side View - 왼쪽에서), XZ (Side View - 앞에서)
+    plane_figs = {}
+    for view, h_axis, v_axis, hover_axis, title, height in PLANE_VIEWS:
+        # 위치 점과 궤적 라인 (클래스당 하나의 trace)
+        plane_figs[view] = dict(
+            data=[dict(
+                type='scattergl',
+                x=class_coords[cls][h_axis],
+                y=class_coords[cls][v_axis],
+                mode='lines+markers',
+                line=line_by_cls[cls],
+                marker=marker_by_cls[cls],
+                name=f'{cls} 위치',
+                customdata=np.column_stack((class_frames[cls], cls_data[hover_axis].to_numpy())),
+                hovertemplate='<b>%{fullData.name}</b><br>' +
+                             f'{h_axis.upper()}: %{{x:.1f}}<br>' +
+                             f'{v_axis.upper()}: %{{y:.1f}}<br>' +
+                             'Frame: %{customdata[0]}-%{customdata[1]}<br>' +
+                             f'{hover_axis.upper()}: %{{customdata[2]:.1f}}<extra></extra>'
+            ) for cls, cls_data in class_groups.items()],
+            layout=dict(
+                template=template,
+                title=dict(text=title),
+                xaxis=dict(title=dict(text=AXIS_TITLES[h_axis])),
+                yaxis=dict(title=dict(text=AXIS_TITLES[v_axis])),
+                width=800,
+                height=height
+            )
+        )
+    fig_xy, fig_yz, fig_xz = plane_figs['xy'], plane_figs['yz'], plane_figs['xz']
 
     # --- 5. HTML 파일로 저장 ---
     output_trajectory_path = latest_results_folder / 'triangulation_trajectory.html'
@@ -239,10 +264,17 @@ def main():
     output_yz_path = latest_results_folder / 'triangulation_yz_plane.html'
     output_xz_path = latest_results_folder / 'triangulation_xz_plane.html'
     
-    fig_trajectory.write_html(output_trajectory_path)
-    fig_xy.write_html(output_xy_path)
-    fig_yz.write_html(output_yz_path)
-    fig_xz.write_html(output_xz_path)
+    # plotly.js는 CDN에서 불러오고, figure dict는 검증 없이 그대로 직렬화
+    html_options = dict(include_plotlyjs='cdn', include_mathjax=False, full_html=True, validate=False)
+    outputs = [
+        (fig_trajectory, output_trajectory_path),
+        (fig_xy, output_xy_path),
+        (fig_yz, output_yz_path),
+        (fig_xz, output_xz_path),
+    ]
+    # 서로 다른 figure/파일이므로 동시에 저장
+    with ThreadPoolExecutor(max_workers=len(outputs)) as ex:
+        list(ex.map(lambda job: pio.write_html(job[0], job[1], **html_options), outputs))
 
     print(f"\n🎉 시각화 완료!")
     print(f"  - 궤적 시각화 (3D): {output_trajectory_path}")
@@ -250,12 +282,10 @@ def main():
     print(f"  - YZ 평면 시각화: {output_yz_path}")
     print(f"  - XZ 평면 시각화: {output_xz_path}")
     
-    # 자동으로 브라우저에서 열기
-    try:
-        webbrowser.open(f'file://{output_trajectory_path.resolve()}')
-        print("  - 궤적 시각화를 웹 브라우저에서 열었습니다.")
-    except Exception as e:
-        print(f"  - 자동 열기 실패: {e}")
+    # 모든 파일 저장이 끝난 뒤 한 번만 브라우저 실행 (xdg-open 등 실행 대기로 main이 막히지 않도록 별도 스레드)
+    # daemon 스레드로 두면 인터프리터 종료 시 실행 전에 끊길 수 있으므로 일반 스레드 사용
+    threading.Thread(target=open_in_browser, args=(output_trajectory_path,)).start()
+    print("  - 궤적 시각화를 웹 브라우저에서 여는 중...")
 
 
 if __name__ == "__main__":